@@ -1,8 +1,11 @@
-import advertools as adv
 import requests
 import json
 import time
 import os
+from datetime import datetime, timezone
+import gzip
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # ==========================================
 # ✅ 사용자 설정 영역
@@ -33,88 +36,307 @@ POST_COUNT_PER_SITE = 7
 # OFFSET: 0=최신부터, 5=6번째부터, 10=11번째부터 …
 OFFSET = 0
 
-# 요청 간격(초)
+# 배치 요청 간격(초)
 REQUEST_DELAY = 0.2
+
+# 사이트별 하루 URL 제출 할당량 (GetUrlSubmissionQuota 조회 실패 시 사용)
+DAILY_QUOTA_PER_SITE = 10
 # ==========================================
 
 # ✅ GitHub Actions에서 디코딩된 JSON 파일에서 Bing 키 불러오기
-with open("bing_key.json", "r") as f:
-    bing_key_data = json.load(f)
-BING_API_KEY = bing_key_data["bing_api_key"]
+BING_KEY_FILE = "bing_key.json"
+
+def load_api_key():
+    with open(BING_KEY_FILE, "r") as f:
+        bing_key_data = json.load(f)
+    return bing_key_data["bing_api_key"]
 
-# ✅ Bing Submit URL
-BING_ENDPOINT = f"https://ssl.bing.com/webmaster/api.svc/json/SubmitUrl?apikey={BING_API_KEY}"
+# ✅ Bing Webmaster API
+BING_API_BASE = os.getenv("BING_API_BASE", "https://ssl.bing.com/webmaster/api.svc/json")
+ENGINE = "bing"
+# SubmitUrlBatch 1회 호출당 최대 URL 수
+BATCH_MAX_URLS = 500
+BING_HEADERS = {
+    "User-Agent": "curl/7.12.1",
+    "Content-Type": "application/json"
+}
 
 # ✅ 함수 정의
-def submit_url(data):
-    headers = {
-        "User-Agent": "curl/7.12.1",
-        "Content-Type": "application/json"
+def get_daily_quota(api_key, site):
+    # 오늘 남은 제출 가능 수 (조회 실패 시 None)
+    try:
+        r = requests.get(f"{BING_API_BASE}/GetUrlSubmissionQuota",
+                         params={"siteUrl": site, "apikey": api_key}, headers=BING_HEADERS, timeout=30)
+        if r.status_code == 200:
+            return int((r.json().get("d") or {}).get("DailyQuota"))
+        print(f"⚠️ 할당량 조회 실패: {site} → {r.text}")
+    except Exception as e:
+        print(f"⚠️ 할당량 조회 오류: {site} → {e}")
+    return None
+
+def submit_url_batch(api_key, site, urls):
+    data = {
+        "siteUrl": site,
+        "urlList": urls
     }
     try:
-        r = requests.post(url=BING_ENDPOINT, json=data, headers=headers)
+        r = requests.post(url=f"{BING_API_BASE}/SubmitUrlbatch?apikey={api_key}", json=data, headers=BING_HEADERS, timeout=60)
         return r.status_code, r.text
     except Exception as e:
         return 500, str(e)
 
+def submit_entries(api_key, site, entries):
+    # 배치로 보내고, 배치가 거절되면 반씩 나눠 다시 보내 어떤 URL 이 문제인지 가려냄
+    # 할당량 초과는 나눠도 소용없으므로 그대로 전부 실패 처리
+    # → [(entry, ok, status, response)]
+    if not entries:
+        return []
+    status, text = submit_url_batch(api_key, site, [e["loc"] for e in entries])
+    if status == 200:
+        return [(e, True, status, text) for e in entries]
+    if len(entries) == 1 or "quota" in text.lower() or status >= 500:
+        return [(e, False, status, text) for e in entries]
+    mid = len(entries) // 2
+    return submit_entries(api_key, site, entries[:mid]) + submit_entries(api_key, site, entries[mid:])
+
+def site_budget(api_key, site, ledger):
+    # 남은 할당량은 Bing 에서 조회, 실패하면 제출 기록 기준으로 계산
+    budget = get_daily_quota(api_key, site)
+    if budget is None:
+        budget = max(DAILY_QUOTA_PER_SITE - submitted_today(ledger, ENGINE, site), 0)
+    return budget
+
+def submit_site(api_key, site, selected, ledger):
+    # BATCH_MAX_URLS 씩 보내고 결과를 제출 기록에 남김
+    # → [(entry, ok, status, response)]  (Index_Notify.py 도 이 함수를 씀)
+    done = []
+    for i in range(0, len(selected), BATCH_MAX_URLS):
+        for entry, ok, status, result in submit_entries(api_key, site, selected[i : i + BATCH_MAX_URLS]):
+            url = entry["loc"]
+            record_submission(ledger, ENGINE, site, entry, ok, status, result)
+            done.append((entry, ok, status, result))
+
+            if ok:
+                print(f"✅ 성공: {url}")
+            else:
+                print(f"❌ 실패: {url} → {result}")
+
+        time.sleep(REQUEST_DELAY)
+
+    save_ledger(ledger)
+    return done
 
-# ✅ 통계 변수
-total_urls = 0
-success_count = 0
-fail_count = 0
-fail_list = []
 
 # ==========================================
-# 각 사이트맵 실행
+# ✅ 사이트맵 스트리밍 읽기
 # ==========================================
-for site in SITE_URLS:
-    sitemap_url = f"{site}sitemap.xml"
-    print(f"\n📌 {site} 사이트맵 요청 중: {sitemap_url}")
+# 전체를 DataFrame 으로 만들지 않고 <loc> 를 필요한 개수만큼만 읽고 끊음
+# 사이트맵 인덱스는 하위 사이트맵을 순서대로, 필요할 때만 엶
+SITEMAP_WORKERS = 8
+SITEMAP_TIMEOUT = 30
+SITEMAP_HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; sitemap-reader)"}
+
+def sitemap_url_of(site):
+    # 사이트 주소만 있으면 기본 sitemap.xml
+    if site.rstrip("/").endswith((".xml", ".xml.gz")):
+        return site
+    return site.rstrip("/") + "/sitemap.xml"
+
+def _local(tag):
+    return tag.rsplit("}", 1)[-1]
+
+def iter_sitemap(sitemap_url, depth=0):
+    # {"loc": ..., "lastmod": ...} 를 문서 순서대로 하나씩 돌려줌
+    with requests.get(sitemap_url, headers=SITEMAP_HEADERS, timeout=SITEMAP_TIMEOUT, stream=True) as r:
+        r.raise_for_status()
+        r.raw.decode_content = True
+        src = gzip.GzipFile(fileobj=r.raw) if sitemap_url.endswith(".gz") else r.raw
+        for _, elem in ET.iterparse(src, events=("end",)):
+            name = _local(elem.tag)
+            if name not in ("url", "sitemap"):
+                continue
+            entry = {_local(c.tag): (c.text or "").strip() for c in elem}
+            elem.clear()
+            loc = entry.get("loc")
+            if not loc:
+                continue
+            if name == "sitemap":
+                if depth < 2:
+                    yield from iter_sitemap(loc, depth + 1)
+            else:
+                yield {"loc": loc, "lastmod": entry.get("lastmod", "")}
 
+def read_sitemap(sitemap_url, limit):
+    entries = []
+    for entry in iter_sitemap(sitemap_url):
+        entries.append(entry)
+        if len(entries) >= limit:
+            break
+    return entries
+
+def read_sitemaps(sitemap_urls, limit):
+    # 모든 사이트맵을 동시에 읽음 → {sitemap_url: (entries, error)}
+    results = {}
+    with ThreadPoolExecutor(max_workers=SITEMAP_WORKERS) as ex:
+        futures = {ex.submit(read_sitemap, u, limit): u for u in sitemap_urls}
+        for fut in as_completed(futures):
+            u = futures[fut]
+            try:
+                results[u] = (fut.result(), None)
+            except Exception as e:
+                results[u] = ([], e)
+    return results
+
+
+# ==========================================
+# ✅ 제출 기록 (ledger)
+# ==========================================
+# URL·엔진별 마지막 제출 시각/응답/사이트맵 lastmod 를 남겨 두고
+# 새 URL 이나 lastmod 가 마지막 제출보다 새로운 URL 만 다시 보냄
+LEDGER_PATH = "index_ledger.json"
+# 남는 할당량으로 오래된 미제출 URL 을 찾을 때 사이트맵 앞쪽에서 읽을 개수
+LEDGER_SCAN_PER_SITE = 100
+
+def load_ledger():
+    if not os.path.exists(LEDGER_PATH):
+        return {}
     try:
-        sitemap_urls = adv.sitemap_to_df(sitemap_url)
-        url_list = sitemap_urls["loc"].to_list()
+        with open(LEDGER_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
     except Exception as e:
-        print(f"⚠️ 사이트맵 오류: {sitemap_url} → {e}")
-        continue
-
-    # 최근 OFFSET부터 POST_COUNT_PER_SITE 만큼 선택
-    selected_urls = url_list[OFFSET : OFFSET + POST_COUNT_PER_SITE]
-
-    print(f"총 {len(url_list)}개 URL 중 {len(selected_urls)}개 제출 (OFFSET={OFFSET})")
-
-    for url in selected_urls:
-        total_urls += 1
-        data = {
-            "siteUrl": site,
-            "url": url
-        }
-        status, result = submit_url(data)
-
-        if status == 200:
-            success_count += 1
-            print(f"✅ 성공: {url}")
-        else:
-            fail_count += 1
-            fail_list.append(url)
-            print(f"❌ 실패: {url} → {result}")
+        print(f"⚠️ 제출 기록 읽기 실패: {e}")
+        return {}
 
-        time.sleep(REQUEST_DELAY)
+def save_ledger(ledger):
+    tmp = LEDGER_PATH + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(ledger, f, ensure_ascii=False)
+    os.replace(tmp, LEDGER_PATH)
+
+def _parse_time(value):
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+def needs_submit(ledger, engine, entry):
+    rec = ledger.get(f"{engine}|{entry['loc']}")
+    if not rec or not rec.get("ok"):
+        return True
+    lastmod = _parse_time(entry.get("lastmod"))
+    submitted = _parse_time(rec.get("submitted_at"))
+    return bool(lastmod and submitted and lastmod > submitted)
+
+def submitted_today(ledger, engine, site=None):
+    today = datetime.now(timezone.utc).date()
+    count = 0
+    for rec in ledger.values():
+        if rec.get("engine") != engine or not rec.get("ok"):
+            continue
+        if site and rec.get("site") != site:
+            continue
+        t = _parse_time(rec.get("submitted_at"))
+        if t and t.date() == today:
+            count += 1
+    return count
+
+def ledger_is_cold(ledger, engine):
+    # 캐시가 없거나 만료돼 이 엔진 기록이 하나도 없으면 예전처럼 사이트별 최신 N개만 보냄
+    return not any(rec.get("engine") == engine for rec in ledger.values())
+
+def plan_submissions(site_entries, ledger, engine, per_site, budget):
+    # 1) 사이트별 최신 OFFSET~OFFSET+per_site 중 새것/바뀐 것
+    # 2) 남은 budget 은 사이트를 돌아가며 그 뒤쪽의 미제출 URL 에 나눠 씀
+    plan = {site: [] for site in site_entries}
+    backlog = {}
+    for site, entries in site_entries.items():
+        head = entries[OFFSET : OFFSET + per_site]
+        plan[site] = [e for e in head if needs_submit(ledger, engine, e)]
+        backlog[site] = [e for e in entries[OFFSET + per_site :] if needs_submit(ledger, engine, e)]
+    total = 0
+    for site in plan:
+        plan[site] = plan[site][: max(budget - total, 0)]
+        total += len(plan[site])
+    while total < budget and any(backlog.values()):
+        for site in site_entries:
+            if total >= budget:
+                break
+            if backlog[site]:
+                plan[site].append(backlog[site].pop(0))
+                total += 1
+    return plan
+
+def record_submission(ledger, engine, site, entry, ok, status, response):
+    ledger[f"{engine}|{entry['loc']}"] = {
+        "url": entry["loc"],
+        "engine": engine,
+        "site": site,
+        "submitted_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "ok": ok,
+        "status": status,
+        "response": (response or "")[:300],
+        "lastmod": entry.get("lastmod", ""),
+    }
 
 # ==========================================
-# ✅ 최종 결과
+# 각 사이트맵 실행
 # ==========================================
-print("\n================ 최종 실행 결과 ================")
-print(f"총 요청 URL: {total_urls}개")
-print(f"성공: {success_count}개")
-print(f"실패: {fail_count}개")
+def main():
+    api_key = load_api_key()
+    ledger = load_ledger()
+    sitemap_results = read_sitemaps([sitemap_url_of(site) for site in SITE_URLS], OFFSET + max(POST_COUNT_PER_SITE, LEDGER_SCAN_PER_SITE))
+
+    # 실행 시작 시점에 한 번만 판단 (첫 사이트 제출 후에는 기록이 생겨 더 이상 비어 있지 않음)
+    cold = ledger_is_cold(ledger, ENGINE)
+
+    # ✅ 통계 변수
+    total_urls = 0
+    success_count = 0
+    fail_count = 0
+    fail_list = []
+
+    for site in SITE_URLS:
+        sitemap_url = sitemap_url_of(site)
+        print(f"\n📌 {site} 사이트맵: {sitemap_url}")
+
+        entries, err = sitemap_results[sitemap_url]
+        if err:
+            print(f"⚠️ 사이트맵 오류: {sitemap_url} → {err}")
+            continue
+
+        # 최근 OFFSET부터 POST_COUNT_PER_SITE 중 새것/바뀐 것 + 남는 할당량은 오래된 미제출 URL
+        budget = site_budget(api_key, site, ledger)
+        if cold:
+            budget = min(budget, POST_COUNT_PER_SITE)
+        selected = plan_submissions({site: entries}, ledger, ENGINE, POST_COUNT_PER_SITE, budget)[site]
+
+        print(f"앞쪽 {len(entries)}개 URL 중 {len(selected)}개 제출 (OFFSET={OFFSET}, 남은 할당량 {budget})")
 
-if fail_list:
-    print("\n❌ 실패한 URL 목록:")
-    for u in fail_list:
-        print("-", u)
-print("================================================")
+        for entry, ok, status, result in submit_site(api_key, site, selected, ledger):
+            total_urls += 1
+            if ok:
+                success_count += 1
+            else:
+                fail_count += 1
+                fail_list.append(entry["loc"])
 
+    # ==========================================
+    # ✅ 최종 결과
+    # ==========================================
+    print("\n================ 최종 실행 결과 ================")
+    print(f"총 요청 URL: {total_urls}개")
+    print(f"성공: {success_count}개")
+    print(f"실패: {fail_count}개")
 
+    if fail_list:
+        print("\n❌ 실패한 URL 목록:")
+        for u in fail_list:
+            print("-", u)
+    print("================================================")
 
 
+if __name__ == "__main__":
+    main()
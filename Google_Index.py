@@ -2,7 +2,11 @@
 import os
 import json
 import time
-import advertools as adv
+from datetime import datetime, timezone
+import gzip
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import requests
 import httplib2
 from google.oauth2 import service_account
 from google.auth.transport.requests import AuthorizedSession
@@ -14,7 +18,10 @@ from google.auth.transport.requests import AuthorizedSession
 POST_COUNT_PER_SITEMAP = 7
 # 어디서부터 시작할지 (0=최신부터, 5=6번째부터, 10=11번째부터 …)
 OFFSET = 0
+# 배치 요청 간격(초)
 REQUEST_DELAY = 0.2
+# Indexing API 하루 할당량 (프로젝트 기준)
+DAILY_QUOTA = 200
 # ==========================================
 
 sitemaps = [
@@ -37,69 +44,332 @@ sitemaps = [
 
 JSON_KEY_FILE = "service_account.json"
 SCOPES = ["https://www.googleapis.com/auth/indexing"]
-ENDPOINT = "https://indexing.googleapis.com/v3/urlNotifications:publish"
+ENGINE = "google"
 
 # ✅ 구글 인증 (google-auth 사용)
-credentials = service_account.Credentials.from_service_account_file(
-    JSON_KEY_FILE, scopes=SCOPES
-)
-authed_session = AuthorizedSession(credentials)
-
-# ✅ 통계 변수
-total_urls = 0
-success_count = 0
-fail_count = 0
-fail_list = []
-
-for sitemap in sitemaps:
-    try:
-        sitemap_urls = adv.sitemap_to_df(sitemap)
-        url_lists = sitemap_urls["loc"].to_list()
-        selected_urls = url_lists[OFFSET : OFFSET + POST_COUNT_PER_SITEMAP]
+def open_session():
+    credentials = service_account.Credentials.from_service_account_file(
+        JSON_KEY_FILE, scopes=SCOPES
+    )
+    return AuthorizedSession(credentials)
 
-        print(f"\n📌 {sitemap} → {len(selected_urls)}개 색인 요청 시작 (OFFSET={OFFSET})")
+# ==========================================
+# ✅ Indexing API 배치 요청
+# ==========================================
+# urlNotifications:publish 를 multipart/mixed 배치 1회에 최대 100개씩 묶어 보냄
+# 하위 응답을 URL 별로 나눠 보고, 429/5xx/누락된 것만 지수 백오프로 다시 보냄
+BATCH_ENDPOINT = os.getenv("INDEXING_BATCH_ENDPOINT", "https://indexing.googleapis.com/batch")
+BATCH_SIZE = 100
+BATCH_RETRIES = 3
 
-        for url in selected_urls:
-            total_urls += 1
-            content = {"url": url, "type": "URL_UPDATED"}
+def build_batch_body(urls, boundary):
+    parts = []
+    for i, url in enumerate(urls):
+        parts.append(
+            f"--{boundary}\r\n"
+            "Content-Type: application/http\r\n"
+            f"Content-ID: <item{i}>\r\n"
+            "\r\n"
+            "POST /v3/urlNotifications:publish\r\n"
+            "Content-Type: application/json\r\n"
+            "accept: application/json\r\n"
+            "\r\n"
+            f"{json.dumps({'url': url, 'type': 'URL_UPDATED'})}\r\n"
+        )
+    parts.append(f"--{boundary}--\r\n")
+    return "".join(parts)
 
-            try:
-                response = authed_session.post(ENDPOINT, json=content)
+def parse_batch_response(content_type, text):
+    # → {item 번호: (status, body)}
+    boundary = None
+    for piece in content_type.split(";"):
+        piece = piece.strip()
+        if piece.startswith("boundary="):
+            boundary = piece[len("boundary="):].strip('"')
+    if not boundary:
+        raise ValueError(f"batch 응답에 boundary 없음: {content_type}")
+    results = {}
+    for part in text.split(f"--{boundary}"):
+        part = part.strip()
+        if not part or part == "--":
+            continue
+        head, _, http_part = part.replace("\r\n", "\n").partition("\n\n")
+        item = None
+        for line in head.split("\n"):
+            if line.lower().startswith("content-id:"):
+                cid = line.split(":", 1)[1].strip().strip("<>")
+                if cid.startswith("response-"):
+                    cid = cid[len("response-"):]
+                if cid.startswith("item"):
+                    item = int(cid[len("item"):])
+        if item is None:
+            continue
+        status_line, _, rest = http_part.partition("\n")
+        try:
+            status = int(status_line.split()[1])
+        except (IndexError, ValueError):
+            status = 0
+        _, _, body = rest.partition("\n\n")
+        results[item] = (status, body.strip())
+    return results
+
+def publish_batch(session, urls):
+    # → {url: (status, body)}
+    results = {}
+    pending = list(urls)
+    for attempt in range(BATCH_RETRIES + 1):
+        boundary = f"batch_{int(time.time() * 1000)}_{attempt}"
+        try:
+            r = session.post(
+                BATCH_ENDPOINT,
+                data=build_batch_body(pending, boundary).encode("utf-8"),
+                headers={"Content-Type": f"multipart/mixed; boundary={boundary}"},
+                timeout=60,
+            )
+            if r.status_code == 200:
+                parts = parse_batch_response(r.headers.get("Content-Type", ""), r.text)
+            else:
+                parts = {i: (r.status_code, r.text) for i in range(len(pending))}
+        except Exception as e:
+            parts = {i: (0, str(e)) for i in range(len(pending))}
+
+        retry = []
+        for i, url in enumerate(pending):
+            status, body = parts.get(i, (0, "batch 응답에 항목 없음"))
+            results[url] = (status, body)
+            if status == 0 or status == 429 or status >= 500:
+                retry.append(url)
+        if not retry or attempt == BATCH_RETRIES:
+            break
+        print(f"🔁 배치 재시도 {attempt + 1}/{BATCH_RETRIES}: {len(retry)}개")
+        time.sleep(2 ** attempt)
+        pending = retry
+    return results
+
+def submit_jobs(session, jobs, ledger):
+    # jobs: [(사이트, entry)] 를 BATCH_SIZE 씩 보내고 결과를 제출 기록에 남김
+    # → [(사이트, entry, ok, status, body)]  (Index_Notify.py 도 이 함수를 씀)
+    done = []
+    for i in range(0, len(jobs), BATCH_SIZE):
+        chunk = jobs[i : i + BATCH_SIZE]
+        results = publish_batch(session, [entry["loc"] for _, entry in chunk])
+
+        for site, entry in chunk:
+            url = entry["loc"]
+            status, body = results[url]
+            ok = status == 200
+            record_submission(ledger, ENGINE, site, entry, ok, status, body)
+            done.append((site, entry, ok, status, body))
+
+            if ok:
+                print(f"✅ 성공: {url}")
+            else:
+                print(f"❌ 실패: {url} → {body}")
+
+        save_ledger(ledger)
+        time.sleep(REQUEST_DELAY)
+    return done
+
+# ==========================================
+# ✅ 사이트맵 스트리밍 읽기
+# ==========================================
+# 전체를 DataFrame 으로 만들지 않고 <loc> 를 필요한 개수만큼만 읽고 끊음
+# 사이트맵 인덱스는 하위 사이트맵을 순서대로, 필요할 때만 엶
+SITEMAP_WORKERS = 8
+SITEMAP_TIMEOUT = 30
+SITEMAP_HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; sitemap-reader)"}
+
+def sitemap_url_of(site):
+    # 사이트 주소만 있으면 기본 sitemap.xml
+    if site.rstrip("/").endswith((".xml", ".xml.gz")):
+        return site
+    return site.rstrip("/") + "/sitemap.xml"
+
+def _local(tag):
+    return tag.rsplit("}", 1)[-1]
+
+def iter_sitemap(sitemap_url, depth=0):
+    # {"loc": ..., "lastmod": ...} 를 문서 순서대로 하나씩 돌려줌
+    with requests.get(sitemap_url, headers=SITEMAP_HEADERS, timeout=SITEMAP_TIMEOUT, stream=True) as r:
+        r.raise_for_status()
+        r.raw.decode_content = True
+        src = gzip.GzipFile(fileobj=r.raw) if sitemap_url.endswith(".gz") else r.raw
+        for _, elem in ET.iterparse(src, events=("end",)):
+            name = _local(elem.tag)
+            if name not in ("url", "sitemap"):
+                continue
+            entry = {_local(c.tag): (c.text or "").strip() for c in elem}
+            elem.clear()
+            loc = entry.get("loc")
+            if not loc:
+                continue
+            if name == "sitemap":
+                if depth < 2:
+                    yield from iter_sitemap(loc, depth + 1)
+            else:
+                yield {"loc": loc, "lastmod": entry.get("lastmod", "")}
 
-                if response.status_code == 200:
-                    success_count += 1
-                    print(f"✅ 성공: {url}")
-                else:
-                    fail_count += 1
-                    fail_list.append(url)
-                    print(f"❌ 실패: {url} → {response.text}")
+def read_sitemap(sitemap_url, limit):
+    entries = []
+    for entry in iter_sitemap(sitemap_url):
+        entries.append(entry)
+        if len(entries) >= limit:
+            break
+    return entries
 
+def read_sitemaps(sitemap_urls, limit):
+    # 모든 사이트맵을 동시에 읽음 → {sitemap_url: (entries, error)}
+    results = {}
+    with ThreadPoolExecutor(max_workers=SITEMAP_WORKERS) as ex:
+        futures = {ex.submit(read_sitemap, u, limit): u for u in sitemap_urls}
+        for fut in as_completed(futures):
+            u = futures[fut]
+            try:
+                results[u] = (fut.result(), None)
             except Exception as e:
-                fail_count += 1
-                fail_list.append(url)
-                print(f"⚠️ 오류 발생: {url} → {e}")
+                results[u] = ([], e)
+    return results
+
 
-            time.sleep(REQUEST_DELAY)
+# ==========================================
+# ✅ 제출 기록 (ledger)
+# ==========================================
+# URL·엔진별 마지막 제출 시각/응답/사이트맵 lastmod 를 남겨 두고
+# 새 URL 이나 lastmod 가 마지막 제출보다 새로운 URL 만 다시 보냄
+LEDGER_PATH = "index_ledger.json"
+# 남는 할당량으로 오래된 미제출 URL 을 찾을 때 사이트맵 앞쪽에서 읽을 개수
+LEDGER_SCAN_PER_SITE = 100
 
+def load_ledger():
+    if not os.path.exists(LEDGER_PATH):
+        return {}
+    try:
+        with open(LEDGER_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
     except Exception as e:
-        print(f"⚠️ 사이트맵 오류: {sitemap} → {e}")
+        print(f"⚠️ 제출 기록 읽기 실패: {e}")
+        return {}
+
+def save_ledger(ledger):
+    tmp = LEDGER_PATH + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(ledger, f, ensure_ascii=False)
+    os.replace(tmp, LEDGER_PATH)
+
+def _parse_time(value):
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
 
-# ✅ 최종 결과 요약
-print("\n================ 최종 실행 결과 ================")
-print(f"총 요청 URL: {total_urls}개")
-print(f"성공: {success_count}개")
-print(f"실패: {fail_count}개")
+def needs_submit(ledger, engine, entry):
+    rec = ledger.get(f"{engine}|{entry['loc']}")
+    if not rec or not rec.get("ok"):
+        return True
+    lastmod = _parse_time(entry.get("lastmod"))
+    submitted = _parse_time(rec.get("submitted_at"))
+    return bool(lastmod and submitted and lastmod > submitted)
+
+def submitted_today(ledger, engine, site=None):
+    today = datetime.now(timezone.utc).date()
+    count = 0
+    for rec in ledger.values():
+        if rec.get("engine") != engine or not rec.get("ok"):
+            continue
+        if site and rec.get("site") != site:
+            continue
+        t = _parse_time(rec.get("submitted_at"))
+        if t and t.date() == today:
+            count += 1
+    return count
+
+def ledger_is_cold(ledger, engine):
+    # 캐시가 없거나 만료돼 이 엔진 기록이 하나도 없으면 예전처럼 사이트별 최신 N개만 보냄
+    return not any(rec.get("engine") == engine for rec in ledger.values())
+
+def plan_submissions(site_entries, ledger, engine, per_site, budget):
+    # 1) 사이트별 최신 OFFSET~OFFSET+per_site 중 새것/바뀐 것
+    # 2) 남은 budget 은 사이트를 돌아가며 그 뒤쪽의 미제출 URL 에 나눠 씀
+    plan = {site: [] for site in site_entries}
+    backlog = {}
+    for site, entries in site_entries.items():
+        head = entries[OFFSET : OFFSET + per_site]
+        plan[site] = [e for e in head if needs_submit(ledger, engine, e)]
+        backlog[site] = [e for e in entries[OFFSET + per_site :] if needs_submit(ledger, engine, e)]
+    total = 0
+    for site in plan:
+        plan[site] = plan[site][: max(budget - total, 0)]
+        total += len(plan[site])
+    while total < budget and any(backlog.values()):
+        for site in site_entries:
+            if total >= budget:
+                break
+            if backlog[site]:
+                plan[site].append(backlog[site].pop(0))
+                total += 1
+    return plan
+
+def record_submission(ledger, engine, site, entry, ok, status, response):
+    ledger[f"{engine}|{entry['loc']}"] = {
+        "url": entry["loc"],
+        "engine": engine,
+        "site": site,
+        "submitted_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "ok": ok,
+        "status": status,
+        "response": (response or "")[:300],
+        "lastmod": entry.get("lastmod", ""),
+    }
+
+# ==========================================
+# ✅ 실행
+# ==========================================
+def main():
+    authed_session = open_session()
+    ledger = load_ledger()
+    sitemap_results = read_sitemaps([sitemap_url_of(s) for s in sitemaps], OFFSET + max(POST_COUNT_PER_SITEMAP, LEDGER_SCAN_PER_SITE))
 
-if fail_list:
-    print("\n❌ 실패한 URL 목록:")
-    for u in fail_list:
-        print("-", u)
-print("================================================")
+    site_entries = {}
+    for sitemap in sitemaps:
+        entries, err = sitemap_results[sitemap_url_of(sitemap)]
+        if err:
+            print(f"⚠️ 사이트맵 오류: {sitemap} → {err}")
+            continue
+        site_entries[sitemap] = entries
 
+    budget = max(DAILY_QUOTA - submitted_today(ledger, ENGINE), 0)
+    if ledger_is_cold(ledger, ENGINE):
+        budget = min(budget, POST_COUNT_PER_SITEMAP * len(site_entries))
+    plan = plan_submissions(site_entries, ledger, ENGINE, POST_COUNT_PER_SITEMAP, budget)
+    print(f"오늘 남은 할당량: {budget}개 → 이번 실행 {sum(len(v) for v in plan.values())}개")
 
+    for sitemap, selected in plan.items():
+        print(f"📌 {sitemap} → {len(selected)}개 색인 요청 (OFFSET={OFFSET})")
 
+    jobs = [(sitemap, entry) for sitemap, selected in plan.items() for entry in selected]
+    done = submit_jobs(authed_session, jobs, ledger)
 
+    # ✅ 통계
+    total_urls = len(done)
+    fail_list = [entry["loc"] for _, entry, ok, _, _ in done if not ok]
+    fail_count = len(fail_list)
+    success_count = total_urls - fail_count
 
+    # ✅ 최종 결과 요약
+    print("\n================ 최종 실행 결과 ================")
+    print(f"총 요청 URL: {total_urls}개")
+    print(f"성공: {success_count}개")
+    print(f"실패: {fail_count}개")
 
+    if fail_list:
+        print("\n❌ 실패한 URL 목록:")
+        for u in fail_list:
+            print("-", u)
+    print("================================================")
 
 
+if __name__ == "__main__":
+    main()
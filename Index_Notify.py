@@ -0,0 +1,143 @@
+import os
+import sys
+import json
+from urllib.parse import urlparse
+
+# 제출 기록(ledger)·Google 배치·Bing 배치는 두 색인 스크립트의 것을 그대로 씀
+import Google_Index as google_index
+import Bing_Index as bing_index
+from Google_Index import load_ledger, save_ledger, needs_submit, submitted_today
+
+# ==========================================
+# ✅ 사용자 설정 영역
+# ==========================================
+# 발행 스크립트들이 enqueue_index_notification() 으로 쌓아 둔 큐
+INDEX_QUEUE_PATH = os.getenv("INDEX_QUEUE_PATH", "index_queue.jsonl")
+# 실패한 URL 은 큐에 되돌려 두고, 이 횟수를 넘기면 버림
+MAX_TRIES = 5
+# ==========================================
+
+sys.stdout.reconfigure(encoding="utf-8")
+
+
+# ==========================================
+# ✅ 큐 읽기/되돌리기
+# ==========================================
+def claim_queue():
+    # 큐 파일을 옆으로 옮겨서 읽음 → 그동안 발행된 URL 은 새 큐 파일에 쌓임
+    # 이전 실행이 중간에 죽어 남은 .draining 파일도 함께 처리
+    draining = INDEX_QUEUE_PATH + ".draining"
+    if os.path.exists(INDEX_QUEUE_PATH):
+        if os.path.exists(draining):
+            with open(INDEX_QUEUE_PATH, "r", encoding="utf-8") as src, open(draining, "a", encoding="utf-8") as dst:
+                dst.write(src.read())
+            os.remove(INDEX_QUEUE_PATH)
+        else:
+            os.replace(INDEX_QUEUE_PATH, draining)
+    if not os.path.exists(draining):
+        return [], draining
+
+    items = {}
+    with open(draining, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rec = json.loads(line)
+            except Exception:
+                continue
+            url = rec.get("url")
+            if url and url not in items:
+                items[url] = rec
+    return list(items.values()), draining
+
+def requeue(items):
+    with open(INDEX_QUEUE_PATH, "a", encoding="utf-8") as f:
+        for rec in items:
+            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+
+
+# ==========================================
+# ✅ Google / Bing 알림
+# ==========================================
+def notify_google(entries, ledger):
+    # → 이번에 실패했거나 할당량 때문에 못 보낸 URL 집합
+    if not os.path.exists(google_index.JSON_KEY_FILE):
+        print(f"⚠️ {google_index.JSON_KEY_FILE} 없음 → Google 알림 건너뜀")
+        return set()
+    session = google_index.open_session()
+
+    todo = [e for e in entries if needs_submit(ledger, google_index.ENGINE, e)]
+    budget = max(google_index.DAILY_QUOTA - submitted_today(ledger, google_index.ENGINE), 0)
+    failed = {e["loc"] for e in todo[budget:]}
+    jobs = [(e["site"], e) for e in todo[:budget]]
+    for _, e, ok, _, _ in google_index.submit_jobs(session, jobs, ledger):
+        if not ok:
+            failed.add(e["loc"])
+    return failed
+
+def notify_bing(entries, ledger):
+    if not os.path.exists(bing_index.BING_KEY_FILE):
+        print(f"⚠️ {bing_index.BING_KEY_FILE} 없음 → Bing 알림 건너뜀")
+        return set()
+    api_key = bing_index.load_api_key()
+
+    by_site = {}
+    for e in entries:
+        if needs_submit(ledger, bing_index.ENGINE, e):
+            by_site.setdefault(e["site"], []).append(e)
+
+    failed = set()
+    for site, site_entries in by_site.items():
+        budget = bing_index.site_budget(api_key, site, ledger)
+        failed.update(e["loc"] for e in site_entries[budget:])
+        for e, ok, _, _ in bing_index.submit_site(api_key, site, site_entries[:budget], ledger):
+            if not ok:
+                failed.add(e["loc"])
+    return failed
+
+
+# ==========================================
+# ✅ 실행
+# ==========================================
+def main():
+    items, draining = claim_queue()
+    if not items:
+        print("색인 알림 큐 비어 있음")
+        if os.path.exists(draining):
+            os.remove(draining)
+        return
+
+    entries = []
+    for rec in items:
+        u = urlparse(rec["url"])
+        entries.append({"loc": rec["url"], "lastmod": "", "site": f"{u.scheme}://{u.netloc}/"})
+    print(f"📌 색인 알림 {len(entries)}개")
+
+    ledger = load_ledger()
+    failed = set()
+    try:
+        failed |= notify_google(entries, ledger)
+        failed |= notify_bing(entries, ledger)
+    finally:
+        save_ledger(ledger)
+
+    retry, dropped = [], []
+    for rec in items:
+        if rec["url"] not in failed:
+            continue
+        rec["tries"] = rec.get("tries", 0) + 1
+        (retry if rec["tries"] < MAX_TRIES else dropped).append(rec)
+    requeue(retry)
+    os.remove(draining)
+
+    print("\n================ 최종 실행 결과 ================")
+    print(f"큐: {len(items)}개 / 다음에 재시도: {len(retry)}개 / 포기: {len(dropped)}개")
+    for rec in dropped:
+        print("-", rec["url"])
+    print("================================================")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,11 +4,13 @@ import sys
 import json
 import re
 import time
+import atexit
 import random
 import traceback
 import requests
 import logging
 import pickle
+import threading
 from urllib.parse import quote
 import glob
 from bs4 import BeautifulSoup
@@ -123,27 +125,97 @@ ws4 = get_sheet5()
 # ==================================================
 # 히스토리 관리
 # ==================================================
+# 처리 이력: append-only JSONL 로그 + 메모리 dict 인덱스 (조회/추가 O(1))
+# 기존 {HISTORY_PATH} JSON 목록은 처음 한 번만 옮겨 옴
+HISTORY_LOG_PATH = os.path.splitext(HISTORY_PATH)[0] + ".jsonl"
+HISTORY_COMPACT_RATIO = 2  # 로그 줄 수가 고유 키의 2배를 넘으면 압축
+
+_history = None  # {key: 처음 기록된 시각}
+_history_lines = 0
+_history_lock = threading.Lock()
+
+def _load_history():
+    global _history, _history_lines
+    if _history is not None:
+        return _history
+    history, lines = {}, 0
+    if os.path.exists(HISTORY_LOG_PATH):
+        with open(HISTORY_LOG_PATH, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                lines += 1
+                try:
+                    rec = json.loads(line)
+                    history.setdefault(rec["key"], rec.get("ts", 0))
+                except Exception:
+                    continue  # 중간에 끊긴 마지막 줄 등
+    elif os.path.exists(HISTORY_PATH):
+        try:
+            with open(HISTORY_PATH, "r", encoding="utf-8") as f:
+                for key in json.load(f).get("pairs", []):
+                    history.setdefault(key, 0)
+        except Exception as e:
+            debug(f"load_processed_pairs failed: {e}")
+        lines = -1  # 이관분은 바로 로그로 씀
+    _history = history
+    _history_lines = lines
+    if lines < 0 or lines > HISTORY_COMPACT_RATIO * max(len(history), 1):
+        _compact_history_locked()
+    return _history
+
+def _compact_history_locked():
+    global _history_lines
+    tmp = HISTORY_LOG_PATH + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        for key, ts in _history.items():
+            f.write(json.dumps({"key": key, "ts": ts}, ensure_ascii=False) + "\n")
+    os.replace(tmp, HISTORY_LOG_PATH)
+    _history_lines = len(_history)
+
+def compact_history():
+    with _history_lock:
+        _load_history()
+        _compact_history_locked()
+
+def history_add(key):
+    global _history_lines
+    with _history_lock:
+        history = _load_history()
+        if key in history:
+            return False
+        ts = int(time.time())
+        with open(HISTORY_LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"key": key, "ts": ts}, ensure_ascii=False) + "\n")
+        history[key] = ts
+        _history_lines += 1
+        return True
+
 def load_processed_pairs():
-    if not os.path.exists(HISTORY_PATH):
-        return []
-    try:
-        with open(HISTORY_PATH, "r", encoding="utf-8") as f:
-            return json.load(f).get("pairs", [])
-    except Exception:
-        return []
+    with _history_lock:
+        return list(_load_history())
 
 def save_processed_pair(country, city, category):
-    processed = load_processed_pairs()
-    key = f"{country}|{city}|{category}"
-    if key not in processed:
-        processed.append(key)
-    with open(HISTORY_PATH, "w", encoding="utf-8") as f:
-        json.dump({"pairs": processed}, f, ensure_ascii=False, indent=2)
+    history_add(f"{country}|{city}|{category}")
 
 def debug(msg):
     print(msg)
     logger.debug(msg)
 
+# 발행 직후 URL 을 로컬 큐(JSONL)에 넣어 두면 Index_Notify.py 가 Google/Bing 에 묶어서 알림
+INDEX_QUEUE_PATH = os.getenv("INDEX_QUEUE_PATH", "index_queue.jsonl")
+
+def enqueue_index_notification(url):
+    if not url:
+        return
+    rec = {"url": url, "ts": int(time.time()), "source": os.path.basename(__file__)}
+    try:
+        with open(INDEX_QUEUE_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+    except Exception as e:
+        debug(f"색인 큐 기록 실패: {e}")
+
 def log_step_qr(row, msg_q, msg_r):
     try:
         ws4.update_cell(row, 17, msg_q)
@@ -403,11 +475,158 @@ def normalize_place_title(title):
     title = re.sub(r"\s+", " ", title)
     return title
 
+# ==================================================
+# Google Places 캐시 (스크립트 간 공유, 실행 간 유지)
+# ==================================================
+PLACES_CACHE_PATH = "google_places_cache.json"
+PLACES_PHOTO_TTL = 7 * 24 * 3600  # photo_reference 는 만료될 수 있어 더 짧게 유지
+# Text Search 결과에도 photos[].photo_reference 가 들어 있어 같은 수명으로 맞춤
+PLACES_TEXTSEARCH_TTL = PLACES_PHOTO_TTL
+PLACES_CACHEABLE_STATUS = ("OK", "ZERO_RESULTS", "NOT_FOUND")
+
+_places_cache = None
+_places_cache_lock = threading.Lock()
+places_cache_stats = {"textsearch_hit": 0, "textsearch_miss": 0, "photos_hit": 0, "photos_miss": 0}
+
+def _normalize_places_query(query):
+    return re.sub(r"\s+", " ", str(query or "")).strip().lower()
+
+def _load_places_cache():
+    global _places_cache
+    if _places_cache is None:
+        _places_cache = {"textsearch": {}, "photos": {}, "stats": {}}
+        if os.path.exists(PLACES_CACHE_PATH):
+            try:
+                with open(PLACES_CACHE_PATH, "r", encoding="utf-8") as f:
+                    _places_cache.update(json.load(f))
+            except Exception as e:
+                print(f"[Places 캐시] 로드 실패: {e}")
+    return _places_cache
+
+def _places_cache_get(ns, key, ttl):
+    with _places_cache_lock:
+        entry = _load_places_cache()[ns].get(key)
+        if entry and time.time() - entry.get("cached_at", 0) < ttl:
+            places_cache_stats[f"{ns}_hit"] += 1
+            return entry["value"]
+        places_cache_stats[f"{ns}_miss"] += 1
+        return None
+
+def _places_cache_put(ns, key, value):
+    with _places_cache_lock:
+        _load_places_cache()[ns][key] = {"value": value, "cached_at": time.time()}
+
+@atexit.register
+def save_places_cache():
+    # 만료 항목 정리 + 누적 hit/miss(=과금 호출 수) 기록
+    with _places_cache_lock:
+        if _places_cache is None:
+            return
+        # 같은 파일을 쓰는 다른 스크립트가 그사이 저장한 항목을 덮어쓰지 않도록 디스크 내용과 합침
+        on_disk = {}
+        if os.path.exists(PLACES_CACHE_PATH):
+            try:
+                with open(PLACES_CACHE_PATH, "r", encoding="utf-8") as f:
+                    on_disk = json.load(f)
+            except Exception as e:
+                print(f"[Places 캐시] 병합용 로드 실패: {e}")
+        now = time.time()
+        for ns, ttl in (("textsearch", PLACES_TEXTSEARCH_TTL), ("photos", PLACES_PHOTO_TTL)):
+            merged = dict(on_disk.get(ns, {}))
+            for k, v in _places_cache[ns].items():
+                if v.get("cached_at", 0) >= merged.get(k, {}).get("cached_at", 0):
+                    merged[k] = v
+            _places_cache[ns] = {k: v for k, v in merged.items() if now - v.get("cached_at", 0) < ttl}
+        # 누적 통계 = 디스크에 있던 값 + 이번 실행분
+        total = dict(on_disk.get("stats", {}))
+        for k, v in places_cache_stats.items():
+            total[k] = total.get(k, 0) + v
+        _places_cache["stats"] = total
+        try:
+            tmp = PLACES_CACHE_PATH + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(_places_cache, f, ensure_ascii=False, indent=2)
+            os.replace(tmp, PLACES_CACHE_PATH)
+        except Exception as e:
+            print(f"[Places 캐시] 저장 실패: {e}")
+        print(
+            "[Places 캐시] 이번 실행 "
+            f"텍스트검색 hit {places_cache_stats['textsearch_hit']} / miss {places_cache_stats['textsearch_miss']} · "
+            f"사진 hit {places_cache_stats['photos_hit']} / miss {places_cache_stats['photos_miss']}"
+        )
+        for k in places_cache_stats:
+            places_cache_stats[k] = 0
+
+def places_text_search(query, language="ko", place_type="", timeout=30):
+    # Text Search 응답(JSON)을 정규화된 검색어 기준으로 캐시
+    key = f"{language}|{place_type}|{_normalize_places_query(query)}"
+    cached = _places_cache_get("textsearch", key, PLACES_TEXTSEARCH_TTL)
+    if cached is not None:
+        return cached
+    params = {"query": query, "key": GOOGLE_MAPS_API_KEY, "language": language}
+    if place_type:
+        params["type"] = place_type
+    res = requests.get(
+        "https://maps.googleapis.com/maps/api/place/textsearch/json",
+        params=params, headers={"User-Agent": "Mozilla/5.0"}, timeout=timeout
+    )
+    data = res.json()
+    if data.get("status", "") in PLACES_CACHEABLE_STATUS:
+        # next_page_token 은 수 분 내 만료되므로 캐시에 남기지 않음
+        _places_cache_put("textsearch", key, {k: v for k, v in data.items() if k != "next_page_token"})
+    return data
+
+def places_text_search_pages(query, language="ko", max_pages=3, timeout=30):
+    # next_page_token 으로 최대 max_pages(페이지당 20건)까지 이어받은 결과 목록을 한 항목으로 캐시
+    key = f"{language}||{_normalize_places_query(query)}|pages={max_pages}"
+    cached = _places_cache_get("textsearch", key, PLACES_TEXTSEARCH_TTL)
+    if cached is not None:
+        return cached
+    url = "https://maps.googleapis.com/maps/api/place/textsearch/json"
+    params = {"query": query, "key": GOOGLE_MAPS_API_KEY, "language": language}
+    results = []
+    status = ""
+    for page in range(max_pages):
+        if page:
+            with _places_cache_lock:
+                places_cache_stats["textsearch_miss"] += 1
+        data = requests.get(url, params=params, headers={"User-Agent": "Mozilla/5.0"}, timeout=timeout).json()
+        if page == 0:
+            status = data.get("status", "")
+        results.extend(data.get("results", []))
+        token = data.get("next_page_token")
+        if not token:
+            break
+        # 토큰은 발급 직후에는 INVALID_REQUEST 가 나므로 잠시 대기
+        time.sleep(2)
+        params = {"pagetoken": token, "key": GOOGLE_MAPS_API_KEY}
+    if status in PLACES_CACHEABLE_STATUS:
+        _places_cache_put("textsearch", key, results)
+    return results
+
+def places_photo_refs(place_id, language="ko", timeout=30):
+    # Place Details 의 photo_reference 목록을 place_id 기준으로 캐시 (언어 무관하게 공유)
+    cached = _places_cache_get("photos", place_id, PLACES_PHOTO_TTL)
+    if cached is not None:
+        return cached
+    params = {"place_id": place_id, "fields": "photos", "key": GOOGLE_MAPS_API_KEY, "language": language}
+    res = requests.get(
+        "https://maps.googleapis.com/maps/api/place/details/json",
+        params=params, headers={"User-Agent": "Mozilla/5.0"}, timeout=timeout
+    )
+    data = res.json()
+    photos = data.get("result", {}).get("photos", [])
+    if isinstance(photos, dict):
+        photos = [photos]
+    refs = [p.get("photo_reference") for p in photos if p.get("photo_reference")]
+    if data.get("status", "") in PLACES_CACHEABLE_STATUS:
+        _places_cache_put("photos", place_id, refs)
+    return refs
+
 def get_google_places_textsearch(country, city, limit=10):
     if not GOOGLE_MAPS_API_KEY:
         debug("GOOGLE_MAPS_API_KEY가 설정되어 있지 않습니다.")
         return []
-    url = "https://maps.googleapis.com/maps/api/place/textsearch/json"
     seen = set()
     places = []
     try:
@@ -418,18 +637,12 @@ def get_google_places_textsearch(country, city, limit=10):
             f"{country} {city} 遊園地",
             f"{country} {city} 体験学習",
             f"{country} {city} レジャー",
+            f"{country} {city} 人気スポット",
         ]
         for query in queries:
             if len(places) >= limit:
                 break
-            params = {
-                "query": query,
-                "key": GOOGLE_MAPS_API_KEY,
-                "language": "ja",
-            }
-            res = requests.get(url, params=params, timeout=30)
-            data = res.json()
-            for r in data.get("results", []):
+            for r in places_text_search_pages(query, language="ja", max_pages=3):
                 name = r.get("name", "").strip()
                 if not name:
                     continue
@@ -447,83 +660,49 @@ def get_google_places_textsearch(country, city, limit=10):
                 })
                 if len(places) >= limit:
                     break
-
-        if len(places) < limit:
-            alt_queries = [
-                f"{city} アクティビティ",
-                f"{city} 体験",
-                f"{city} 人気スポット",
-            ]
-            for query in alt_queries:
-                if len(places) >= limit:
-                    break
-                params["query"] = f"{country} {query}"
-                res = requests.get(url, params=params, timeout=30)
-                data = res.json()
-                for r in data.get("results", []):
-                    name = r.get("name", "").strip()
-                    if not name:
-                        continue
-                    name_norm = normalize_place_title(name)
-                    if name_norm.lower() in seen:
-                        continue
-                    seen.add(name_norm.lower())
-                    addr = r.get("formatted_address", "").strip()
-                    places.append({
-                        "contentId": r.get("place_id", ""),
-                        "title": name_norm,
-                        "addr": addr,
-                        "raw": r,
-                        "score": (r.get("rating") or 0) + min((r.get("user_ratings_total") or 0) / 100.0, 5)
-                    })
-                    if len(places) >= limit:
-                        break
+        debug(f"Google Places 후보 풀: {len(places)}개 (목표 {limit})")
         return places[:limit]
     except Exception as e:
         debug(f"⚠️ Google Places TextSearch 실패: {e}")
         return []
 
-def get_google_place_photos(place_name, count=3, country="", city=""):
+def split_city_places(pool, posts=10, per_post=10):
+    # 점수순 후보 풀을 포스팅별로 겹치지 않게 나눔
+    # 풀이 모자라 10개를 못 채우는 글만 풀을 회전시켜 다시 사용
+    pool = sorted(pool, key=lambda x: x.get("score", 0), reverse=True)
+    chunks = []
+    for i in range(posts):
+        start = i * per_post
+        chunk = pool[start:start + per_post]
+        if pool and len(chunk) < per_post:
+            used = {p["title"] for p in chunk}
+            offset = start % len(pool)
+            rotated = pool[offset:] + pool[:offset]
+            chunk += [p for p in rotated if p["title"] not in used][:per_post - len(chunk)]
+        chunks.append(chunk)
+    return chunks
+
+def get_google_place_photos(place_name, count=3, country="", city="", place_id=""):
     if not GOOGLE_MAPS_API_KEY:
         return []
     try:
-        headers = {"User-Agent": "Mozilla/5.0"}
-        query = " ".join([x.strip() for x in [country, city, place_name] if x and x.strip()]).strip()
-
-        search_url = "https://maps.googleapis.com/maps/api/place/textsearch/json"
-        search_params = {
-            "query": query,
-            "key": GOOGLE_MAPS_API_KEY,
-            "language": "ja"
-        }
-        res = requests.get(search_url, params=search_params, headers=headers, timeout=30)
-        data = res.json()
-        results = data.get("results", [])
-        if not results:
-            return []
-
-        selected = results[0]
-        place_id = selected.get("place_id", "")
         if not place_id:
-            return []
-
-        details_url = "https://maps.googleapis.com/maps/api/place/details/json"
-        details_params = {
-            "place_id": place_id,
-            "fields": "photos,name,formatted_address",
-            "key": GOOGLE_MAPS_API_KEY,
-            "language": "ja"
-        }
-        data2 = requests.get(details_url, params=details_params, headers=headers, timeout=30).json()
-        photos = data2.get("result", {}).get("photos", [])
-        if isinstance(photos, dict):
-            photos = [photos]
+            query = " ".join([x.strip() for x in [country, city, place_name] if x and x.strip()]).strip()
+
+            data = places_text_search(query, language="ja")
+            results = data.get("results", [])
+            if not results:
+                return []
+
+            selected = results[0]
+            place_id = selected.get("place_id", "")
+            if not place_id:
+                return []
+
+        photo_refs = places_photo_refs(place_id, language="ja")
 
         photo_urls = []
-        for p in photos[:count]:
-            photo_ref = p.get("photo_reference")
-            if not photo_ref:
-                continue
+        for photo_ref in photo_refs[:count]:
             photo_url = (
                 "https://maps.googleapis.com/maps/api/place/photo"
                 f"?maxwidth=1600&photo_reference={photo_ref}&key={GOOGLE_MAPS_API_KEY}"
@@ -539,7 +718,7 @@ def get_place_images(place, count=3, country="", city=""):
     images = []
     if place.get("image"):
         images.append(place["image"])
-    google_images = get_google_place_photos(title, count=count, country=country, city=city)
+    google_images = get_google_place_photos(title, count=count, country=country, city=city, place_id=place.get("contentId", ""))
     for img in google_images:
         if img and img not in images:
             images.append(img)
@@ -636,12 +815,16 @@ def process_one_city_ten_posts(row_idx, country, city):
     debug(f"▶ 선택된 도시: {country} {city}")
     log_step_qr(row_idx, f"{country} {city} 시작", f"{country} {city} 시작")
 
+    # 도시 후보는 한 번만 넉넉히 수집해 10개 글에 겹치지 않게 배분
+    city_pool = get_google_places_textsearch(country, city, limit=100)
+    city_chunks = split_city_places(city_pool, posts=10, per_post=10)
+
     for idx in range(10):
         try:
             category_name = "액티비티"
             debug(f"▶ {idx+1}/10 시작")
 
-            places_raw = get_google_places_textsearch(country, city, limit=10)
+            places_raw = [dict(p) for p in city_chunks[idx]]
             if not places_raw:
                 fallback = [
                     f"{city} の代表的なアクティビティ",
@@ -715,6 +898,7 @@ def process_one_city_ten_posts(row_idx, country, city):
                 isDraft=False,
                 fetchImages=True
             ).execute()
+            enqueue_index_notification(res.get("url", ""))
 
             debug(f"Blogger 업로드 성공: {res.get('url', '')}")
             log_step_qr(row_idx, f"완료 {idx+1}/10", res.get("url", ""))
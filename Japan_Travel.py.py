@@ -4,6 +4,7 @@ import sys
 import json
 import re
 import time
+import threading
 import random
 import traceback
 import requests
@@ -103,27 +104,97 @@ ws4 = get_sheet5()
 # ==================================================
 # 히스토리 관리
 # ==================================================
+# 처리 이력: append-only JSONL 로그 + 메모리 dict 인덱스 (조회/추가 O(1))
+# 기존 {HISTORY_PATH} JSON 목록은 처음 한 번만 옮겨 옴
+HISTORY_LOG_PATH = os.path.splitext(HISTORY_PATH)[0] + ".jsonl"
+HISTORY_COMPACT_RATIO = 2  # 로그 줄 수가 고유 키의 2배를 넘으면 압축
+
+_history = None  # {key: 처음 기록된 시각}
+_history_lines = 0
+_history_lock = threading.Lock()
+
+def _load_history():
+    global _history, _history_lines
+    if _history is not None:
+        return _history
+    history, lines = {}, 0
+    if os.path.exists(HISTORY_LOG_PATH):
+        with open(HISTORY_LOG_PATH, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                lines += 1
+                try:
+                    rec = json.loads(line)
+                    history.setdefault(rec["key"], rec.get("ts", 0))
+                except Exception:
+                    continue  # 중간에 끊긴 마지막 줄 등
+    elif os.path.exists(HISTORY_PATH):
+        try:
+            with open(HISTORY_PATH, "r", encoding="utf-8") as f:
+                for key in json.load(f).get("pairs", []):
+                    history.setdefault(key, 0)
+        except Exception as e:
+            debug(f"load_processed_pairs failed: {e}")
+        lines = -1  # 이관분은 바로 로그로 씀
+    _history = history
+    _history_lines = lines
+    if lines < 0 or lines > HISTORY_COMPACT_RATIO * max(len(history), 1):
+        _compact_history_locked()
+    return _history
+
+def _compact_history_locked():
+    global _history_lines
+    tmp = HISTORY_LOG_PATH + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        for key, ts in _history.items():
+            f.write(json.dumps({"key": key, "ts": ts}, ensure_ascii=False) + "\n")
+    os.replace(tmp, HISTORY_LOG_PATH)
+    _history_lines = len(_history)
+
+def compact_history():
+    with _history_lock:
+        _load_history()
+        _compact_history_locked()
+
+def history_add(key):
+    global _history_lines
+    with _history_lock:
+        history = _load_history()
+        if key in history:
+            return False
+        ts = int(time.time())
+        with open(HISTORY_LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"key": key, "ts": ts}, ensure_ascii=False) + "\n")
+        history[key] = ts
+        _history_lines += 1
+        return True
+
 def load_processed_pairs():
-    if not os.path.exists(HISTORY_PATH):
-        return []
-    try:
-        with open(HISTORY_PATH, "r", encoding="utf-8") as f:
-            return json.load(f).get("pairs", [])
-    except Exception:
-        return []
+    with _history_lock:
+        return list(_load_history())
 
 def save_processed_pair(country, city):
-    processed = load_processed_pairs()
-    key = f"{country}|{city}"
-    if key not in processed:
-        processed.append(key)
-    with open(HISTORY_PATH, "w", encoding="utf-8") as f:
-        json.dump({"pairs": processed}, f, ensure_ascii=False, indent=2)
+    history_add(f"{country}|{city}")
 
 def debug(msg):
     print(msg)
     logger.debug(msg)
 
+# 발행 직후 URL 을 로컬 큐(JSONL)에 넣어 두면 Index_Notify.py 가 Google/Bing 에 묶어서 알림
+INDEX_QUEUE_PATH = os.getenv("INDEX_QUEUE_PATH", "index_queue.jsonl")
+
+def enqueue_index_notification(url):
+    if not url:
+        return
+    rec = {"url": url, "ts": int(time.time()), "source": os.path.basename(__file__)}
+    try:
+        with open(INDEX_QUEUE_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+    except Exception as e:
+        debug(f"색인 큐 기록 실패: {e}")
+
 def log_step(row, msg):
     try:
         prev = ws4.cell(row, 16).value or ""
@@ -699,6 +770,7 @@ def main():
             isDraft=False,
             fetchImages=True
         ).execute()
+        enqueue_index_notification(res.get("url", ""))
 
         debug(f"Blogger 업로드 성공: {res.get('url', '')}")
         ws4.update_cell(row_idx, 3, "完")
@@ -12,9 +12,11 @@ import traceback
 import urllib.parse
 import glob
 import pickle
+import threading
 from bs4 import BeautifulSoup
 import requests
-from PIL import Image, ImageDraw, ImageFont
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from PIL import Image, ImageDraw, ImageFont, ImageFile
 
 import gspread
 from google.oauth2.service_account import Credentials as SA_Credentials
@@ -142,23 +144,100 @@ def get_blogger_service():
 blog_handler = get_blogger_service()
 
 
+# 처리 이력: append-only JSONL 로그 + 메모리 dict 인덱스 (조회/추가 O(1))
+# 기존 {HISTORY_PATH} JSON 목록은 처음 한 번만 옮겨 옴
+HISTORY_LOG_PATH = os.path.splitext(HISTORY_PATH)[0] + ".jsonl"
+HISTORY_COMPACT_RATIO = 2  # 로그 줄 수가 고유 키의 2배를 넘으면 압축
+
+_history = None  # {key: 처음 기록된 시각}
+_history_lines = 0
+_history_lock = threading.Lock()
+
+
+def _load_history():
+    global _history, _history_lines
+    if _history is not None:
+        return _history
+    history, lines = {}, 0
+    if os.path.exists(HISTORY_LOG_PATH):
+        with open(HISTORY_LOG_PATH, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                lines += 1
+                try:
+                    rec = json.loads(line)
+                    history.setdefault(rec["key"], rec.get("ts", 0))
+                except Exception:
+                    continue  # 중간에 끊긴 마지막 줄 등
+    elif os.path.exists(HISTORY_PATH):
+        try:
+            with open(HISTORY_PATH, "r", encoding="utf-8") as f:
+                for key in json.load(f).get("regions", []):
+                    history.setdefault(key, 0)
+        except Exception as e:
+            print("load_processed_regions failed:", e)
+        lines = -1  # 이관분은 바로 로그로 씀
+    _history = history
+    _history_lines = lines
+    if lines < 0 or lines > HISTORY_COMPACT_RATIO * max(len(history), 1):
+        _compact_history_locked()
+    return _history
+
+
+def _compact_history_locked():
+    global _history_lines
+    tmp = HISTORY_LOG_PATH + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        for key, ts in _history.items():
+            f.write(json.dumps({"key": key, "ts": ts}, ensure_ascii=False) + "\n")
+    os.replace(tmp, HISTORY_LOG_PATH)
+    _history_lines = len(_history)
+
+
+def compact_history():
+    with _history_lock:
+        _load_history()
+        _compact_history_locked()
+
+
+def history_add(key):
+    global _history_lines
+    with _history_lock:
+        history = _load_history()
+        if key in history:
+            return False
+        ts = int(time.time())
+        with open(HISTORY_LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"key": key, "ts": ts}, ensure_ascii=False) + "\n")
+        history[key] = ts
+        _history_lines += 1
+        return True
+
+
 def load_processed_regions():
-    if not os.path.exists(HISTORY_PATH):
-        return []
-    try:
-        with open(HISTORY_PATH, "r", encoding="utf-8") as f:
-            return json.load(f).get("regions", [])
-    except:
-        return []
+    with _history_lock:
+        return list(_load_history())
 
 
 def save_processed_region(region, city):
-    processed = load_processed_regions()
-    key = f"{region} {city}"
-    if key not in processed:
-        processed.append(key)
-    with open(HISTORY_PATH, "w", encoding="utf-8") as f:
-        json.dump({"regions": processed}, f, ensure_ascii=False, indent=2)
+    history_add(f"{region} {city}")
+
+
+# 발행 직후 URL 을 로컬 큐(JSONL)에 넣어 두면 Index_Notify.py 가 Google/Bing 에 묶어서 알림
+INDEX_QUEUE_PATH = os.getenv("INDEX_QUEUE_PATH", "index_queue.jsonl")
+
+
+def enqueue_index_notification(url):
+    if not url:
+        return
+    rec = {"url": url, "ts": int(time.time()), "source": os.path.basename(__file__)}
+    try:
+        with open(INDEX_QUEUE_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+    except Exception as e:
+        print("⚠️ 색인 큐 기록 실패:", e)
 
 
 def log_step(row, msg: str):
@@ -424,21 +503,172 @@ def get_overview_from_place(place):
     return place.get("raw", {}).get("formatted_address", "상세 설명이 제공되지 않습니다.")
 
 
+IMAGE_VERDICT_CACHE_PATH = "image_verdict_cache.json"
+IMAGE_VERDICT_TTL = 7 * 24 * 3600
+IMAGE_VALIDATE_WORKERS = 6
+IMAGE_HEAD_MAX_BYTES = 96 * 1024
+IMAGE_MIN_SIDE = 100
+
+_image_verdicts = None
+_image_verdict_lock = threading.Lock()
+
+def _image_cache_key(url):
+    # Google photo URL 의 API key 는 캐시 파일에 남기지 않음
+    return re.sub(r"([?&])key=[^&]*&?", r"\1", url).rstrip("?&")
+
+def _load_image_verdicts():
+    global _image_verdicts
+    with _image_verdict_lock:
+        if _image_verdicts is None:
+            _image_verdicts = {}
+            if os.path.exists(IMAGE_VERDICT_CACHE_PATH):
+                try:
+                    with open(IMAGE_VERDICT_CACHE_PATH, "r", encoding="utf-8") as f:
+                        _image_verdicts = json.load(f)
+                except Exception as e:
+                    print(f"[IMG CACHE WARN] 로드 실패: {e}")
+        return _image_verdicts
+
+def _save_image_verdicts():
+    with _image_verdict_lock:
+        if _image_verdicts is None:
+            return
+        now = time.time()
+        data = {k: v for k, v in _image_verdicts.items() if now - v.get("checked_at", 0) < IMAGE_VERDICT_TTL}
+        try:
+            with open(IMAGE_VERDICT_CACHE_PATH, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            print(f"[IMG CACHE WARN] 저장 실패: {e}")
+
+def _sniff_image_format(head):
+    if head.startswith(b"\xff\xd8\xff"):
+        return "jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return "gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    if head[:2] == b"BM":
+        return "bmp"
+    return ""
+
+def _webp_size(head):
+    # PIL 은 잘린 WebP 를 열지 못하므로 VP8/VP8L/VP8X 청크 헤더에서 직접 읽음
+    chunk = head[12:16]
+    if chunk == b"VP8X" and len(head) >= 30:
+        return 1 + int.from_bytes(head[24:27], "little"), 1 + int.from_bytes(head[27:30], "little")
+    if chunk == b"VP8 " and len(head) >= 30 and head[23:26] == b"\x9d\x01\x2a":
+        return int.from_bytes(head[26:28], "little") & 0x3FFF, int.from_bytes(head[28:30], "little") & 0x3FFF
+    if chunk == b"VP8L" and len(head) >= 25 and head[20] == 0x2F:
+        bits = int.from_bytes(head[21:25], "little")
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    return None
+
+def _probe_image_header(url):
+    # 앞부분 몇 KB만 받아서 매직 바이트와 헤더상의 가로/세로 크기를 확인
+    # 네트워크 오류는 None 을 돌려주고 캐시에 남기지 않음
+    headers = {"User-Agent": "Mozilla/5.0"}
+    try:
+        with requests.get(url, headers=headers, timeout=15, stream=True, allow_redirects=True) as res:
+            if res.status_code != 200:
+                print(f"[IMG GET FAIL] {res.status_code} | {url}")
+                return {"ok": False, "reason": f"status {res.status_code}"}
+
+            ctype = (res.headers.get("content-type") or "").lower()
+            if ctype and "image" not in ctype:
+                print(f"[IMG GET NOT IMAGE] {ctype} | {url}")
+                return {"ok": False, "reason": f"content-type {ctype}"}
+
+            parser = ImageFile.Parser()
+            head = b""
+            fmt = ""
+            size = None
+            for chunk in res.iter_content(chunk_size=8192):
+                if not chunk:
+                    continue
+                if len(head) < 32:
+                    head += chunk[:32]
+                    if len(head) >= 12 and not fmt:
+                        fmt = _sniff_image_format(head)
+                        if not fmt:
+                            break
+                if fmt == "webp":
+                    size = _webp_size(head)
+                    if size or len(head) >= 32:
+                        break
+                    continue
+                parser.feed(chunk)
+                if parser.image is not None:
+                    size = parser.image.size
+                    break
+                if parser.data is not None and len(parser.data) >= IMAGE_HEAD_MAX_BYTES:
+                    break
+    except (requests.RequestException, OSError) as e:
+        print(f"[IMG VALIDATE ERROR] {type(e).__name__}: {e} | {url}")
+        return None
+    except Exception as e:
+        print(f"[IMG VERIFY FAIL] {type(e).__name__} | {url}")
+        return {"ok": False, "reason": f"parse {type(e).__name__}"}
+
+    if not fmt:
+        print(f"[IMG MAGIC FAIL] {head[:12]!r} | {url}")
+        return {"ok": False, "reason": "magic"}
+    if not size:
+        print(f"[IMG HEADER INCOMPLETE] {fmt} | {url}")
+        return {"ok": False, "reason": "header", "format": fmt}
+    width, height = size
+    if width < IMAGE_MIN_SIDE or height < IMAGE_MIN_SIDE:
+        print(f"[IMG TOO SMALL] {width}x{height} | {url}")
+        return {"ok": False, "reason": "dimensions", "format": fmt, "width": width, "height": height}
+    return {"ok": True, "format": fmt, "width": width, "height": height}
+
+def validate_image_urls(urls, max_workers=IMAGE_VALIDATE_WORKERS):
+    # 후보 URL 을 한 번에 병렬 검증 → {url: bool}
+    verdicts = _load_image_verdicts()
+    now = time.time()
+    results = {}
+    pending = []
+    for url in urls:
+        if not url or not isinstance(url, str):
+            continue
+        url = url.strip()
+        if url in results or url in pending:
+            continue
+        if not url.startswith(("http://", "https://")):
+            results[url] = False
+            continue
+        cached = verdicts.get(_image_cache_key(url))
+        if cached and now - cached.get("checked_at", 0) < IMAGE_VERDICT_TTL:
+            results[url] = bool(cached.get("ok"))
+            continue
+        pending.append(url)
+
+    if not pending:
+        return results
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(pending))) as ex:
+        futures = {ex.submit(_probe_image_header, url): url for url in pending}
+        for fut in as_completed(futures):
+            url = futures[fut]
+            verdict = fut.result()
+            if verdict is None:
+                results[url] = False
+                continue
+            verdict["checked_at"] = time.time()
+            with _image_verdict_lock:
+                verdicts[_image_cache_key(url)] = verdict
+            results[url] = bool(verdict["ok"])
+
+    _save_image_verdicts()
+    return results
+
 def is_valid_image_url(url):
     if not url or not isinstance(url, str):
         return False
     url = url.strip()
-    if not url.startswith(("http://", "https://")):
-        return False
-    try:
-        headers = {"User-Agent": "Mozilla/5.0"}
-        res = requests.get(url, headers=headers, timeout=10, stream=True)
-        if res.status_code != 200:
-            return False
-        content_type = res.headers.get("content-type", "").lower()
-        return "image" in content_type
-    except:
-        return False
+    return validate_image_urls([url]).get(url, False)
 
 
 def get_google_place_photos_by_name(place_name, max_photos=3, region="", city=""):
@@ -485,13 +715,14 @@ def get_best_place_image(place):
     if title:
         candidates.extend(get_google_place_photos_by_name(title, max_photos=3, region=region, city=city))
     candidates = [x.strip() for x in candidates if x and isinstance(x, str)]
+    verdicts = validate_image_urls(candidates)
     verified = []
     seen = set()
     for url in candidates:
         if url in seen:
             continue
         seen.add(url)
-        if is_valid_image_url(url):
+        if verdicts.get(url, False):
             verified.append(url)
         if len(verified) >= 3:
             break
@@ -794,6 +1025,7 @@ def main():
             isDraft=False,
             fetchImages=True
         ).execute()
+        enqueue_index_notification(res.get("url", ""))
 
         ws3.update_cell(row_idx, 5, "완")
         try:
@@ -9,6 +9,9 @@ import traceback
 import requests
 import logging
 import pickle
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.parse import quote
 import glob
 from bs4 import BeautifulSoup
@@ -20,6 +23,7 @@ from google.oauth2.credentials import Credentials as UserCredentials
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
 from googleapiclient.http import MediaFileUpload
+from gspread.utils import rowcol_to_a1
 
 from google import genai
 from openai import OpenAI
@@ -79,6 +83,15 @@ THUMB_DIR = "thumbnails"
 
 LABELS = ["viajes", "turismo"]
 
+# 배치 동시 처리 설정
+MAX_POST_WORKERS = 3
+# API 별 (동시 호출 수, 최소 호출 간격 초)
+API_LIMITS = {
+    "places": (4, 0.2),
+    "ai": (3, 0.5),
+    "blogger": (1, 1.2),
+}
+
 # ==================================================
 # 카테고리 설정
 # ==================================================
@@ -175,6 +188,25 @@ POST_CONFIGS = [
 client_genai = genai.Client(api_key=GEMINI_API_KEY)
 openai_client = OpenAI(api_key=OPENAI_API_KEY)
 
+# ==================================================
+# API 호출 제한 (Places / AI / Blogger)
+# ==================================================
+_api_slots = {name: threading.BoundedSemaphore(n) for name, (n, _) in API_LIMITS.items()}
+_api_next_at = {name: 0.0 for name in API_LIMITS}
+_api_lock = threading.Lock()
+
+@contextmanager
+def api_slot(name):
+    # 동시 호출 수 제한 + 직전 호출과의 최소 간격 유지
+    with _api_slots[name]:
+        with _api_lock:
+            now = time.time()
+            at = max(now, _api_next_at[name])
+            _api_next_at[name] = at + API_LIMITS[name][1]
+        if at > now:
+            time.sleep(at - now)
+        yield
+
 # ==================================================
 # 시트 연결
 # ==================================================
@@ -193,33 +225,140 @@ ws4 = get_sheet6()
 # ==================================================
 # 히스토리 관리
 # ==================================================
+# 처리 이력: append-only JSONL 로그 + 메모리 dict 인덱스 (조회/추가 O(1))
+# 기존 {HISTORY_PATH} JSON 목록은 처음 한 번만 옮겨 옴
+HISTORY_LOG_PATH = os.path.splitext(HISTORY_PATH)[0] + ".jsonl"
+HISTORY_COMPACT_RATIO = 2  # 로그 줄 수가 고유 키의 2배를 넘으면 압축
+
+_history = None  # {key: 처음 기록된 시각}
+_history_lines = 0
+_history_lock = threading.Lock()
+
+def _load_history():
+    global _history, _history_lines
+    if _history is not None:
+        return _history
+    history, lines = {}, 0
+    if os.path.exists(HISTORY_LOG_PATH):
+        with open(HISTORY_LOG_PATH, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                lines += 1
+                try:
+                    rec = json.loads(line)
+                    history.setdefault(rec["key"], rec.get("ts", 0))
+                except Exception:
+                    continue  # 중간에 끊긴 마지막 줄 등
+    elif os.path.exists(HISTORY_PATH):
+        try:
+            with open(HISTORY_PATH, "r", encoding="utf-8") as f:
+                for key in json.load(f).get("pairs", []):
+                    history.setdefault(key, 0)
+        except Exception as e:
+            debug(f"load_processed_pairs failed: {e}")
+        lines = -1  # 이관분은 바로 로그로 씀
+    _history = history
+    _history_lines = lines
+    if lines < 0 or lines > HISTORY_COMPACT_RATIO * max(len(history), 1):
+        _compact_history_locked()
+    return _history
+
+def _compact_history_locked():
+    global _history_lines
+    tmp = HISTORY_LOG_PATH + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        for key, ts in _history.items():
+            f.write(json.dumps({"key": key, "ts": ts}, ensure_ascii=False) + "\n")
+    os.replace(tmp, HISTORY_LOG_PATH)
+    _history_lines = len(_history)
+
+def compact_history():
+    with _history_lock:
+        _load_history()
+        _compact_history_locked()
+
+def history_add(key):
+    global _history_lines
+    with _history_lock:
+        history = _load_history()
+        if key in history:
+            return False
+        ts = int(time.time())
+        with open(HISTORY_LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"key": key, "ts": ts}, ensure_ascii=False) + "\n")
+        history[key] = ts
+        _history_lines += 1
+        return True
+
 def load_processed_pairs():
-    if not os.path.exists(HISTORY_PATH):
-        return []
-    try:
-        with open(HISTORY_PATH, "r", encoding="utf-8") as f:
-            return json.load(f).get("pairs", [])
-    except Exception:
-        return []
+    with _history_lock:
+        return list(_load_history())
 
 def save_processed_pair(country, city, category):
-    processed = load_processed_pairs()
-    key = f"{country}|{city}|{category}"
-    if key not in processed:
-        processed.append(key)
-    with open(HISTORY_PATH, "w", encoding="utf-8") as f:
-        json.dump({"pairs": processed}, f, ensure_ascii=False, indent=2)
+    history_add(f"{country}|{city}|{category}")
 
 def debug(msg):
     print(msg)
     logger.debug(msg)
 
+# 로그(P열)는 모아 두었다가 flush_sheet_updates() 에서 한 번에 batch_update
+# 완료/URL 칸은 재발행을 막기 위해 글마다 업로드 직후 바로 기록
+_sheet_lock = threading.Lock()
+_pending_logs = {}
+
+# 발행 직후 URL 을 로컬 큐(JSONL)에 넣어 두면 Index_Notify.py 가 Google/Bing 에 묶어서 알림
+INDEX_QUEUE_PATH = os.getenv("INDEX_QUEUE_PATH", "index_queue.jsonl")
+
+def enqueue_index_notification(url):
+    if not url:
+        return
+    rec = {"url": url, "ts": int(time.time()), "source": os.path.basename(__file__)}
+    try:
+        with open(INDEX_QUEUE_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+    except Exception as e:
+        debug(f"색인 큐 기록 실패: {e}")
+
 def log_step(row, msg):
+    with _sheet_lock:
+        _pending_logs.setdefault(row, []).append(msg)
+
+def mark_row_done(row, category_name, url, tries=3):
+    data = [
+        {"range": rowcol_to_a1(row, 4), "values": [["완"]]},
+        {"range": rowcol_to_a1(row, 5), "values": [[category_name]]},
+        {"range": rowcol_to_a1(row, 15), "values": [[url]]},
+    ]
+    for attempt in range(1, tries + 1):
+        try:
+            with _sheet_lock:
+                ws4.batch_update(data)
+            return True
+        except Exception as e:
+            debug(f"⚠️ 완료 표시 실패 (행 {row}, {attempt}/{tries}): {e}")
+            time.sleep(2 * attempt)
+    return False
+
+def flush_sheet_updates():
+    with _sheet_lock:
+        logs = dict(_pending_logs)
+        _pending_logs.clear()
+    if not logs:
+        return
     try:
-        prev = ws4.cell(row, 16).value or ""
-        ws4.update_cell(row, 16, f"{prev} | {msg}" if prev else msg)
+        data = []
+        col_p = ws4.col_values(16)
+        for row, msgs in logs.items():
+            prev = col_p[row - 1] if row - 1 < len(col_p) else ""
+            msg = " | ".join(msgs)
+            data.append({"range": rowcol_to_a1(row, 16), "values": [[f"{prev} | {msg}" if prev else msg]]})
+        with _sheet_lock:
+            ws4.batch_update(data)
+        debug(f"시트 일괄 기록: {len(data)}칸")
     except Exception as e:
-        debug(f"⚠️ 로그 기록 실패: {e}")
+        debug(f"⚠️ 시트 일괄 기록 실패: {e}")
 
 def read_sheet_rows():
     values = ws4.get_all_values()
@@ -293,16 +432,25 @@ def make_thumb(save_path, var_title):
     canvas = canvas.resize((400, 400))
     canvas.save(save_path, "PNG")
 
+# 토큰 읽기/갱신/저장은 한 번만 (여러 작업 스레드가 동시에 pickle 을 덮어쓰지 않도록)
+_drive_creds = None
+_drive_lock = threading.Lock()
+
 def get_drive_service():
+    global _drive_creds
     token_path = "drive_token_2nd.pickle"
-    if not os.path.exists(token_path):
-        raise RuntimeError("drive_token_2nd.pickle 없음")
-    with open(token_path, "rb") as f:
-        creds = pickle.load(f)
-    if not creds.valid and creds.expired and creds.refresh_token:
-        creds.refresh(Request())
-        with open(token_path, "wb") as f:
-            pickle.dump(creds, f)
+    with _drive_lock:
+        if _drive_creds is None:
+            if not os.path.exists(token_path):
+                raise RuntimeError("drive_token_2nd.pickle 없음")
+            with open(token_path, "rb") as f:
+                _drive_creds = pickle.load(f)
+        creds = _drive_creds
+        if not creds.valid and creds.expired and creds.refresh_token:
+            creds.refresh(Request())
+            with open(token_path, "wb") as f:
+                pickle.dump(creds, f)
+    # 서비스 객체(httplib2)는 스레드 간 공유가 안전하지 않아 호출마다 새로 만듦
     return build("drive", "v3", credentials=creds)
 
 def ensure_drive_folder(drive_service, folder_name):
@@ -467,7 +615,8 @@ def generate_ai_review(prompt, keyword=""):
     for idx, (name, fn) in enumerate(tries, start=1):
         try:
             debug(f"🤖 AI 시도 {idx}: {name}")
-            text = fn()
+            with api_slot("ai"):
+                text = fn()
             if text and isinstance(text, str):
                 debug(f"✅ AI 성공: {name}")
                 return text
@@ -505,7 +654,8 @@ def get_google_places_textsearch(country, city, category_cfg, limit=10):
                 "key": GOOGLE_MAPS_API_KEY,
                 "language": "es",
             }
-            res = requests.get(url, params=params, timeout=30)
+            with api_slot("places"):
+                res = requests.get(url, params=params, timeout=30)
             data = res.json()
             for r in data.get("results", []):
                 name = r.get("name", "").strip()
@@ -544,7 +694,8 @@ def get_google_place_photos(place_name, count=3, country="", city=""):
             "key": GOOGLE_MAPS_API_KEY,
             "language": "es"
         }
-        res = requests.get(search_url, params=search_params, headers=headers, timeout=30)
+        with api_slot("places"):
+            res = requests.get(search_url, params=search_params, headers=headers, timeout=30)
         data = res.json()
         results = data.get("results", [])
         if not results:
@@ -562,7 +713,8 @@ def get_google_place_photos(place_name, count=3, country="", city=""):
             "key": GOOGLE_MAPS_API_KEY,
             "language": "es"
         }
-        data2 = requests.get(details_url, params=details_params, headers=headers, timeout=30).json()
+        with api_slot("places"):
+            data2 = requests.get(details_url, params=details_params, headers=headers, timeout=30).json()
         photos = data2.get("result", {}).get("photos", [])
         if isinstance(photos, dict):
             photos = [photos]
@@ -732,7 +884,6 @@ def process_one_post(row_idx, country, city, category_cfg):
             "overview": place.get("overview", ""),
             "desc": place.get("desc", "")
         })
-        time.sleep(0.4)
 
     safe_title = re.sub(r'[\\/:*?"<>|.]', "_", title)
     os.makedirs(THUMB_DIR, exist_ok=True)
@@ -755,12 +906,14 @@ def process_one_post(row_idx, country, city, category_cfg):
         "blog": {"id": BLOG_ID}
     }
 
-    res = blog_handler.posts().insert(
-        blogId=BLOG_ID,
-        body=post_body,
-        isDraft=False,
-        fetchImages=True
-    ).execute()
+    with api_slot("blogger"):
+        res = blog_handler.posts().insert(
+            blogId=BLOG_ID,
+            body=post_body,
+            isDraft=False,
+            fetchImages=True
+        ).execute()
+        enqueue_index_notification(res.get("url", ""))
 
     debug(f"Blogger 업로드 성공: {res.get('url', '')}")
     log_step(row_idx, f"{category_name}: 5단계 Blogger 업로드 성공 ({res.get('url', '')})")
@@ -770,6 +923,23 @@ def process_one_post(row_idx, country, city, category_cfg):
 # ==================================================
 # 실행
 # ==================================================
+def run_post_job(job_idx, total, row_idx, country, city, category_cfg):
+    # 작업 하나의 실패가 다른 작업에 영향을 주지 않도록 여기서 예외를 모두 처리
+    started = time.time()
+    result = {"row": row_idx, "country": country, "city": city, "category": category_cfg["name"], "url": "", "error": ""}
+    debug(f"현재 순서 {job_idx}/{total} / 행 {row_idx} / {country} {city} / {category_cfg['name']}")
+    try:
+        url = process_one_post(row_idx, country, city, category_cfg)
+        mark_row_done(row_idx, category_cfg["name"], url)
+        result["url"] = url
+        debug(f"✅ 완료: {country} {city} / {category_cfg['name']}")
+    except Exception as e:
+        result["error"] = str(e)
+        debug(f"❌ 실패: {country} {city} / {category_cfg['name']} / {e}")
+        debug(traceback.format_exc())
+    result["elapsed"] = time.time() - started
+    return result
+
 def main():
     try:
         targets = find_next_rows_bulk(limit=6)
@@ -777,27 +947,25 @@ def main():
             debug("처리할 대상이 없습니다.")
             return
 
-        debug(f"선택된 대상 수: {len(targets)}")
-        for idx, (row_idx, country, city) in enumerate(targets, start=1):
-            category_cfg = POST_CONFIGS[(idx - 1) % len(POST_CONFIGS)]
-            debug(f"현재 순서 {idx}/{len(targets)} / 행 {row_idx} / {country} {city} / {category_cfg['name']}")
-
-            try:
-                url = process_one_post(row_idx, country, city, category_cfg)
-                ws4.update_cell(row_idx, 4, "완")
-                ws4.update_cell(row_idx, 5, category_cfg["name"])
-                try:
-                    ws4.update_cell(row_idx, 15, url)
-                except Exception as e:
-                    debug(f"URL 기록 실패: {e}")
-                debug(f"✅ 완료: {country} {city} / {category_cfg['name']}")
-                time.sleep(1.2)
-            except Exception as e:
-                tb = traceback.format_exc()
-                debug(f"❌ 실패: {country} {city} / {category_cfg['name']} / {e}")
-                debug(tb)
-                continue
-
+        debug(f"선택된 대상 수: {len(targets)} / 동시 처리 {MAX_POST_WORKERS}개")
+        started = time.time()
+        results = []
+        try:
+            with ThreadPoolExecutor(max_workers=MAX_POST_WORKERS) as ex:
+                futures = [
+                    ex.submit(run_post_job, idx, len(targets), row_idx, country, city, POST_CONFIGS[(idx - 1) % len(POST_CONFIGS)])
+                    for idx, (row_idx, country, city) in enumerate(targets, start=1)
+                ]
+                for fut in as_completed(futures):
+                    results.append(fut.result())
+        finally:
+            flush_sheet_updates()
+
+        debug(f"===== 배치 결과 ({time.time() - started:.1f}s) =====")
+        for r in sorted(results, key=lambda x: x["row"]):
+            state = f"성공 {r['url']}" if not r["error"] else f"실패 {r['error']}"
+            debug(f"[ROW {r['row']}] {r['country']} {r['city']} / {r['category']} / {r['elapsed']:.1f}s / {state}")
+        debug(f"성공 {sum(1 for r in results if not r['error'])} / 실패 {sum(1 for r in results if r['error'])}")
     except Exception as e:
         tb = traceback.format_exc()
         debug(f"❌ 최종 실패: {e}")
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import sys
+sys.stdout.reconfigure(encoding="utf-8")
+
+import os
+import json
+import re
+import time
+import sqlite3
+from contextlib import closing
+import requests
+
+# ==========================================
+# ✅ 사용자 설정 영역
+# ==========================================
+# 동기화할 지역 코드 (빈 목록이면 전국 한 번에)
+# 1 서울 2 인천 3 대전 4 대구 5 광주 6 부산 7 울산 8 세종
+# 31 경기 32 강원 33 충북 34 충남 35 경북 36 경남 37 전북 38 전남 39 제주
+AREA_CODES = []
+
+# 동기화할 관광타입 (12 관광지, 39 음식점 …) — Korea_* 스크립트는 12 사용
+CONTENT_TYPE_IDS = ["12", "39"]
+
+# 한 페이지 건수 (TourAPI 최대 1000)
+PAGE_SIZE = 1000
+
+# overview(detailCommon2)까지 미리 받아둘지, 받는다면 최대 몇 건
+FETCH_OVERVIEWS = False
+MAX_OVERVIEW_FETCH = 500
+
+# 요청 간격(초)
+REQUEST_DELAY = 0.3
+
+# 이 시간 안에 동기화한 지역/타입은 건너뜀 (워크플로에서 발행 전에 매번 돌려도 호출이 거의 없음)
+# TOUR_SNAPSHOT_FORCE=1 이면 무조건 다시 받음
+SYNC_MAX_AGE = 7 * 24 * 3600
+# ==========================================
+
+# 환경변수로 덮어쓰기 (예: TOUR_SNAPSHOT_AREAS="1,31" TOUR_SNAPSHOT_TYPES="12")
+if os.getenv("TOUR_SNAPSHOT_AREAS"):
+    AREA_CODES = [x.strip() for x in os.getenv("TOUR_SNAPSHOT_AREAS").split(",") if x.strip()]
+if os.getenv("TOUR_SNAPSHOT_TYPES"):
+    CONTENT_TYPE_IDS = [x.strip() for x in os.getenv("TOUR_SNAPSHOT_TYPES").split(",") if x.strip()]
+# TOUR_SNAPSHOT_OVERVIEWS=200 이면 overview 도 최대 200건 채움 (발행 스크립트는 스냅샷 overview 만 읽음)
+if os.getenv("TOUR_SNAPSHOT_OVERVIEWS"):
+    FETCH_OVERVIEWS = True
+    MAX_OVERVIEW_FETCH = int(os.getenv("TOUR_SNAPSHOT_OVERVIEWS"))
+
+API_KEYS_JSON = os.getenv("API_KEYS_JSON")
+if not API_KEYS_JSON:
+    raise RuntimeError("API_KEYS_JSON 환경변수가 없습니다. GitHub Secrets 를 확인하세요.")
+TOUR_API_KEY = json.loads(API_KEYS_JSON).get("TOUR_API_KEY", "")
+if not TOUR_API_KEY:
+    raise RuntimeError("TOUR_API_KEY 가 없습니다.")
+
+# ==================================================
+# TourAPI 로컬 스냅샷 (TourAPI_Snapshot.py 로 동기화)
+# ==================================================
+TOUR_SNAPSHOT_DB = os.getenv("TOUR_SNAPSHOT_DB", "tourapi_snapshot.db")
+TOUR_SNAPSHOT_TTL = 30 * 24 * 3600
+
+TOUR_SNAPSHOT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tour_items (
+    contentid TEXT PRIMARY KEY,
+    contenttypeid TEXT,
+    areacode TEXT,
+    sigungucode TEXT,
+    title TEXT,
+    addr1 TEXT,
+    firstimage TEXT,
+    raw TEXT,
+    synced_at REAL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS tour_items_fts USING fts5(title, addr1);
+CREATE TABLE IF NOT EXISTS tour_images (contentid TEXT PRIMARY KEY, value TEXT, synced_at REAL);
+CREATE TABLE IF NOT EXISTS tour_overviews (contentid TEXT PRIMARY KEY, value TEXT, synced_at REAL);
+CREATE TABLE IF NOT EXISTS tour_sync (
+    areacode TEXT,
+    contenttypeid TEXT,
+    total INTEGER,
+    synced_at REAL,
+    PRIMARY KEY (areacode, contenttypeid)
+);
+"""
+
+def tour_snapshot_connect():
+    conn = sqlite3.connect(TOUR_SNAPSHOT_DB, timeout=30)
+    conn.executescript(TOUR_SNAPSHOT_SCHEMA)
+    return conn
+
+def tour_snapshot_upsert(items):
+    # TourAPI 목록 item 을 저장, FTS 는 rowid = contentid 로 맞춰 함께 갱신
+    rows = [it for it in items if str(it.get("contentid") or "").strip().isdigit()]
+    if not rows:
+        return 0
+    now = time.time()
+    try:
+        with closing(tour_snapshot_connect()) as conn, conn:
+            for it in rows:
+                cid = str(it["contentid"]).strip()
+                title = (it.get("title") or "").strip()
+                addr1 = (it.get("addr1") or "").strip()
+                conn.execute(
+                    "INSERT OR REPLACE INTO tour_items VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (cid, str(it.get("contenttypeid") or ""), str(it.get("areacode") or ""),
+                     str(it.get("sigungucode") or ""), title, addr1,
+                     (it.get("firstimage") or "").strip(), json.dumps(it, ensure_ascii=False), now)
+                )
+                conn.execute("DELETE FROM tour_items_fts WHERE rowid = ?", (int(cid),))
+                conn.execute("INSERT INTO tour_items_fts (rowid, title, addr1) VALUES (?, ?, ?)", (int(cid), title, addr1))
+    except sqlite3.Error as e:
+        print(f"⚠️ TourAPI 스냅샷 저장 실패: {e}")
+        return 0
+    return len(rows)
+
+def tour_snapshot_search(region, city, content_type_id="", limit=30):
+    # 제목/주소에 도시명이 들어가고 주소에 지역명도 있는 신선한 항목만 반환
+    # (다른 도의 같은 이름 시군구 — 고성, 광주 동구 등 — 는 섞지 않음)
+    city = (city or "").strip().replace('"', "")
+    if not city or not os.path.exists(TOUR_SNAPSHOT_DB):
+        return []
+    sql = (
+        "SELECT i.raw, i.addr1 FROM tour_items_fts f JOIN tour_items i ON i.contentid = CAST(f.rowid AS TEXT) "
+        "WHERE tour_items_fts MATCH ? AND i.synced_at >= ?"
+    )
+    args = [f'"{city}"*', time.time() - TOUR_SNAPSHOT_TTL]
+    if content_type_id:
+        sql += " AND i.contenttypeid = ?"
+        args.append(str(content_type_id))
+    sql += " ORDER BY f.rank LIMIT 300"
+    try:
+        with closing(tour_snapshot_connect()) as conn:
+            rows = conn.execute(sql, args).fetchall()
+    except sqlite3.Error as e:
+        print(f"⚠️ TourAPI 스냅샷 조회 실패: {e}")
+        return []
+    region = (region or "").strip()
+    in_region = [r for r in rows if region and region in (r[1] or "")]
+    return [json.loads(r[0]) for r in in_region[:limit]]
+
+def tour_snapshot_get(table, content_id):
+    # tour_images / tour_overviews 에서 신선한 값만 반환 (없거나 오래되면 None)
+    if not content_id or not os.path.exists(TOUR_SNAPSHOT_DB):
+        return None
+    try:
+        with closing(tour_snapshot_connect()) as conn:
+            row = conn.execute(f"SELECT value, synced_at FROM {table} WHERE contentid = ?", (str(content_id),)).fetchone()
+    except sqlite3.Error as e:
+        print(f"⚠️ TourAPI 스냅샷 조회 실패: {e}")
+        return None
+    if not row or time.time() - (row[1] or 0) >= TOUR_SNAPSHOT_TTL:
+        return None
+    return json.loads(row[0])
+
+def tour_snapshot_put(table, content_id, value):
+    try:
+        with closing(tour_snapshot_connect()) as conn, conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO {table} VALUES (?, ?, ?)",
+                (str(content_id), json.dumps(value, ensure_ascii=False), time.time())
+            )
+    except sqlite3.Error as e:
+        print(f"⚠️ TourAPI 스냅샷 저장 실패: {e}")
+
+def fetch_tour_overview(content_id):
+    # detailCommon2 의 overview, 스냅샷에 있으면 네트워크 생략
+    cached = tour_snapshot_get("tour_overviews", content_id)
+    if cached is not None:
+        return cached
+    url = "https://apis.data.go.kr/B551011/KorService2/detailCommon2"
+    params = {
+        "serviceKey": TOUR_API_KEY,
+        "MobileOS": "ETC",
+        "MobileApp": "travel_blog",
+        "_type": "json",
+        "contentId": content_id,
+    }
+    try:
+        res = requests.get(url, params=params, timeout=30)
+        data = res.json()
+        items = data.get("response", {}).get("body", {}).get("items", {}).get("item", [])
+        if isinstance(items, dict):
+            items = [items]
+        overview = re.sub(r"<[^>]+>", " ", (items[0].get("overview") or "") if items else "")
+        overview = re.sub(r"\s+", " ", overview).strip()
+    except Exception as e:
+        print(f"⚠️ TourAPI detailCommon2 실패: {content_id} / {e}")
+        return ""
+    tour_snapshot_put("tour_overviews", content_id, overview)
+    return overview
+
+# ==================================================
+# 동기화
+# ==================================================
+def sync_area(area_code, content_type_id):
+    url = "https://apis.data.go.kr/B551011/KorService2/areaBasedList2"
+    params = {
+        "serviceKey": TOUR_API_KEY,
+        "MobileOS": "ETC",
+        "MobileApp": "travel_blog",
+        "_type": "json",
+        "numOfRows": PAGE_SIZE,
+        "listYN": "Y",
+        "arrange": "C",
+        "contentTypeId": content_type_id,
+    }
+    if area_code:
+        params["areaCode"] = area_code
+
+    saved = 0
+    total = 0
+    page = 1
+    while True:
+        params["pageNo"] = page
+        try:
+            res = requests.get(url, params=params, timeout=60)
+            body = res.json().get("response", {}).get("body", {})
+        except Exception as e:
+            print(f"❌ areaBasedList2 실패: area={area_code or '전국'} type={content_type_id} page={page} / {e}")
+            # 중간에 실패하면 동기화 시각을 남기지 않음 → 다음 실행에서 다시 받음
+            return saved
+        items = body.get("items", {}) or {}
+        items = items.get("item", []) if isinstance(items, dict) else []
+        if isinstance(items, dict):
+            items = [items]
+        total = int(body.get("totalCount") or 0)
+        saved += tour_snapshot_upsert(items)
+        print(f"[동기화] area={area_code or '전국'} type={content_type_id} page={page} -> {len(items)}개 (누적 {saved}/{total})")
+        if not items or page * PAGE_SIZE >= total:
+            break
+        page += 1
+        time.sleep(REQUEST_DELAY)
+
+    with closing(tour_snapshot_connect()) as conn, conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO tour_sync VALUES (?, ?, ?, ?)",
+            (area_code or "", str(content_type_id), total, time.time())
+        )
+    return saved
+
+def sync_overviews(limit):
+    # overview 가 없거나 오래된 항목만 detailCommon2 로 채움
+    with closing(tour_snapshot_connect()) as conn:
+        rows = conn.execute(
+            "SELECT i.contentid FROM tour_items i LEFT JOIN tour_overviews o ON o.contentid = i.contentid "
+            "WHERE o.contentid IS NULL OR o.synced_at < ? LIMIT ?",
+            (time.time() - TOUR_SNAPSHOT_TTL, limit)
+        ).fetchall()
+    for idx, (content_id,) in enumerate(rows, start=1):
+        fetch_tour_overview(content_id)
+        if idx % 50 == 0:
+            print(f"[overview] {idx}/{len(rows)}")
+        time.sleep(REQUEST_DELAY)
+    return len(rows)
+
+def last_synced(area_code, content_type_id):
+    with closing(tour_snapshot_connect()) as conn:
+        row = conn.execute(
+            "SELECT synced_at FROM tour_sync WHERE areacode = ? AND contenttypeid = ?",
+            (area_code or "", str(content_type_id))
+        ).fetchone()
+    return row[0] if row else 0
+
+def main():
+    started = time.time()
+    force = os.getenv("TOUR_SNAPSHOT_FORCE") == "1"
+    total = 0
+    for area_code in (AREA_CODES or [""]):
+        for content_type_id in CONTENT_TYPE_IDS:
+            age = time.time() - last_synced(area_code, content_type_id)
+            if not force and age < SYNC_MAX_AGE:
+                print(f"[동기화] area={area_code or '전국'} type={content_type_id} 최근 동기화({age / 3600:.0f}시간 전) → 건너뜀")
+                continue
+            total += sync_area(area_code, content_type_id)
+    print(f"✅ 목록 동기화 완료: {total}개 ({time.time() - started:.1f}s) → {TOUR_SNAPSHOT_DB}")
+    if FETCH_OVERVIEWS:
+        n = sync_overviews(MAX_OVERVIEW_FETCH)
+        print(f"✅ overview 동기화 완료: {n}개")
+
+if __name__ == "__main__":
+    main()
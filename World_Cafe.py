@@ -4,11 +4,15 @@ import sys
 import json
 import re
 import time
+import atexit
 import random
 import traceback
 import requests
 import logging
 import pickle
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import quote
 import glob
 from bs4 import BeautifulSoup
@@ -88,6 +92,15 @@ THUMB_DIR = "thumbnails"
 
 LABELS = ["해외여행", "여행"]
 
+# 장소별 보강(개요·사진·주소·AI) 동시 처리 설정
+ENRICH_MAX_WORKERS = 10
+# 서비스별 (동시 호출 수, 최소 호출 간격 초)
+API_LIMITS = {
+    "tour": (4, 0.1),
+    "places": (4, 0.1),
+    "ai": (3, 0.3),
+}
+
 
 # ==================================================
 # 클라이언트
@@ -95,6 +108,25 @@ LABELS = ["해외여행", "여행"]
 client_genai = genai.Client(api_key=GEMINI_API_KEY)
 openai_client = OpenAI(api_key=OPENAI_API_KEY)
 
+# ==================================================
+# API 호출 제한 (TourAPI / Places / AI)
+# ==================================================
+_api_slots = {name: threading.BoundedSemaphore(n) for name, (n, _) in API_LIMITS.items()}
+_api_next_at = {name: 0.0 for name in API_LIMITS}
+_api_lock = threading.Lock()
+
+@contextmanager
+def api_slot(name):
+    # 동시 호출 수 제한 + 직전 호출과의 최소 간격 유지
+    with _api_slots[name]:
+        with _api_lock:
+            now = time.time()
+            at = max(now, _api_next_at[name])
+            _api_next_at[name] = at + API_LIMITS[name][1]
+        if at > now:
+            time.sleep(at - now)
+        yield
+
 
 # ==================================================
 # 시트 연결
@@ -115,27 +147,97 @@ ws4 = get_sheet4()
 # ==================================================
 # 히스토리 관리
 # ==================================================
+# 처리 이력: append-only JSONL 로그 + 메모리 dict 인덱스 (조회/추가 O(1))
+# 기존 {HISTORY_PATH} JSON 목록은 처음 한 번만 옮겨 옴
+HISTORY_LOG_PATH = os.path.splitext(HISTORY_PATH)[0] + ".jsonl"
+HISTORY_COMPACT_RATIO = 2  # 로그 줄 수가 고유 키의 2배를 넘으면 압축
+
+_history = None  # {key: 처음 기록된 시각}
+_history_lines = 0
+_history_lock = threading.Lock()
+
+def _load_history():
+    global _history, _history_lines
+    if _history is not None:
+        return _history
+    history, lines = {}, 0
+    if os.path.exists(HISTORY_LOG_PATH):
+        with open(HISTORY_LOG_PATH, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                lines += 1
+                try:
+                    rec = json.loads(line)
+                    history.setdefault(rec["key"], rec.get("ts", 0))
+                except Exception:
+                    continue  # 중간에 끊긴 마지막 줄 등
+    elif os.path.exists(HISTORY_PATH):
+        try:
+            with open(HISTORY_PATH, "r", encoding="utf-8") as f:
+                for key in json.load(f).get("pairs", []):
+                    history.setdefault(key, 0)
+        except Exception as e:
+            debug(f"load_processed_pairs failed: {e}")
+        lines = -1  # 이관분은 바로 로그로 씀
+    _history = history
+    _history_lines = lines
+    if lines < 0 or lines > HISTORY_COMPACT_RATIO * max(len(history), 1):
+        _compact_history_locked()
+    return _history
+
+def _compact_history_locked():
+    global _history_lines
+    tmp = HISTORY_LOG_PATH + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        for key, ts in _history.items():
+            f.write(json.dumps({"key": key, "ts": ts}, ensure_ascii=False) + "\n")
+    os.replace(tmp, HISTORY_LOG_PATH)
+    _history_lines = len(_history)
+
+def compact_history():
+    with _history_lock:
+        _load_history()
+        _compact_history_locked()
+
+def history_add(key):
+    global _history_lines
+    with _history_lock:
+        history = _load_history()
+        if key in history:
+            return False
+        ts = int(time.time())
+        with open(HISTORY_LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"key": key, "ts": ts}, ensure_ascii=False) + "\n")
+        history[key] = ts
+        _history_lines += 1
+        return True
+
 def load_processed_pairs():
-    if not os.path.exists(HISTORY_PATH):
-        return []
-    try:
-        with open(HISTORY_PATH, "r", encoding="utf-8") as f:
-            return json.load(f).get("pairs", [])
-    except Exception:
-        return []
+    with _history_lock:
+        return list(_load_history())
 
 def save_processed_pair(country, city):
-    processed = load_processed_pairs()
-    key = f"{country}|{city}"
-    if key not in processed:
-        processed.append(key)
-    with open(HISTORY_PATH, "w", encoding="utf-8") as f:
-        json.dump({"pairs": processed}, f, ensure_ascii=False, indent=2)
+    history_add(f"{country}|{city}")
 
 def debug(msg):
     print(msg)
     logger.debug(msg)
 
+# 발행 직후 URL 을 로컬 큐(JSONL)에 넣어 두면 Index_Notify.py 가 Google/Bing 에 묶어서 알림
+INDEX_QUEUE_PATH = os.getenv("INDEX_QUEUE_PATH", "index_queue.jsonl")
+
+def enqueue_index_notification(url):
+    if not url:
+        return
+    rec = {"url": url, "ts": int(time.time()), "source": os.path.basename(__file__)}
+    try:
+        with open(INDEX_QUEUE_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+    except Exception as e:
+        debug(f"색인 큐 기록 실패: {e}")
+
 def log_step(row, msg):
     try:
         prev = ws4.cell(row, 16).value or ""
@@ -451,9 +553,28 @@ def get_default_places(country, city):
         "score": 0
     } for name in fallback]
 
-def get_naver_places(country, city):
-    keyword = f"{country} {city} 가볼만한곳"
+# ==================================================
+# 네이버 플레이스 수집용 Chrome (프로세스당 1회 기동 후 재사용)
+# ==================================================
+NAVER_BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*.mp4", "*.webm", "*.m3u8", "*.mp3",
+]
+NAVER_WAIT_SEC = 10
+
+_naver_driver = None
+_naver_driver_lock = threading.Lock()
+
+def _block_heavy_resources(driver):
+    # CDP 차단 설정은 탭(타깃) 단위라 새 창으로 옮길 때마다 다시 적용
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": NAVER_BLOCKED_URLS})
+    except Exception as e:
+        debug(f"⚠️ 리소스 차단 설정 실패: {e}")
 
+def _start_naver_driver():
     options = Options()
     options.add_argument("--headless=new")
     options.add_argument("--disable-gpu")
@@ -463,47 +584,118 @@ def get_naver_places(country, city):
     options.add_argument(
         "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
     )
-
+    # DOMContentLoaded 까지만 기다리고 이미지는 브라우저 설정으로도 차단
+    options.page_load_strategy = "eager"
+    options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
     driver = webdriver.Chrome(options=options)
+    _block_heavy_resources(driver)
+    return driver
 
-    try:
-        driver.get("https://search.naver.com/search.naver?query=" + quote(keyword))
-        time.sleep(2)
-
+def get_naver_driver():
+    global _naver_driver
+    if _naver_driver is not None:
         try:
-            btn = driver.find_element(
-                By.CSS_SELECTOR,
-                "#place-main-section-root section div.mod_more_wrap a"
-            )
-            btn.click()
-            time.sleep(3)
+            _naver_driver.window_handles
+            return _naver_driver
         except Exception:
-            pass
-
+            close_naver_driver()
+    _naver_driver = _start_naver_driver()
+    return _naver_driver
+
+def _reset_naver_windows(driver):
+    # 더보기로 열린 창을 닫고 첫 창으로 복귀 (다음 도시 조회에서 재사용)
+    handles = driver.window_handles
+    for h in handles[1:]:
+        driver.switch_to.window(h)
+        driver.close()
+    driver.switch_to.window(handles[0])
+
+@atexit.register
+def close_naver_driver():
+    global _naver_driver
+    if _naver_driver is not None:
         try:
-            if len(driver.window_handles) > 1:
-                driver.switch_to.window(driver.window_handles[-1])
+            _naver_driver.quit()
         except Exception:
             pass
+        _naver_driver = None
+
+# 장소 목록 컨테이너 (페이지의 다른 ul > li 메뉴/탭은 보지 않음)
+# 클래스 뒤의 해시(__iXtmX 등)는 배포마다 바뀌므로 접두사로 찾음
+NAVER_PLACE_LIST_SEL = '[class^="pc_scroll_container"]'
+
+def _naver_place_names(driver):
+    # 목록 컨테이너 안 li 마다 첫 span 의 텍스트를 한 번의 스크립트 호출로 수집 (대기 조건에서도 반복 사용)
+    # 컨테이너를 못 찾으면 예전처럼 페이지 전체의 ul > li 를 봄
+    return driver.execute_script("""
+        const root = document.querySelector(arguments[0]) || document;
+        return Array.from(root.querySelectorAll("ul > li"))
+            .map(li => li.querySelector("span"))
+            .filter(span => span)
+            .map(span => (span.innerText || "").trim());
+    """, NAVER_PLACE_LIST_SEL) or []
+
+def get_naver_places(country, city):
+    keyword = f"{country} {city} 가볼만한곳"
+
+    with _naver_driver_lock:
+        try:
+            driver = get_naver_driver()
+        except Exception as e:
+            print("ERROR:", e)
+            return []
 
         try:
-            WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located(
-                    (By.CSS_SELECTOR, "div.pc_scroll_container__iXtmX")
+            driver.get("https://search.naver.com/search.naver?query=" + quote(keyword))
+            more_sel = "#place-main-section-root section div.mod_more_wrap a"
+
+            try:
+                WebDriverWait(driver, NAVER_WAIT_SEC).until(
+                    lambda d: d.find_elements(By.CSS_SELECTOR, more_sel) or d.find_elements(By.CSS_SELECTOR, "#place-main-section-root ul > li")
                 )
-            )
-        except Exception:
-            pass
+            except Exception:
+                pass
 
-        time.sleep(2)
+            try:
+                btn = driver.find_element(By.CSS_SELECTOR, more_sel)
+                handles_before = len(driver.window_handles)
+                url_before = driver.current_url
+                btn.click()
+                # 새 창이 열리거나 주소가 바뀔 때까지만 대기
+                WebDriverWait(driver, NAVER_WAIT_SEC).until(
+                    lambda d: len(d.window_handles) > handles_before or d.current_url != url_before
+                )
+            except Exception:
+                pass
 
-        items = driver.find_elements(By.CSS_SELECTOR, "ul > li")
-        places = []
-        seen = set()
+            try:
+                if len(driver.window_handles) > 1:
+                    driver.switch_to.window(driver.window_handles[-1])
+                    _block_heavy_resources(driver)
+            except Exception:
+                pass
 
-        for item in items:
             try:
-                name = item.find_element(By.CSS_SELECTOR, "span").text.strip()
+                WebDriverWait(driver, NAVER_WAIT_SEC).until(
+                    EC.presence_of_element_located(
+                        (By.CSS_SELECTOR, NAVER_PLACE_LIST_SEL)
+                    )
+                )
+            except Exception:
+                pass
+
+            # 목록 컨테이너의 항목 이름이 실제로 채워질 때까지 대기
+            try:
+                WebDriverWait(driver, NAVER_WAIT_SEC).until(
+                    lambda d: any(len(n) >= 2 for n in _naver_place_names(d))
+                )
+            except Exception:
+                pass
+
+            places = []
+            seen = set()
+
+            for name in _naver_place_names(driver):
                 if not name:
                     continue
                 if "서비스" in name or "더보기" in name:
@@ -514,23 +706,21 @@ def get_naver_places(country, city):
                     continue
                 seen.add(name.lower())
                 places.append(name)
-            except Exception:
-                continue
 
-            if len(places) >= 10:
-                break
+                if len(places) >= 10:
+                    break
 
-        return places
+            return places
 
-    except Exception as e:
-        print("ERROR:", e)
-        return []
+        except Exception as e:
+            print("ERROR:", e)
+            return []
 
-    finally:
-        try:
-            driver.quit()
-        except:
-            pass
+        finally:
+            try:
+                _reset_naver_windows(driver)
+            except Exception:
+                close_naver_driver()
 
 def serper_places_search(country, city):
     try:
@@ -697,22 +887,134 @@ def get_overview(content_id, country, city, title):
         debug(f"⚠️ 상세 정보 가져오기 실패: {e}")
         return f"{title}는 {country} {city} 여행에서 추천할 만한 장소입니다."
 
+# ==================================================
+# Google Places 캐시 (스크립트 간 공유, 실행 간 유지)
+# ==================================================
+PLACES_CACHE_PATH = "google_places_cache.json"
+PLACES_PHOTO_TTL = 7 * 24 * 3600  # photo_reference 는 만료될 수 있어 더 짧게 유지
+# Text Search 결과에도 photos[].photo_reference 가 들어 있어 같은 수명으로 맞춤
+PLACES_TEXTSEARCH_TTL = PLACES_PHOTO_TTL
+PLACES_CACHEABLE_STATUS = ("OK", "ZERO_RESULTS", "NOT_FOUND")
+
+_places_cache = None
+_places_cache_lock = threading.Lock()
+places_cache_stats = {"textsearch_hit": 0, "textsearch_miss": 0, "photos_hit": 0, "photos_miss": 0}
+
+def _normalize_places_query(query):
+    return re.sub(r"\s+", " ", str(query or "")).strip().lower()
+
+def _load_places_cache():
+    global _places_cache
+    if _places_cache is None:
+        _places_cache = {"textsearch": {}, "photos": {}, "stats": {}}
+        if os.path.exists(PLACES_CACHE_PATH):
+            try:
+                with open(PLACES_CACHE_PATH, "r", encoding="utf-8") as f:
+                    _places_cache.update(json.load(f))
+            except Exception as e:
+                print(f"[Places 캐시] 로드 실패: {e}")
+    return _places_cache
+
+def _places_cache_get(ns, key, ttl):
+    with _places_cache_lock:
+        entry = _load_places_cache()[ns].get(key)
+        if entry and time.time() - entry.get("cached_at", 0) < ttl:
+            places_cache_stats[f"{ns}_hit"] += 1
+            return entry["value"]
+        places_cache_stats[f"{ns}_miss"] += 1
+        return None
+
+def _places_cache_put(ns, key, value):
+    with _places_cache_lock:
+        _load_places_cache()[ns][key] = {"value": value, "cached_at": time.time()}
+
+@atexit.register
+def save_places_cache():
+    # 만료 항목 정리 + 누적 hit/miss(=과금 호출 수) 기록
+    with _places_cache_lock:
+        if _places_cache is None:
+            return
+        # 같은 파일을 쓰는 다른 스크립트가 그사이 저장한 항목을 덮어쓰지 않도록 디스크 내용과 합침
+        on_disk = {}
+        if os.path.exists(PLACES_CACHE_PATH):
+            try:
+                with open(PLACES_CACHE_PATH, "r", encoding="utf-8") as f:
+                    on_disk = json.load(f)
+            except Exception as e:
+                print(f"[Places 캐시] 병합용 로드 실패: {e}")
+        now = time.time()
+        for ns, ttl in (("textsearch", PLACES_TEXTSEARCH_TTL), ("photos", PLACES_PHOTO_TTL)):
+            merged = dict(on_disk.get(ns, {}))
+            for k, v in _places_cache[ns].items():
+                if v.get("cached_at", 0) >= merged.get(k, {}).get("cached_at", 0):
+                    merged[k] = v
+            _places_cache[ns] = {k: v for k, v in merged.items() if now - v.get("cached_at", 0) < ttl}
+        # 누적 통계 = 디스크에 있던 값 + 이번 실행분
+        total = dict(on_disk.get("stats", {}))
+        for k, v in places_cache_stats.items():
+            total[k] = total.get(k, 0) + v
+        _places_cache["stats"] = total
+        try:
+            tmp = PLACES_CACHE_PATH + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(_places_cache, f, ensure_ascii=False, indent=2)
+            os.replace(tmp, PLACES_CACHE_PATH)
+        except Exception as e:
+            print(f"[Places 캐시] 저장 실패: {e}")
+        print(
+            "[Places 캐시] 이번 실행 "
+            f"텍스트검색 hit {places_cache_stats['textsearch_hit']} / miss {places_cache_stats['textsearch_miss']} · "
+            f"사진 hit {places_cache_stats['photos_hit']} / miss {places_cache_stats['photos_miss']}"
+        )
+        for k in places_cache_stats:
+            places_cache_stats[k] = 0
+
+def places_text_search(query, language="ko", place_type="", timeout=30):
+    # Text Search 응답(JSON)을 정규화된 검색어 기준으로 캐시
+    key = f"{language}|{place_type}|{_normalize_places_query(query)}"
+    cached = _places_cache_get("textsearch", key, PLACES_TEXTSEARCH_TTL)
+    if cached is not None:
+        return cached
+    params = {"query": query, "key": GOOGLE_MAPS_API_KEY, "language": language}
+    if place_type:
+        params["type"] = place_type
+    res = requests.get(
+        "https://maps.googleapis.com/maps/api/place/textsearch/json",
+        params=params, headers={"User-Agent": "Mozilla/5.0"}, timeout=timeout
+    )
+    data = res.json()
+    if data.get("status", "") in PLACES_CACHEABLE_STATUS:
+        # next_page_token 은 수 분 내 만료되므로 캐시에 남기지 않음
+        _places_cache_put("textsearch", key, {k: v for k, v in data.items() if k != "next_page_token"})
+    return data
+
+def places_photo_refs(place_id, language="ko", timeout=30):
+    # Place Details 의 photo_reference 목록을 place_id 기준으로 캐시 (언어 무관하게 공유)
+    cached = _places_cache_get("photos", place_id, PLACES_PHOTO_TTL)
+    if cached is not None:
+        return cached
+    params = {"place_id": place_id, "fields": "photos", "key": GOOGLE_MAPS_API_KEY, "language": language}
+    res = requests.get(
+        "https://maps.googleapis.com/maps/api/place/details/json",
+        params=params, headers={"User-Agent": "Mozilla/5.0"}, timeout=timeout
+    )
+    data = res.json()
+    photos = data.get("result", {}).get("photos", [])
+    if isinstance(photos, dict):
+        photos = [photos]
+    refs = [p.get("photo_reference") for p in photos if p.get("photo_reference")]
+    if data.get("status", "") in PLACES_CACHEABLE_STATUS:
+        _places_cache_put("photos", place_id, refs)
+    return refs
+
 def get_google_place_photos(place_name, count=3, country="", city=""):
     if not GOOGLE_MAPS_API_KEY:
         return []
     try:
-        headers = {"User-Agent": "Mozilla/5.0"}
         parts = [x.strip() for x in [country, city, place_name] if x and x.strip()]
         query = " ".join(parts).strip()
 
-        search_url = "https://maps.googleapis.com/maps/api/place/textsearch/json"
-        search_params = {
-            "query": query,
-            "key": GOOGLE_MAPS_API_KEY,
-            "language": "ko"
-        }
-        res = requests.get(search_url, params=search_params, headers=headers, timeout=30)
-        data = res.json()
+        data = places_text_search(query, language="ko")
         results = data.get("results", [])
         if not results:
             return []
@@ -731,23 +1033,10 @@ def get_google_place_photos(place_name, count=3, country="", city=""):
         if not place_id:
             return []
 
-        details_url = "https://maps.googleapis.com/maps/api/place/details/json"
-        details_params = {
-            "place_id": place_id,
-            "fields": "photos,name,formatted_address",
-            "key": GOOGLE_MAPS_API_KEY,
-            "language": "ko"
-        }
-        data2 = requests.get(details_url, params=details_params, headers=headers, timeout=30).json()
-        photos = data2.get("result", {}).get("photos", [])
-        if isinstance(photos, dict):
-            photos = [photos]
+        photo_refs = places_photo_refs(place_id, language="ko")
 
         photo_urls = []
-        for p in photos[:count]:
-            photo_ref = p.get("photo_reference")
-            if not photo_ref:
-                continue
+        for photo_ref in photo_refs[:count]:
             photo_url = (
                 "https://maps.googleapis.com/maps/api/place/photo"
                 f"?maxwidth=1600&photo_reference={photo_ref}&key={GOOGLE_MAPS_API_KEY}"
@@ -863,6 +1152,65 @@ def build_post_html(country, city, title, places, thumb_url):
     return html_content, LABELS
 
 
+# ==================================================
+# 장소별 보강
+# ==================================================
+def enrich_places(places, country, city):
+    # 장소마다 개요·사진·주소 조회를 서비스별 동시 수 제한 아래 한꺼번에 보내고,
+    # 조회가 끝난 장소부터 바로 AI 설명 생성을 시작 (결과는 원래 순서 유지)
+    lookup_pool = ThreadPoolExecutor(max_workers=ENRICH_MAX_WORKERS)
+
+    def lookup(service, fn, *args, **kwargs):
+        def run():
+            with api_slot(service):
+                return fn(*args, **kwargs)
+        return lookup_pool.submit(run)
+
+    def enrich_one(idx, place):
+        debug(f"장소 처리 {idx}/{len(places)}: {place['title']}")
+        place["title"] = normalize_text(place["title"])
+        overview_f = lookup("tour", get_overview, place.get("contentId", ""), country, city, place["title"])
+        images_f = lookup("places", get_place_images, place, count=3, country=country, city=city)
+        addr_f = None
+        if not place.get("addr") or not is_valid_address(place.get("addr", "")):
+            addr_f = lookup("tour", get_place_address_via_tour_api, country, city, place["title"])
+
+        place["overview"] = overview_f.result()
+        place["images"] = images_f.result()
+        place["image"] = place["images"][0] if place["images"] else ""
+        if addr_f is not None:
+            new_addr = addr_f.result()
+            if new_addr:
+                place["addr"] = new_addr
+                debug(f"주소 보강 완료: {new_addr}")
+
+        prompt = make_section_prompt(country, city, place["title"], place.get("addr", ""), place.get("overview", ""))
+        with api_slot("ai"):
+            place["desc"] = generate_ai_review(prompt, place["title"])
+        place["desc"] = re.sub(r"<h1[^>]*>.*?</h1>", "", place["desc"], flags=re.IGNORECASE)
+        place["desc"] = place["desc"].replace("**", "")
+        place["desc"] = place["desc"].replace('data-ke-size="size16"', 'data-ke-size="size18"')
+        place["desc"] = place["desc"].replace("size16", "size18")
+        return {
+            "contentId": place.get("contentId", ""),
+            "title": place["title"],
+            "addr": place.get("addr", ""),
+            "image": place.get("image", ""),
+            "images": place.get("images", []),
+            "overview": place.get("overview", ""),
+            "desc": place.get("desc", "")
+        }
+
+    started = time.time()
+    try:
+        with ThreadPoolExecutor(max_workers=ENRICH_MAX_WORKERS) as ex:
+            futures = [ex.submit(enrich_one, idx, place) for idx, place in enumerate(places, start=1)]
+            sections = [f.result() for f in futures]
+    finally:
+        lookup_pool.shutdown(wait=True)
+    debug(f"장소 보강 완료: {len(sections)}개 ({time.time() - started:.1f}s)")
+    return sections
+
 # ==================================================
 # 실행
 # ==================================================
@@ -883,34 +1231,7 @@ def main():
         places = get_places(country, city)
         debug(f"수집된 장소 개수: {len(places)}")
 
-        travel_sections = []
-        for idx, place in enumerate(places, start=1):
-            debug(f"장소 처리 {idx}/{len(places)}: {place['title']}")
-            place["title"] = normalize_text(place["title"])
-            place["overview"] = get_overview(place.get("contentId", ""), country, city, place["title"])
-            place["images"] = get_place_images(place, count=3, country=country, city=city)
-            place["image"] = place["images"][0] if place["images"] else ""
-            if not place.get("addr") or not is_valid_address(place.get("addr", "")):
-                new_addr = get_place_address_via_tour_api(country, city, place["title"])
-                if new_addr:
-                    place["addr"] = new_addr
-                    debug(f"주소 보강 완료: {new_addr}")
-            prompt = make_section_prompt(country, city, place["title"], place.get("addr", ""), place.get("overview", ""))
-            place["desc"] = generate_ai_review(prompt, place["title"])
-            place["desc"] = re.sub(r"<h1[^>]*>.*?</h1>", "", place["desc"], flags=re.IGNORECASE)
-            place["desc"] = place["desc"].replace("**", "")
-            place["desc"] = place["desc"].replace('data-ke-size="size16"', 'data-ke-size="size18"')
-            place["desc"] = place["desc"].replace("size16", "size18")
-            travel_sections.append({
-                "contentId": place.get("contentId", ""),
-                "title": place["title"],
-                "addr": place.get("addr", ""),
-                "image": place.get("image", ""),
-                "images": place.get("images", []),
-                "overview": place.get("overview", ""),
-                "desc": place.get("desc", "")
-            })
-            time.sleep(0.4)
+        travel_sections = enrich_places(places, country, city)
 
         safe_title = re.sub(r'[\\/:*?"<>|.]', "_", title)
         os.makedirs(THUMB_DIR, exist_ok=True)
@@ -939,6 +1260,7 @@ def main():
             isDraft=False,
             fetchImages=True
         ).execute()
+        enqueue_index_notification(res.get("url", ""))
 
         debug(f"Blogger 업로드 성공: {res.get('url', '')}")
         ws4.update_cell(row_idx, 3, "완")
@@ -4,11 +4,13 @@ import sys
 import json
 import re
 import time
+import atexit
 import random
 import traceback
 import requests
 import logging
 import pickle
+import threading
 from urllib.parse import quote
 import glob
 from bs4 import BeautifulSoup
@@ -115,27 +117,97 @@ ws4 = get_sheet4()
 # ==================================================
 # 히스토리 관리
 # ==================================================
+# 처리 이력: append-only JSONL 로그 + 메모리 dict 인덱스 (조회/추가 O(1))
+# 기존 {HISTORY_PATH} JSON 목록은 처음 한 번만 옮겨 옴
+HISTORY_LOG_PATH = os.path.splitext(HISTORY_PATH)[0] + ".jsonl"
+HISTORY_COMPACT_RATIO = 2  # 로그 줄 수가 고유 키의 2배를 넘으면 압축
+
+_history = None  # {key: 처음 기록된 시각}
+_history_lines = 0
+_history_lock = threading.Lock()
+
+def _load_history():
+    global _history, _history_lines
+    if _history is not None:
+        return _history
+    history, lines = {}, 0
+    if os.path.exists(HISTORY_LOG_PATH):
+        with open(HISTORY_LOG_PATH, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                lines += 1
+                try:
+                    rec = json.loads(line)
+                    history.setdefault(rec["key"], rec.get("ts", 0))
+                except Exception:
+                    continue  # 중간에 끊긴 마지막 줄 등
+    elif os.path.exists(HISTORY_PATH):
+        try:
+            with open(HISTORY_PATH, "r", encoding="utf-8") as f:
+                for key in json.load(f).get("pairs", []):
+                    history.setdefault(key, 0)
+        except Exception as e:
+            debug(f"load_processed_pairs failed: {e}")
+        lines = -1  # 이관분은 바로 로그로 씀
+    _history = history
+    _history_lines = lines
+    if lines < 0 or lines > HISTORY_COMPACT_RATIO * max(len(history), 1):
+        _compact_history_locked()
+    return _history
+
+def _compact_history_locked():
+    global _history_lines
+    tmp = HISTORY_LOG_PATH + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        for key, ts in _history.items():
+            f.write(json.dumps({"key": key, "ts": ts}, ensure_ascii=False) + "\n")
+    os.replace(tmp, HISTORY_LOG_PATH)
+    _history_lines = len(_history)
+
+def compact_history():
+    with _history_lock:
+        _load_history()
+        _compact_history_locked()
+
+def history_add(key):
+    global _history_lines
+    with _history_lock:
+        history = _load_history()
+        if key in history:
+            return False
+        ts = int(time.time())
+        with open(HISTORY_LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"key": key, "ts": ts}, ensure_ascii=False) + "\n")
+        history[key] = ts
+        _history_lines += 1
+        return True
+
 def load_processed_pairs():
-    if not os.path.exists(HISTORY_PATH):
-        return []
-    try:
-        with open(HISTORY_PATH, "r", encoding="utf-8") as f:
-            return json.load(f).get("pairs", [])
-    except Exception:
-        return []
+    with _history_lock:
+        return list(_load_history())
 
 def save_processed_pair(country, city):
-    processed = load_processed_pairs()
-    key = f"{country}|{city}"
-    if key not in processed:
-        processed.append(key)
-    with open(HISTORY_PATH, "w", encoding="utf-8") as f:
-        json.dump({"pairs": processed}, f, ensure_ascii=False, indent=2)
+    history_add(f"{country}|{city}")
 
 def debug(msg):
     print(msg)
     logger.debug(msg)
 
+# 발행 직후 URL 을 로컬 큐(JSONL)에 넣어 두면 Index_Notify.py 가 Google/Bing 에 묶어서 알림
+INDEX_QUEUE_PATH = os.getenv("INDEX_QUEUE_PATH", "index_queue.jsonl")
+
+def enqueue_index_notification(url):
+    if not url:
+        return
+    rec = {"url": url, "ts": int(time.time()), "source": os.path.basename(__file__)}
+    try:
+        with open(INDEX_QUEUE_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+    except Exception as e:
+        debug(f"색인 큐 기록 실패: {e}")
+
 def log_step(row, msg):
     try:
         prev = ws4.cell(row, 16).value or ""
@@ -451,9 +523,28 @@ def get_default_places(country, city):
         "score": 0
     } for name in fallback]
 
-def get_naver_places(country, city):
-    keyword = f"{country} {city} 가볼만한곳"
+# ==================================================
+# 네이버 플레이스 수집용 Chrome (프로세스당 1회 기동 후 재사용)
+# ==================================================
+NAVER_BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*.mp4", "*.webm", "*.m3u8", "*.mp3",
+]
+NAVER_WAIT_SEC = 10
+
+_naver_driver = None
+_naver_driver_lock = threading.Lock()
+
+def _block_heavy_resources(driver):
+    # CDP 차단 설정은 탭(타깃) 단위라 새 창으로 옮길 때마다 다시 적용
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": NAVER_BLOCKED_URLS})
+    except Exception as e:
+        debug(f"⚠️ 리소스 차단 설정 실패: {e}")
 
+def _start_naver_driver():
     options = Options()
     options.add_argument("--headless=new")
     options.add_argument("--disable-gpu")
@@ -463,47 +554,118 @@ def get_naver_places(country, city):
     options.add_argument(
         "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
     )
-
+    # DOMContentLoaded 까지만 기다리고 이미지는 브라우저 설정으로도 차단
+    options.page_load_strategy = "eager"
+    options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
     driver = webdriver.Chrome(options=options)
+    _block_heavy_resources(driver)
+    return driver
 
-    try:
-        driver.get("https://search.naver.com/search.naver?query=" + quote(keyword))
-        time.sleep(2)
-
+def get_naver_driver():
+    global _naver_driver
+    if _naver_driver is not None:
         try:
-            btn = driver.find_element(
-                By.CSS_SELECTOR,
-                "#place-main-section-root section div.mod_more_wrap a"
-            )
-            btn.click()
-            time.sleep(3)
+            _naver_driver.window_handles
+            return _naver_driver
         except Exception:
-            pass
-
+            close_naver_driver()
+    _naver_driver = _start_naver_driver()
+    return _naver_driver
+
+def _reset_naver_windows(driver):
+    # 더보기로 열린 창을 닫고 첫 창으로 복귀 (다음 도시 조회에서 재사용)
+    handles = driver.window_handles
+    for h in handles[1:]:
+        driver.switch_to.window(h)
+        driver.close()
+    driver.switch_to.window(handles[0])
+
+@atexit.register
+def close_naver_driver():
+    global _naver_driver
+    if _naver_driver is not None:
         try:
-            if len(driver.window_handles) > 1:
-                driver.switch_to.window(driver.window_handles[-1])
+            _naver_driver.quit()
         except Exception:
             pass
+        _naver_driver = None
+
+# 장소 목록 컨테이너 (페이지의 다른 ul > li 메뉴/탭은 보지 않음)
+# 클래스 뒤의 해시(__iXtmX 등)는 배포마다 바뀌므로 접두사로 찾음
+NAVER_PLACE_LIST_SEL = '[class^="pc_scroll_container"]'
+
+def _naver_place_names(driver):
+    # 목록 컨테이너 안 li 마다 첫 span 의 텍스트를 한 번의 스크립트 호출로 수집 (대기 조건에서도 반복 사용)
+    # 컨테이너를 못 찾으면 예전처럼 페이지 전체의 ul > li 를 봄
+    return driver.execute_script("""
+        const root = document.querySelector(arguments[0]) || document;
+        return Array.from(root.querySelectorAll("ul > li"))
+            .map(li => li.querySelector("span"))
+            .filter(span => span)
+            .map(span => (span.innerText || "").trim());
+    """, NAVER_PLACE_LIST_SEL) or []
+
+def get_naver_places(country, city):
+    keyword = f"{country} {city} 가볼만한곳"
+
+    with _naver_driver_lock:
+        try:
+            driver = get_naver_driver()
+        except Exception as e:
+            print("ERROR:", e)
+            return []
 
         try:
-            WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located(
-                    (By.CSS_SELECTOR, "div.pc_scroll_container__iXtmX")
+            driver.get("https://search.naver.com/search.naver?query=" + quote(keyword))
+            more_sel = "#place-main-section-root section div.mod_more_wrap a"
+
+            try:
+                WebDriverWait(driver, NAVER_WAIT_SEC).until(
+                    lambda d: d.find_elements(By.CSS_SELECTOR, more_sel) or d.find_elements(By.CSS_SELECTOR, "#place-main-section-root ul > li")
                 )
-            )
-        except Exception:
-            pass
+            except Exception:
+                pass
+
+            try:
+                btn = driver.find_element(By.CSS_SELECTOR, more_sel)
+                handles_before = len(driver.window_handles)
+                url_before = driver.current_url
+                btn.click()
+                # 새 창이 열리거나 주소가 바뀔 때까지만 대기
+                WebDriverWait(driver, NAVER_WAIT_SEC).until(
+                    lambda d: len(d.window_handles) > handles_before or d.current_url != url_before
+                )
+            except Exception:
+                pass
 
-        time.sleep(2)
+            try:
+                if len(driver.window_handles) > 1:
+                    driver.switch_to.window(driver.window_handles[-1])
+                    _block_heavy_resources(driver)
+            except Exception:
+                pass
 
-        items = driver.find_elements(By.CSS_SELECTOR, "ul > li")
-        places = []
-        seen = set()
+            try:
+                WebDriverWait(driver, NAVER_WAIT_SEC).until(
+                    EC.presence_of_element_located(
+                        (By.CSS_SELECTOR, NAVER_PLACE_LIST_SEL)
+                    )
+                )
+            except Exception:
+                pass
 
-        for item in items:
+            # 목록 컨테이너의 항목 이름이 실제로 채워질 때까지 대기
             try:
-                name = item.find_element(By.CSS_SELECTOR, "span").text.strip()
+                WebDriverWait(driver, NAVER_WAIT_SEC).until(
+                    lambda d: any(len(n) >= 2 for n in _naver_place_names(d))
+                )
+            except Exception:
+                pass
+
+            places = []
+            seen = set()
+
+            for name in _naver_place_names(driver):
                 if not name:
                     continue
                 if "서비스" in name or "더보기" in name:
@@ -514,23 +676,21 @@ def get_naver_places(country, city):
                     continue
                 seen.add(name.lower())
                 places.append(name)
-            except Exception:
-                continue
 
-            if len(places) >= 10:
-                break
+                if len(places) >= 10:
+                    break
 
-        return places
+            return places
 
-    except Exception as e:
-        print("ERROR:", e)
-        return []
+        except Exception as e:
+            print("ERROR:", e)
+            return []
 
-    finally:
-        try:
-            driver.quit()
-        except:
-            pass
+        finally:
+            try:
+                _reset_naver_windows(driver)
+            except Exception:
+                close_naver_driver()
 
 def serper_places_search(country, city):
     try:
@@ -939,6 +1099,7 @@ def main():
             isDraft=False,
             fetchImages=True
         ).execute()
+        enqueue_index_notification(res.get("url", ""))
 
         debug(f"Blogger 업로드 성공: {res.get('url', '')}")
         ws4.update_cell(row_idx, 3, "완")
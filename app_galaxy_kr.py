@@ -11,6 +11,11 @@ import random
 import traceback
 import urllib.parse
 import glob
+import atexit
+import threading
+import queue
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from bs4 import BeautifulSoup
 import requests
@@ -461,11 +466,17 @@ def rewrite_app_description(original_html: str, app_name: str, keyword_str: str)
 
 
 # =========================
-# 구글플레이 스토어 앱 검색 (Selenium)
+# Edge 드라이버 풀 (프로세스당 1 회 기동, 탭 단위 대여)
 # =========================
-def search_google_play_apps(keyword, limit=15):
-    """구글플레이 스토어에서 키워드 검색 → 앱 ID 목록 반환"""
-    
+EDGE_MAX_TABS = 3  # 동시에 열 수 있는 탭(=드라이버) 상한
+
+_edge_idle = queue.LifoQueue()
+_edge_all = []
+_edge_lock = threading.Lock()
+_edge_slots = threading.BoundedSemaphore(EDGE_MAX_TABS)
+
+
+def _make_edge_options():
     edge_options = EdgeOptions()
     edge_options.add_argument("--headless=new")
     edge_options.add_argument("--disable-gpu")
@@ -474,12 +485,106 @@ def search_google_play_apps(keyword, limit=15):
     edge_options.add_argument("--disable-extensions")
     edge_options.add_argument("--disable-logging")
     edge_options.add_argument("--log-level=3")
-    
-    chrome = None
+    return edge_options
+
+
+def _start_edge_driver():
+    print("[Edge 풀] 브라우저 기동")
+    driver = webdriver.Edge(options=_make_edge_options())
+    driver.implicitly_wait(3)
+    with _edge_lock:
+        _edge_all.append(driver)
+    return driver
+
+
+def _discard_edge_driver(driver):
+    with _edge_lock:
+        if driver in _edge_all:
+            _edge_all.remove(driver)
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+def _edge_is_healthy(driver):
+    """세션이 살아 있고 탭이 하나 이상 남아 있는지 확인"""
+    try:
+        return len(driver.window_handles) >= 1
+    except Exception:
+        return False
+
+
+def _reset_edge_tabs(driver):
+    """대여 중 열린 탭을 모두 닫고 첫 번째 탭으로 복귀"""
+    handles = driver.window_handles
+    for h in handles[1:]:
+        driver.switch_to.window(h)
+        driver.close()
+    driver.switch_to.window(handles[0])
+
+
+@contextmanager
+def edge_tab():
+    """풀에서 드라이버를 빌려 새 탭을 열어 준다. 끝나면 탭을 닫고 반납.
+    세션이 죽어 있으면 폐기하고 새로 기동한다."""
+    _edge_slots.acquire()
+    driver = None
+    try:
+        try:
+            driver = _edge_idle.get_nowait()
+        except queue.Empty:
+            driver = None
+
+        if driver is not None and not _edge_is_healthy(driver):
+            print("[Edge 풀] 세션 응답 없음 → 재시작")
+            _discard_edge_driver(driver)
+            driver = None
+
+        if driver is None:
+            driver = _start_edge_driver()
+
+        driver.switch_to.new_window("tab")
+        yield driver
+
+    finally:
+        if driver is not None:
+            try:
+                _reset_edge_tabs(driver)
+                _edge_idle.put(driver)
+            except Exception:
+                print("[Edge 풀] 드라이버 오류 → 폐기")
+                _discard_edge_driver(driver)
+        _edge_slots.release()
+
+
+@atexit.register
+def close_edge_pool():
+    with _edge_lock:
+        drivers = list(_edge_all)
+        _edge_all.clear()
+    for d in drivers:
+        try:
+            d.quit()
+        except Exception:
+            pass
+
+
+# =========================
+# 구글플레이 스토어 앱 검색 (Selenium)
+# =========================
+def search_google_play_apps(keyword, limit=15):
+    """구글플레이 스토어에서 키워드 검색 → 앱 ID 목록 반환"""
+    try:
+        with edge_tab() as chrome:
+            return _search_google_play_apps(chrome, keyword, limit)
+    except Exception as e:
+        print(f"[구글플레이 검색 실패] {e}")
+        return []
+
+
+def _search_google_play_apps(chrome, keyword, limit):
     try:
-        chrome = webdriver.Edge(options=edge_options)
-        chrome.implicitly_wait(3)
-        
         search_url = f"https://play.google.com/store/search?q={keyword}&c=apps"
         print("[구글플레이 검색]", search_url)
         chrome.get(search_url)
@@ -514,72 +619,236 @@ def search_google_play_apps(keyword, limit=15):
     except Exception as e:
         print(f"[구글플레이 검색 실패] {e}")
         return []
-    
-    finally:
-        if chrome:
-            try:
-                chrome.quit()
-            except:
-                pass
 
 
 # =========================
-# 이미지 파일 크기 확인 (10KB 미만 제외)
+# 이미지 파일 크기 확인 (10KB 미만 제외) - 병렬 + 캐시
 # =========================
+IMAGE_SIZE_CACHE_PATH = "image_size_cache.json"
+IMAGE_SIZE_CACHE_TTL = 7 * 24 * 3600  # 7 일
+IMAGE_PROBE_WORKERS = 8
+
+_image_size_cache = None
+_image_size_lock = threading.Lock()
+
+
+def _load_image_size_cache():
+    global _image_size_cache
+    if _image_size_cache is None:
+        try:
+            with open(IMAGE_SIZE_CACHE_PATH, "r", encoding="utf-8") as f:
+                _image_size_cache = json.load(f)
+        except Exception:
+            _image_size_cache = {}
+    return _image_size_cache
+
+
+def _save_image_size_cache():
+    with _image_size_lock:
+        data = dict(_load_image_size_cache())
+    try:
+        with open(IMAGE_SIZE_CACHE_PATH, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+    except Exception as e:
+        print("[크기 캐시 저장 실패]", e)
+
+
+def _probe_image_size(url, timeout=5):
+    """HEAD → (Content-Length 없으면) Range: bytes=0-0 GET 의 Content-Range 로 전체 크기 확인.
+    반환: (size_bytes 또는 None, content_type)"""
+    response = requests.head(url, timeout=timeout, allow_redirects=True)
+    ctype = response.headers.get("Content-Type", "")
+    size_bytes = response.headers.get("Content-Length")
+    if response.status_code < 400 and size_bytes:
+        return int(size_bytes), ctype
+
+    # Content-Length 없으면 1 바이트만 요청해서 Content-Range 총 길이 확인
+    response = requests.get(url, timeout=timeout, stream=True,
+                            headers={"Range": "bytes=0-0"})
+    try:
+        ctype = response.headers.get("Content-Type", ctype)
+        m = re.search(r"/(\d+)\s*$", response.headers.get("Content-Range", ""))
+        if m:
+            return int(m.group(1)), ctype
+        if response.status_code == 200 and response.headers.get("Content-Length"):
+            return int(response.headers["Content-Length"]), ctype
+        return None, ctype
+    finally:
+        response.close()
+
+
+def probe_image_sizes(urls, timeout=5):
+    """여러 이미지 URL 의 크기를 한 번에 병렬 확인 → {url: (size_bytes, content_type)}
+    캐시(TTL 내)에 있는 URL 은 요청하지 않는다."""
+    cache = _load_image_size_cache()
+    now = time.time()
+    results = {}
+    todo = []
+    for url in dict.fromkeys(u for u in urls if u):
+        hit = cache.get(url)
+        if hit and now - hit.get("checked_at", 0) < IMAGE_SIZE_CACHE_TTL:
+            results[url] = (hit.get("size"), hit.get("content_type", ""))
+        else:
+            todo.append(url)
+
+    if todo:
+        with ThreadPoolExecutor(max_workers=min(IMAGE_PROBE_WORKERS, len(todo))) as ex:
+            futures = {ex.submit(_probe_image_size, url, timeout): url for url in todo}
+            for fut in as_completed(futures):
+                url = futures[fut]
+                try:
+                    size_bytes, ctype = fut.result()
+                except Exception as e:
+                    print(f"[크기 확인 실패] {url[:80]}... → {e}")
+                    results[url] = (None, "")
+                    continue  # 실패는 캐시하지 않음
+                results[url] = (size_bytes, ctype)
+                if size_bytes is None:
+                    continue
+                with _image_size_lock:
+                    cache[url] = {"size": size_bytes, "content_type": ctype, "checked_at": now}
+        _save_image_size_cache()
+
+    return results
+
+
+def is_image_size_ok(url, sizes):
+    size_bytes, _ = sizes.get(url, (None, ""))
+    if not size_bytes:
+        # 크기를 알 수 없으면 제외 (안전상)
+        return False
+    size_kb = size_bytes / 1024
+    if size_kb < 10:  # 10KB 미만 제외 (수정: 5 → 10)
+        print(f"[제외] 파일 크기 필터: {size_kb:.2f}KB ({size_bytes}바이트)")
+        return False
+    return True
+
+
 def check_image_size(url, timeout=5):
     """이미지 URL 의 파일 크기 확인 (바이트 단위)"""
+    return is_image_size_ok(url, probe_image_sizes([url], timeout=timeout))
+
+
+# =========================
+# 구글플레이 앱 상세 (HTTP 전용, 내장 JSON 파싱)
+# =========================
+PLAY_HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                  "(KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+    "Accept-Language": "ko-KR,ko;q=0.9",
+}
+
+_AF_BLOCK_RE = re.compile(r"AF_initDataCallback[\s\S]*?</script")
+_AF_KEY_RE = re.compile(r"key:\s*'(ds:\d+)'")
+_AF_DATA_RE = re.compile(r"data:([\s\S]*?), sideChannel: \{\}\}\);</")
+
+
+def _extract_af_blobs(html: str) -> dict:
+    """AF_initDataCallback({key: 'ds:N', data: [...]}) 블록 → {ds:N: data}"""
+    blobs = {}
+    for block in _AF_BLOCK_RE.findall(html):
+        key_m = _AF_KEY_RE.search(block)
+        data_m = _AF_DATA_RE.search(block)
+        if not key_m or not data_m:
+            continue
+        try:
+            blobs[key_m.group(1)] = json.loads(data_m.group(1))
+        except ValueError:
+            continue
+    return blobs
+
+
+def _dig(data, *path):
     try:
-        # Content-Length 헤더로 크기만 확인 (다운로드하지 않음)
-        response = requests.head(url, timeout=timeout, allow_redirects=True)
-        size_bytes = response.headers.get('Content-Length')
-        
-        if size_bytes:
-            size_bytes = int(size_bytes)
-            size_kb = size_bytes / 1024
-            
-            if size_kb < 10:  # 10KB 미만 제외 (수정: 5 → 10)
-                print(f"[제외] 파일 크기 필터: {size_kb:.2f}KB ({size_bytes}바이트)")
-                return False
-            
-            return True
-        
-        # Content-Length 없으면 실제로 다운로드해서 확인
-        response = requests.get(url, timeout=timeout, stream=True)
-        size_bytes = len(response.content)
-        size_kb = size_bytes / 1024
-        
-        if size_kb < 10:  # 10KB 미만 제외
-            print(f"[제외] 파일 크기 필터: {size_kb:.2f}KB ({size_bytes}바이트)")
-            return False
-        
-        return True
-        
+        for p in path:
+            data = data[p]
+        return data
+    except (IndexError, KeyError, TypeError):
+        return None
+
+
+def _upscale_play_image(url: str) -> str:
+    if re.search(r"=w\d+-h\d+", url):
+        return re.sub(r"=w\d+-h\d+", "=w2048-h4096", url)
+    if "=" not in url.rsplit("/", 1)[-1]:
+        return url + "=w2048-h4096"
+    return url
+
+
+def get_play_app_info_http(app_id, max_images=6):
+    """브라우저 없이 상세 페이지 HTML 의 ds 블롭에서 제목/설명/스크린샷 추출.
+    파싱 실패 시 None (→ 브라우저 폴백)"""
+    app_url = f"https://play.google.com/store/apps/details?id={app_id}&hl=ko&gl=KR"
+    try:
+        resp = requests.get(app_url, headers=PLAY_HTTP_HEADERS, timeout=10)
+        if resp.status_code != 200:
+            print(f"[앱 상세 HTTP] 상태코드 {resp.status_code}")
+            return None
+
+        detail = None
+        for data in _extract_af_blobs(resp.text).values():
+            if isinstance(_dig(data, 1, 2, 0, 0), str):
+                detail = _dig(data, 1, 2)
+                break
+        if detail is None:
+            print("[앱 상세 HTTP] ds 블롭 없음")
+            return None
+
+        app_name = detail[0][0].strip()
+        desc = _dig(detail, 72, 0, 1) or _dig(detail, 12, 0, 0, 1) or ""
+
+        candidates = []
+        for item in _dig(detail, 78, 0) or []:
+            url = _dig(item, 3, 2)
+            if isinstance(url, str) and url.startswith("http"):
+                candidates.append(_upscale_play_image(url))
+
+        sizes = probe_image_sizes(candidates)
+        screenshots = []
+        for url in dict.fromkeys(candidates):
+            if not is_image_size_ok(url, sizes):
+                continue
+            screenshots.append(url)
+            if len(screenshots) >= max_images:
+                break
+
+        if not app_name or not desc:
+            print("[앱 상세 HTTP] 제목/설명 파싱 실패")
+            return None
+
+        print(f"[앱 상세 HTTP] {app_name} / 스크린샷 {len(screenshots)}개 / 설명 {len(desc)} 문자")
+        return {
+            "title": app_name,
+            "app_id": app_id,
+            "screenshots": screenshots,
+            "description": f"<div>{desc}</div>",
+        }
     except Exception as e:
-        print(f"[크기 확인 실패] {url[:80]}... → {e}")
-        # 실패하면 제외 (안전상)
-        return False
+        print(f"[앱 상세 HTTP 실패] {e}")
+        return None
 
 
 # =========================
 # 구글플레이 스토어 앱 상세 정보 수집
 # =========================
 def get_play_app_info(app_id):
-    """구글플레이 스토어 앱 상세 페이지 → 스크린샷 + 상세설명 수집"""
-    
-    edge_options = EdgeOptions()
-    edge_options.add_argument("--headless=new")
-    edge_options.add_argument("--disable-gpu")
-    edge_options.add_argument("--no-sandbox")
-    edge_options.add_argument("--disable-dev-shm-usage")
-    edge_options.add_argument("--disable-extensions")
-    edge_options.add_argument("--disable-logging")
-    edge_options.add_argument("--log-level=3")
-    
-    chrome = None
+    """구글플레이 스토어 앱 상세 페이지 → 스크린샷 + 상세설명 수집
+    (HTTP 파싱 우선, 실패 시에만 브라우저 사용)"""
+    info = get_play_app_info_http(app_id)
+    if info:
+        return info
+
+    print("[앱 상세] HTTP 파싱 실패 → 브라우저 폴백")
+    try:
+        with edge_tab() as chrome:
+            return _get_play_app_info(chrome, app_id)
+    except Exception as e:
+        print(f"[앱 상세 정보 수집 실패] {e}")
+        return None
+
+
+def _get_play_app_info(chrome, app_id):
     try:
-        chrome = webdriver.Edge(options=edge_options)
-        chrome.implicitly_wait(3)
-        
         app_url = f"https://play.google.com/store/apps/details?id={app_id}"
         print(f"[앱 상세 페이지]", app_url)
         chrome.get(app_url)
@@ -621,8 +890,9 @@ def get_play_app_info(app_id):
         
         print(f"[INFO] 발견 이미지 수: {len(selenium_imgs)}")
         
+        candidates = []
         for img_el in selenium_imgs:
-            if cc > 8:
+            if len(candidates) >= 16:
                 break
             try:
                 alt_text = (img_el.get_attribute("alt") or "").strip()
@@ -675,18 +945,23 @@ def get_play_app_info(app_id):
                 if real_url in downloaded:
                     continue
                 
-                # 3. **파일 크기 확인 (10KB 미만 제외)**
-                if not check_image_size(real_url):
-                    continue
-                
                 downloaded.add(real_url)
-                html_img_urls.append(real_url)
-                print(f"[수집] 이미지 {cc}: {real_url[:80]}... (크기 확인 통과)")
-                cc += 1
+                candidates.append(real_url)
                 
             except Exception as e:
                 print(f"[이미지 실패] {e}")
         
+        # 3. **파일 크기 확인 (10KB 미만 제외) - 후보 전체를 한 번에 병렬 확인**
+        sizes = probe_image_sizes(candidates)
+        for real_url in candidates:
+            if cc > 8:
+                break
+            if not is_image_size_ok(real_url, sizes):
+                continue
+            html_img_urls.append(real_url)
+            print(f"[수집] 이미지 {cc}: {real_url[:80]}... (크기 확인 통과)")
+            cc += 1
+        
         # target_images: 1 번째부터 7 번째 (인덱스 1~6) = 6 개
         target_images = html_img_urls[1:7] if len(html_img_urls) > 1 else []
         
@@ -740,13 +1015,6 @@ def get_play_app_info(app_id):
     except Exception as e:
         print(f"[앱 상세 정보 수집 실패] {e}")
         return None
-    
-    finally:
-        if chrome:
-            try:
-                chrome.quit()
-            except:
-                pass
 
 
 # =========================
@@ -936,19 +1204,23 @@ def pick_target_row(ws):
 # =========================
 # H 열 로그 누적
 # =========================
+_sheet_log_lock = threading.Lock()  # 파이프라인 스레드 간 H 열 덮어쓰기 방지
+
+
 def sheet_append_log(ws, row_idx, message, tries=3, delay=2):
     ts = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime()) + "Z"
     line = f"[{ts}] {message}"
-    for t in range(1, tries+1):
-        try:
-            prev = ws.cell(row_idx, 8).value or ""   # H 열
-            new_val = (prev + (";" if prev else "") + line)
-            ws.update_cell(row_idx, 8, new_val)
-            print(f"[LOG:H{row_idx}] {line}")
-            return True
-        except Exception as e:
-            print(f"[WARN] 로그기록 재시도 {t}/{tries}: {e}")
-            time.sleep(delay * t)
+    with _sheet_log_lock:
+        for t in range(1, tries+1):
+            try:
+                prev = ws.cell(row_idx, 8).value or ""   # H 열
+                new_val = (prev + (";" if prev else "") + line)
+                ws.update_cell(row_idx, 8, new_val)
+                print(f"[LOG:H{row_idx}] {line}")
+                return True
+            except Exception as e:
+                print(f"[WARN] 로그기록 재시도 {t}/{tries}: {e}")
+                time.sleep(delay * t)
     print(f"[FAIL] 로그기록 실패: {line}")
     return False
 
@@ -974,6 +1246,84 @@ def save_next_blog_index(ws, next_index):
         print("[WARN] 시트 블로그 인덱스 저장 실패:", e)
 
 
+# =========================
+# 앱 포스트 파이프라인 (수집 / 리라이트 / 렌더 단계 분리)
+# =========================
+def run_app_pipeline(items, fetch_fn, rewrite_fn, render_fn, on_error=None, queue_size=2):
+    """수집(fetch) → 리라이트(rewrite) → 렌더(render) 3 단계를 스레드로 분리해 흘려 보낸다.
+    단계 사이는 크기 제한 큐로 연결되어 앱 N 리라이트 중에 앱 N+1 수집이 진행된다.
+    각 단계 함수는 (idx, data) 를 받고, None 을 반환하면 해당 앱은 건너뛴다.
+    반환: (원래 순서대로 정렬된 render 결과 리스트, 단계별 소요 시간 dict)"""
+    done = object()
+    fetched_q = queue.Queue(maxsize=queue_size)
+    rewritten_q = queue.Queue(maxsize=queue_size)
+    stage_times = {"fetch": 0.0, "rewrite": 0.0, "render": 0.0}
+    results = {}
+
+    def run_stage(stage, fn, idx, data):
+        t0 = time.time()
+        try:
+            return fn(idx, data)
+        except Exception as e:
+            if on_error:
+                on_error(idx, stage, e)
+            else:
+                print(f"[파이프라인] {idx + 1}번 {stage} 실패: {e}")
+            return None
+        finally:
+            stage_times[stage] += time.time() - t0
+
+    def fetch_worker():
+        try:
+            for idx, item in enumerate(items):
+                data = run_stage("fetch", fetch_fn, idx, item)
+                if data is not None:
+                    fetched_q.put((idx, data))
+        finally:
+            fetched_q.put(done)
+
+    def rewrite_worker():
+        try:
+            while True:
+                job = fetched_q.get()
+                if job is done:
+                    break
+                data = run_stage("rewrite", rewrite_fn, *job)
+                if data is not None:
+                    rewritten_q.put((job[0], data))
+        finally:
+            rewritten_q.put(done)
+
+    started = time.time()
+    workers = [threading.Thread(target=fetch_worker, daemon=True),
+               threading.Thread(target=rewrite_worker, daemon=True)]
+    for w in workers:
+        w.start()
+
+    # 렌더는 메인 스레드에서 (순서 무관하게 받고 마지막에 원래 순서로 조립)
+    while True:
+        job = rewritten_q.get()
+        if job is done:
+            break
+        html = run_stage("render", render_fn, *job)
+        if html:
+            results[job[0]] = html
+
+    for w in workers:
+        w.join()
+
+    stage_times["total"] = time.time() - started
+    print("[파이프라인] " + format_stage_times(stage_times))
+    return [results[i] for i in sorted(results)], stage_times
+
+
+def format_stage_times(stage_times):
+    return (f"총 {stage_times.get('total', 0):.1f}s | "
+            f"수집 {stage_times['fetch']:.1f}s · "
+            f"리라이트 {stage_times['rewrite']:.1f}s · "
+            f"렌더 {stage_times['render']:.1f}s")
+
+
 # =========================
 # 메인 실행
 # =========================
@@ -1055,76 +1405,84 @@ if __name__ == "__main__":
         save_next_blog_index(ws3, next_index)
         sheet_append_log(ws3, target_row, f"로테이션 블로그 ID: {BLOG_ID}")
 
-        # 9) 앱 상세 수집 → 본문 조립
-        for j, app in enumerate(apps, 1):
-            if j > 7:
-                break
-            try:
-                sheet_append_log(ws3, target_row, f"[{j}] 앱 수집 시작 id={app['id']}")
-                
-                app_info = get_play_app_info(app["id"])
-                if not app_info:
-                    sheet_append_log(ws3, target_row, f"[{j}] 앱 정보 조회 실패")
-                    continue
-
-                app_name = app_info["title"]
-                screenshots = app_info["screenshots"]
-                src_desc = app_info["description"]
-
-                desc_html = rewrite_app_description(src_desc, app_name, keyword)
-                sheet_append_log(ws3, target_row, f"[{j}] {app_name} 설명 리라이트 성공")
-
-                img_group_html = "".join(
-                    f'<div class="img-wrap"><img src="{img_url}" alt="{app_name}_{cc+1}"></div>'
-                    for cc, img_url in enumerate(screenshots)
-                )
-
-                app_url = f"https://play.google.com/store/apps/details?id={app['id']}"
+        # 9) 앱 상세 수집 → 리라이트 → 본문 조립 (단계별 파이프라인)
+        def fetch_stage(idx, app):
+            j = idx + 1
+            sheet_append_log(ws3, target_row, f"[{j}] 앱 수집 시작 id={app['id']}")
+            app_info = get_play_app_info(app["id"])
+            if not app_info:
+                sheet_append_log(ws3, target_row, f"[{j}] 앱 정보 조회 실패")
+            return app_info
+
+        def rewrite_stage(idx, app_info):
+            j = idx + 1
+            app_info["desc_html"] = rewrite_app_description(app_info["description"], app_info["title"], keyword)
+            sheet_append_log(ws3, target_row, f"[{j}] {app_info['title']} 설명 리라이트 성공")
+            return app_info
+
+        def render_stage(idx, app_info):
+            j = idx + 1
+            app = apps[idx]
+            app_name = app_info["title"]
+            screenshots = app_info["screenshots"]
+            desc_html = app_info["desc_html"]
+
+            img_group_html = "".join(
+                f'<div class="img-wrap"><img src="{img_url}" alt="{app_name}_{cc+1}"></div>'
+                for cc, img_url in enumerate(screenshots)
+            )
 
+            app_url = f"https://play.google.com/store/apps/details?id={app['id']}"
+
+            section_html = f'''
+            <h2 data-ke-size="size26">{j}. {app_name} 어플 소개</h2>
+            <br />
+            {desc_html}
+            <p data-ke-size="size18"><b>2) {app_name} 어플 스크린샷</b></p>
+            <div class="img-group">{img_group_html}</div>
+            <br />
+            <p data-ke-size="size18" style="text-align:center;">
+              <a href="{app_url}" class="myButton">{app_name} 앱 다운</a>
+            </p>
+            <br />
+            <p data-ke-size="size18">{tag_str}</p>
+            <br /><br />
+            '''
+
+            if j == 1 and label_val:
+                encoded_label = urllib.parse.quote(label_val)
+                section_html = f'''
+            <div class="ottistMultiRelated">
+              <a class="extL alt" href="{BLOG_URL}search/label/{encoded_label}?&max-results=10">
+                <span style="font-size: medium;"><strong>추천 {label_val} 어플 보러가기</strong></span>
+                <i class="fas fa-link 2xs"></i>
+              </a>
+            </div>
+            <br /><br /><br />
+            ''' + section_html
+
+            if j == 3 and label_val:
+                encoded_label = urllib.parse.quote(label_val)
                 section_html = f'''
-                <h2 data-ke-size="size26">{j}. {app_name} 어플 소개</h2>
-                <br />
-                {desc_html}
-                <p data-ke-size="size18"><b>2) {app_name} 어플 스크린샷</b></p>
-                <div class="img-group">{img_group_html}</div>
-                <br />
-                <p data-ke-size="size18" style="text-align:center;">
-                  <a href="{app_url}" class="myButton">{app_name} 앱 다운</a>
-                </p>
-                <br />
-                <p data-ke-size="size18">{tag_str}</p>
-                <br /><br />
-                '''
-
-                if j == 1 and label_val:
-                    encoded_label = urllib.parse.quote(label_val)
-                    section_html = f'''
-                <div class="ottistMultiRelated">
-                  <a class="extL alt" href="{BLOG_URL}search/label/{encoded_label}?&max-results=10">
-                    <span style="font-size: medium;"><strong>추천 {label_val} 어플 보러가기</strong></span>
-                    <i class="fas fa-link 2xs"></i>
-                  </a>
-                </div>
-                <br /><br /><br />
-                ''' + section_html
-
-                if j == 3 and label_val:
-                    encoded_label = urllib.parse.quote(label_val)
-                    section_html = f'''
-                <div class="ottistMultiRelated">
-                  <a class="extL alt" href="{BLOG_URL}search/label/{encoded_label}?&max-results=10">
-                    <span style="font-size: medium;"><strong>관련 {label_val} 어플도 확인하기</strong></span>
-                    <i class="fas fa-link 2xs"></i>
-                  </a>
-                </div>
-                <br /><br /><br />
-                ''' + section_html
-
-                html_full += section_html
-                sheet_append_log(ws3, target_row, f"[{j}] {app_name} 섹션 완료")
-
-            except Exception as e_each:
-                sheet_append_log(ws3, target_row, f"[{j}] 앱 처리 실패: {e_each}")
+            <div class="ottistMultiRelated">
+              <a class="extL alt" href="{BLOG_URL}search/label/{encoded_label}?&max-results=10">
+                <span style="font-size: medium;"><strong>관련 {label_val} 어플도 확인하기</strong></span>
+                <i class="fas fa-link 2xs"></i>
+              </a>
+            </div>
+            <br /><br /><br />
+            ''' + section_html
+
+            sheet_append_log(ws3, target_row, f"[{j}] {app_name} 섹션 완료")
+            return section_html
+
+        def on_app_error(idx, stage, e):
+            sheet_append_log(ws3, target_row, f"[{idx + 1}] 앱 처리 실패 ({stage}): {e}")
+
+        sections, stage_times = run_app_pipeline(apps[:7], fetch_stage, rewrite_stage,
+                                                 render_stage, on_error=on_app_error)
+        html_full += "".join(sections)
+        sheet_append_log(ws3, target_row, f"파이프라인 시간: {format_stage_times(stage_times)}")
 
         # 10) 마무리
         html_full += build_ending_block(title, keyword)
@@ -1,6 +1,6 @@
 import sys
 sys.stdout.reconfigure(encoding="utf-8")
-import os, re, json, random, requests, traceback, pickle, glob, textwrap
+import os, re, json, random, requests, traceback, pickle, glob, textwrap, time, threading, queue
 from bs4 import BeautifulSoup
 import gspread
 from google.oauth2.service_account import Credentials
@@ -463,6 +463,85 @@ def crawl_apps(keyword, lang="vi", country="VN"):
             app_links.append("https://play.google.com" + a["href"])
     return app_links[3:]
 
+
+# ================================
+# 앱 포스트 파이프라인 (수집 / 리라이트 / 렌더 단계 분리)
+# ================================
+def run_app_pipeline(items, fetch_fn, rewrite_fn, render_fn, on_error=None, queue_size=2):
+    """수집(fetch) → 리라이트(rewrite) → 렌더(render) 3 단계를 스레드로 분리해 흘려 보낸다.
+    단계 사이는 크기 제한 큐로 연결되어 앱 N 리라이트 중에 앱 N+1 수집이 진행된다.
+    각 단계 함수는 (idx, data) 를 받고, None 을 반환하면 해당 앱은 건너뛴다.
+    반환: (원래 순서대로 정렬된 render 결과 리스트, 단계별 소요 시간 dict)"""
+    done = object()
+    fetched_q = queue.Queue(maxsize=queue_size)
+    rewritten_q = queue.Queue(maxsize=queue_size)
+    stage_times = {"fetch": 0.0, "rewrite": 0.0, "render": 0.0}
+    results = {}
+
+    def run_stage(stage, fn, idx, data):
+        t0 = time.time()
+        try:
+            return fn(idx, data)
+        except Exception as e:
+            if on_error:
+                on_error(idx, stage, e)
+            else:
+                print(f"[파이프라인] {idx + 1}번 {stage} 실패: {e}")
+            return None
+        finally:
+            stage_times[stage] += time.time() - t0
+
+    def fetch_worker():
+        try:
+            for idx, item in enumerate(items):
+                data = run_stage("fetch", fetch_fn, idx, item)
+                if data is not None:
+                    fetched_q.put((idx, data))
+        finally:
+            fetched_q.put(done)
+
+    def rewrite_worker():
+        try:
+            while True:
+                job = fetched_q.get()
+                if job is done:
+                    break
+                data = run_stage("rewrite", rewrite_fn, *job)
+                if data is not None:
+                    rewritten_q.put((job[0], data))
+        finally:
+            rewritten_q.put(done)
+
+    started = time.time()
+    workers = [threading.Thread(target=fetch_worker, daemon=True),
+               threading.Thread(target=rewrite_worker, daemon=True)]
+    for w in workers:
+        w.start()
+
+    # 렌더는 메인 스레드에서 (순서 무관하게 받고 마지막에 원래 순서로 조립)
+    while True:
+        job = rewritten_q.get()
+        if job is done:
+            break
+        html = run_stage("render", render_fn, *job)
+        if html:
+            results[job[0]] = html
+
+    for w in workers:
+        w.join()
+
+    stage_times["total"] = time.time() - started
+    print("[파이프라인] " + format_stage_times(stage_times))
+    return [results[i] for i in sorted(results)], stage_times
+
+
+def format_stage_times(stage_times):
+    return (f"총 {stage_times.get('total', 0):.1f}s | "
+            f"수집 {stage_times['fetch']:.1f}s · "
+            f"리라이트 {stage_times['rewrite']:.1f}s · "
+            f"렌더 {stage_times['render']:.1f}s")
+
+
 # ================================
 # 메인 실행 (시트9 기반, 베트남 블로그)
 # ================================
@@ -547,9 +626,15 @@ try:
 
     # ✅ 본문 생성
     tag_str = " ".join([f"#{t}" for t in title.split()])
-    for j, app_url in enumerate(app_links, 1):
-        if j > 7:
-            break
+
+    # ✅ 앱 수집 → 설명 리라이트 → 본문 조립 (단계별 파이프라인)
+    # 앱 하나라도 실패하면 예전처럼 글 전체를 중단 (바깥 except 에서 K열 기록)
+    app_errors = []
+
+    def fetch_stage(idx, app_url):
+        if app_errors:
+            return None
+        j = idx + 1
         resp = requests.get(app_url, headers={"User-Agent": "Mozilla/5.0"})
         soup = BeautifulSoup(resp.text, "html.parser")
 
@@ -558,10 +643,22 @@ try:
 
         # 앱 설명
         raw_desc = str(soup.find("div", class_="fysCi")) if soup.find("div", class_="fysCi") else ""
-        desc = rewrite_app_description(raw_desc, h1, keyword)
 
         # ✅ 앱 스크린샷 4장
         images_html = get_app_images(soup, h1)
+        return {"h1": h1, "raw_desc": raw_desc, "images_html": images_html}
+
+    def rewrite_stage(idx, app):
+        if app_errors:
+            return None
+        app["desc"] = rewrite_app_description(app["raw_desc"], app["h1"], keyword)
+        return app
+
+    def render_stage(idx, app):
+        j = idx + 1
+        app_url = app_links[idx]
+        h1, desc, images_html = app["h1"], app["desc"], app["images_html"]
+        section = ""
 
         # ✅ 라벨 링크 추가 (1번째, 3번째 제목 위)
         if j in (1, 3) and label:
@@ -575,10 +672,10 @@ try:
             </div>
             <br /><br /><br />
             """
-            html += link_block
+            section += link_block
 
         # ✅ 제목+본문+스크린샷
-        html += f"""
+        section += f"""
         <h2 data-ke-size="size26">{j}. {h1} — Giới thiệu ứng dụng</h2>
         <br />
         {desc}
@@ -592,6 +689,17 @@ try:
         <p data-ke-size="size18">{tag_str}</p>
         <br /><br /><br />
         """
+        return section
+
+    def on_app_error(idx, stage, e):
+        print(f"[파이프라인] {idx + 1}번 {stage} 실패: {e}")
+        app_errors.append(e)
+
+    sections, _ = run_app_pipeline(app_links[:7], fetch_stage, rewrite_stage, render_stage,
+                                   on_error=on_app_error)
+    if app_errors:
+        raise app_errors[0]
+    html += "".join(sections)
 
     html += make_last(title)
 
@@ -3,6 +3,7 @@ import sys
 sys.stdout.reconfigure(encoding="utf-8")
 
 import os, re, json, random, requests, traceback, pickle, glob, textwrap, time
+import threading, queue
 from bs4 import BeautifulSoup
 
 # Google Sheets / Drive / Blogger
@@ -595,24 +596,105 @@ def set_blog_index(ws, next_idx):
 
 import time
 
+_sheet_log_lock = threading.Lock()  # 파이프라인 스레드 간 H열 덮어쓰기 방지
+
 def sheet_append_log(ws, row_idx, message, tries=3, delay=2):
     """H열(8열)에 타임스탬프+메시지를 이어 붙여 기록"""
     ts = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime()) + "Z"
     line = f"[{ts}] {message}"
-    for t in range(1, tries+1):
-        try:
-            prev = ws.cell(row_idx, 8).value or ""   # H열
-            new_val = (prev + (";" if prev else "") + line)
-            ws.update_cell(row_idx, 8, new_val)
-            print(f"[LOG:H{row_idx}] {line}")
-            return True
-        except Exception as e:
-            print(f"[WARN] 로그기록 재시도 {t}/{tries}: {e}")
-            time.sleep(delay * t)
+    with _sheet_log_lock:
+        for t in range(1, tries+1):
+            try:
+                prev = ws.cell(row_idx, 8).value or ""   # H열
+                new_val = (prev + (";" if prev else "") + line)
+                ws.update_cell(row_idx, 8, new_val)
+                print(f"[LOG:H{row_idx}] {line}")
+                return True
+            except Exception as e:
+                print(f"[WARN] 로그기록 재시도 {t}/{tries}: {e}")
+                time.sleep(delay * t)
     print(f"[FAIL] 로그기록 실패: {line}")
     return False
 
 
+# ================================
+# 앱 포스트 파이프라인 (수집 / 리라이트 / 렌더 단계 분리)
+# ================================
+def run_app_pipeline(items, fetch_fn, rewrite_fn, render_fn, on_error=None, queue_size=2):
+    """수집(fetch) → 리라이트(rewrite) → 렌더(render) 3 단계를 스레드로 분리해 흘려 보낸다.
+    단계 사이는 크기 제한 큐로 연결되어 앱 N 리라이트 중에 앱 N+1 수집이 진행된다.
+    각 단계 함수는 (idx, data) 를 받고, None 을 반환하면 해당 앱은 건너뛴다.
+    반환: (원래 순서대로 정렬된 render 결과 리스트, 단계별 소요 시간 dict)"""
+    done = object()
+    fetched_q = queue.Queue(maxsize=queue_size)
+    rewritten_q = queue.Queue(maxsize=queue_size)
+    stage_times = {"fetch": 0.0, "rewrite": 0.0, "render": 0.0}
+    results = {}
+
+    def run_stage(stage, fn, idx, data):
+        t0 = time.time()
+        try:
+            return fn(idx, data)
+        except Exception as e:
+            if on_error:
+                on_error(idx, stage, e)
+            else:
+                print(f"[파이프라인] {idx + 1}번 {stage} 실패: {e}")
+            return None
+        finally:
+            stage_times[stage] += time.time() - t0
+
+    def fetch_worker():
+        try:
+            for idx, item in enumerate(items):
+                data = run_stage("fetch", fetch_fn, idx, item)
+                if data is not None:
+                    fetched_q.put((idx, data))
+        finally:
+            fetched_q.put(done)
+
+    def rewrite_worker():
+        try:
+            while True:
+                job = fetched_q.get()
+                if job is done:
+                    break
+                data = run_stage("rewrite", rewrite_fn, *job)
+                if data is not None:
+                    rewritten_q.put((job[0], data))
+        finally:
+            rewritten_q.put(done)
+
+    started = time.time()
+    workers = [threading.Thread(target=fetch_worker, daemon=True),
+               threading.Thread(target=rewrite_worker, daemon=True)]
+    for w in workers:
+        w.start()
+
+    # 렌더는 메인 스레드에서 (순서 무관하게 받고 마지막에 원래 순서로 조립)
+    while True:
+        job = rewritten_q.get()
+        if job is done:
+            break
+        html = run_stage("render", render_fn, *job)
+        if html:
+            results[job[0]] = html
+
+    for w in workers:
+        w.join()
+
+    stage_times["total"] = time.time() - started
+    print("[파이프라인] " + format_stage_times(stage_times))
+    return [results[i] for i in sorted(results)], stage_times
+
+
+def format_stage_times(stage_times):
+    return (f"총 {stage_times.get('total', 0):.1f}s | "
+            f"수집 {stage_times['fetch']:.1f}s · "
+            f"리라이트 {stage_times['rewrite']:.1f}s · "
+            f"렌더 {stage_times['render']:.1f}s")
+
+
 try:
     # 1) sheet2에서 대상 행/키워드
     target_row, keyword = pick_target_row_and_keyword(ws2)
@@ -663,26 +745,34 @@ try:
     tag_str = " ".join([f"#{t}" for t in tag_items]) + " #앱스토어"
     sheet_append_log(ws2, target_row, f"해시태그='{tag_str}'")
 
-    # 8) 앱 상세 수집 → 본문 조립
-    for j, appid in enumerate(app_ids, 1):
-        if j > 5: break
-        try:
-            sheet_append_log(ws2, target_row, f"[{j}] 앱 수집 시작 id={appid}")
-            detail = fetch_app_detail(appid)
-            app_url = detail["url"]
-            app_name = detail["name"]
-            src_html = detail["desc_html"]
-            images = detail["images"]
-
-            desc_html = rewrite_app_description(src_html, app_name, keyword)
-            sheet_append_log(ws2, target_row, f"[{j}] {app_name} 설명 리라이트 성공")
-
-            img_group_html = "".join(
-                f'<div class="img-wrap"><img src="{img_url}" alt="{app_name}_{cc}"></div>'
-                for cc, img_url in enumerate(images, 1)
-            )
-
-            section_html = f"""
+    # 8) 앱 상세 수집 → 리라이트 → 본문 조립 (단계별 파이프라인)
+    def fetch_stage(idx, appid):
+        j = idx + 1
+        sheet_append_log(ws2, target_row, f"[{j}] 앱 수집 시작 id={appid}")
+        detail = fetch_app_detail(appid)
+        return detail
+
+    def rewrite_stage(idx, detail):
+        j = idx + 1
+        app_name = detail["name"]
+        src_html = detail["desc_html"]
+        desc_html = rewrite_app_description(src_html, app_name, keyword)
+        sheet_append_log(ws2, target_row, f"[{j}] {app_name} 설명 리라이트 성공")
+        return detail, desc_html
+
+    def render_stage(idx, data):
+        j = idx + 1
+        detail, desc_html = data
+        app_url = detail["url"]
+        app_name = detail["name"]
+        images = detail["images"]
+
+        img_group_html = "".join(
+            f'<div class="img-wrap"><img src="{img_url}" alt="{app_name}_{cc}"></div>'
+            for cc, img_url in enumerate(images, 1)
+        )
+
+        section_html = f"""
 <h2 data-ke-size="size26">{j}. {app_name} 어플 소개</h2>
 <br />
 {desc_html}
@@ -696,10 +786,16 @@ try:
 <p data-ke-size="size18">{tag_str}</p>
 <br /><br />
 """
-            html_full += section_html
-            sheet_append_log(ws2, target_row, f"[{j}] {app_name} 섹션 완료")
-        except Exception as e_each:
-            sheet_append_log(ws2, target_row, f"[{j}] 앱 처리 실패: {e_each}")
+        sheet_append_log(ws2, target_row, f"[{j}] {app_name} 섹션 완료")
+        return section_html
+
+    def on_app_error(idx, stage, e):
+        sheet_append_log(ws2, target_row, f"[{idx + 1}] 앱 처리 실패 ({stage}): {e}")
+
+    sections, stage_times = run_app_pipeline(app_ids[:5], fetch_stage, rewrite_stage,
+                                             render_stage, on_error=on_app_error)
+    html_full += "".join(sections)
+    sheet_append_log(ws2, target_row, f"파이프라인 시간: {format_stage_times(stage_times)}")
 
     # 9) 마무리
     html_full += build_ending_block(title, keyword)
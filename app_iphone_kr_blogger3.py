@@ -9,6 +9,8 @@ import re
 import time
 import random
 import traceback
+import threading
+import queue
 import urllib.parse
 import glob
 from datetime import datetime
@@ -737,19 +739,22 @@ def pick_target_row(ws):
 # =========================
 # H 열 로그 누적
 # =========================
+_sheet_log_lock = threading.Lock()  # 파이프라인 스레드 간 H열 덮어쓰기 방지
+
 def sheet_append_log(ws, row_idx, message, tries=3, delay=2):
     ts = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime()) + "Z"
     line = f"[{ts}] {message}"
-    for t in range(1, tries+1):
-        try:
-            prev = ws.cell(row_idx, 8).value or ""   # H 열
-            new_val = (prev + (";" if prev else "") + line)
-            ws.update_cell(row_idx, 8, new_val)
-            print(f"[LOG:H{row_idx}] {line}")
-            return True
-        except Exception as e:
-            print(f"[WARN] 로그기록 재시도 {t}/{tries}: {e}")
-            time.sleep(delay * t)
+    with _sheet_log_lock:
+        for t in range(1, tries+1):
+            try:
+                prev = ws.cell(row_idx, 8).value or ""   # H 열
+                new_val = (prev + (";" if prev else "") + line)
+                ws.update_cell(row_idx, 8, new_val)
+                print(f"[LOG:H{row_idx}] {line}")
+                return True
+            except Exception as e:
+                print(f"[WARN] 로그기록 재시도 {t}/{tries}: {e}")
+                time.sleep(delay * t)
     print(f"[FAIL] 로그기록 실패: {line}")
     return False
 
@@ -775,6 +780,84 @@ def save_next_blog_index(ws, next_index):
         print("[WARN] 시트 블로그 인덱스 저장 실패:", e)
 
 
+# =========================
+# 앱 포스트 파이프라인 (수집 / 리라이트 / 렌더 단계 분리)
+# =========================
+def run_app_pipeline(items, fetch_fn, rewrite_fn, render_fn, on_error=None, queue_size=2):
+    """수집(fetch) → 리라이트(rewrite) → 렌더(render) 3 단계를 스레드로 분리해 흘려 보낸다.
+    단계 사이는 크기 제한 큐로 연결되어 앱 N 리라이트 중에 앱 N+1 수집이 진행된다.
+    각 단계 함수는 (idx, data) 를 받고, None 을 반환하면 해당 앱은 건너뛴다.
+    반환: (원래 순서대로 정렬된 render 결과 리스트, 단계별 소요 시간 dict)"""
+    done = object()
+    fetched_q = queue.Queue(maxsize=queue_size)
+    rewritten_q = queue.Queue(maxsize=queue_size)
+    stage_times = {"fetch": 0.0, "rewrite": 0.0, "render": 0.0}
+    results = {}
+
+    def run_stage(stage, fn, idx, data):
+        t0 = time.time()
+        try:
+            return fn(idx, data)
+        except Exception as e:
+            if on_error:
+                on_error(idx, stage, e)
+            else:
+                print(f"[파이프라인] {idx + 1}번 {stage} 실패: {e}")
+            return None
+        finally:
+            stage_times[stage] += time.time() - t0
+
+    def fetch_worker():
+        try:
+            for idx, item in enumerate(items):
+                data = run_stage("fetch", fetch_fn, idx, item)
+                if data is not None:
+                    fetched_q.put((idx, data))
+        finally:
+            fetched_q.put(done)
+
+    def rewrite_worker():
+        try:
+            while True:
+                job = fetched_q.get()
+                if job is done:
+                    break
+                data = run_stage("rewrite", rewrite_fn, *job)
+                if data is not None:
+                    rewritten_q.put((job[0], data))
+        finally:
+            rewritten_q.put(done)
+
+    started = time.time()
+    workers = [threading.Thread(target=fetch_worker, daemon=True),
+               threading.Thread(target=rewrite_worker, daemon=True)]
+    for w in workers:
+        w.start()
+
+    # 렌더는 메인 스레드에서 (순서 무관하게 받고 마지막에 원래 순서로 조립)
+    while True:
+        job = rewritten_q.get()
+        if job is done:
+            break
+        html = run_stage("render", render_fn, *job)
+        if html:
+            results[job[0]] = html
+
+    for w in workers:
+        w.join()
+
+    stage_times["total"] = time.time() - started
+    print("[파이프라인] " + format_stage_times(stage_times))
+    return [results[i] for i in sorted(results)], stage_times
+
+
+def format_stage_times(stage_times):
+    return (f"총 {stage_times.get('total', 0):.1f}s | "
+            f"수집 {stage_times['fetch']:.1f}s · "
+            f"리라이트 {stage_times['rewrite']:.1f}s · "
+            f"렌더 {stage_times['render']:.1f}s")
+
+
 # =========================
 # 메인 실행
 # =========================
@@ -856,77 +939,88 @@ if __name__ == "__main__":
         save_next_blog_index(ws3, next_index)
         sheet_append_log(ws3, target_row, f"로테이션 블로그 ID: {BLOG_ID}")
 
-        # 9) 앱 상세 수집 → 본문 조립
-        for j, app in enumerate(apps, 1):
-            if j > 7:
-                break
-            try:
-                sheet_append_log(ws3, target_row, f"[{j}] 앱 수집 시작 id={app['id']}")
-                
-                app_info = get_app_info(app["id"])
-                if not app_info:
-                    sheet_append_log(ws3, target_row, f"[{j}] 앱 정보 조회 실패")
-                    continue
-
-                app_name = app_info["title"]
-                src_desc = app_info["description"]
-                screenshots = app_info["screenshots"] + app_info["ipad_screenshots"]
-                screenshots = list(dict.fromkeys(screenshots))[:6]
-
-                desc_html = rewrite_app_description(src_desc, app_name, keyword)
-                sheet_append_log(ws3, target_row, f"[{j}] {app_name} 설명 리라이트 성공")
-
-                img_group_html = "".join(
-                    f'<div class="img-wrap"><img src="{img_url}" alt="{app_name}_{cc+1}"></div>'
-                    for cc, img_url in enumerate(screenshots)
-                )
-
-                app_url = f"https://apps.apple.com/kr/app/id{app['id']}"
+        # 9) 앱 상세 수집 → 리라이트 → 본문 조립 (단계별 파이프라인)
+        def fetch_stage(idx, app):
+            j = idx + 1
+            sheet_append_log(ws3, target_row, f"[{j}] 앱 수집 시작 id={app['id']}")
+            app_info = get_app_info(app["id"])
+            if not app_info:
+                sheet_append_log(ws3, target_row, f"[{j}] 앱 정보 조회 실패")
+                return None
+            return app_info
+
+        def rewrite_stage(idx, app_info):
+            j = idx + 1
+            app_name = app_info["title"]
+            src_desc = app_info["description"]
+            desc_html = rewrite_app_description(src_desc, app_name, keyword)
+            sheet_append_log(ws3, target_row, f"[{j}] {app_name} 설명 리라이트 성공")
+            return app_info, desc_html
+
+        def render_stage(idx, data):
+            j = idx + 1
+            app = apps[idx]
+            app_info, desc_html = data
+            app_name = app_info["title"]
+            screenshots = app_info["screenshots"] + app_info["ipad_screenshots"]
+            screenshots = list(dict.fromkeys(screenshots))[:6]
+
+            img_group_html = "".join(
+                f'<div class="img-wrap"><img src="{img_url}" alt="{app_name}_{cc+1}"></div>'
+                for cc, img_url in enumerate(screenshots)
+            )
 
+            app_url = f"https://apps.apple.com/kr/app/id{app['id']}"
+
+            section_html = f'''
+            <h2 data-ke-size="size26">{j}. {app_name} 어플 소개</h2>
+            <br />
+            {desc_html}
+            <p data-ke-size="size18"><b>2) {app_name} 어플 스크린샷</b></p>
+            <div class="img-group">{img_group_html}</div>
+            <br />
+            <p data-ke-size="size18" style="text-align:center;">
+              <a href="{app_url}" class="myButton">{app_name} 앱 다운</a>
+            </p>
+            <br />
+            <p data-ke-size="size18">{tag_str}</p>
+            <br /><br />
+            '''
+
+            if j == 1 and label_val:
+                encoded_label = urllib.parse.quote(label_val)
+                section_html = f'''
+            <div class="ottistMultiRelated">
+              <a class="extL alt" href="{BLOG_URL}search/label/{encoded_label}?&max-results=10">
+                <span style="font-size: medium;"><strong>추천 {label_val} 어플 보러가기</strong></span>
+                <i class="fas fa-link 2xs"></i>
+              </a>
+            </div>
+            <br /><br /><br />
+            ''' + section_html
+
+            if j == 3 and label_val:
+                encoded_label = urllib.parse.quote(label_val)
                 section_html = f'''
-                <h2 data-ke-size="size26">{j}. {app_name} 어플 소개</h2>
-                <br />
-                {desc_html}
-                <p data-ke-size="size18"><b>2) {app_name} 어플 스크린샷</b></p>
-                <div class="img-group">{img_group_html}</div>
-                <br />
-                <p data-ke-size="size18" style="text-align:center;">
-                  <a href="{app_url}" class="myButton">{app_name} 앱 다운</a>
-                </p>
-                <br />
-                <p data-ke-size="size18">{tag_str}</p>
-                <br /><br />
-                '''
-
-                if j == 1 and label_val:
-                    encoded_label = urllib.parse.quote(label_val)
-                    section_html = f'''
-                <div class="ottistMultiRelated">
-                  <a class="extL alt" href="{BLOG_URL}search/label/{encoded_label}?&max-results=10">
-                    <span style="font-size: medium;"><strong>추천 {label_val} 어플 보러가기</strong></span>
-                    <i class="fas fa-link 2xs"></i>
-                  </a>
-                </div>
-                <br /><br /><br />
-                ''' + section_html
-
-                if j == 3 and label_val:
-                    encoded_label = urllib.parse.quote(label_val)
-                    section_html = f'''
-                <div class="ottistMultiRelated">
-                  <a class="extL alt" href="{BLOG_URL}search/label/{encoded_label}?&max-results=10">
-                    <span style="font-size: medium;"><strong>관련 {label_val} 어플도 확인하기</strong></span>
-                    <i class="fas fa-link 2xs"></i>
-                  </a>
-                </div>
-                <br /><br /><br />
-                ''' + section_html
-
-                html_full += section_html
-                sheet_append_log(ws3, target_row, f"[{j}] {app_name} 섹션 완료")
-
-            except Exception as e_each:
-                sheet_append_log(ws3, target_row, f"[{j}] 앱 처리 실패: {e_each}")
+            <div class="ottistMultiRelated">
+              <a class="extL alt" href="{BLOG_URL}search/label/{encoded_label}?&max-results=10">
+                <span style="font-size: medium;"><strong>관련 {label_val} 어플도 확인하기</strong></span>
+                <i class="fas fa-link 2xs"></i>
+              </a>
+            </div>
+            <br /><br /><br />
+            ''' + section_html
+
+            sheet_append_log(ws3, target_row, f"[{j}] {app_name} 섹션 완료")
+            return section_html
+
+        def on_app_error(idx, stage, e):
+            sheet_append_log(ws3, target_row, f"[{idx + 1}] 앱 처리 실패 ({stage}): {e}")
+
+        sections, stage_times = run_app_pipeline(apps[:7], fetch_stage, rewrite_stage,
+                                                 render_stage, on_error=on_app_error)
+        html_full += "".join(sections)
+        sheet_append_log(ws3, target_row, f"파이프라인 시간: {format_stage_times(stage_times)}")
 
         # 10) 마무리
         html_full += build_ending_block(title, keyword)
@@ -1,5 +1,6 @@
 from urllib.parse import urlparse, parse_qs
-import re, json, requests, random, os, textwrap, glob, sys, traceback, pickle, time
+import re, json, requests, random, os, textwrap, glob, sys, traceback, pickle, time, threading, atexit
+from concurrent.futures import ThreadPoolExecutor
 from bs4 import BeautifulSoup
 from PIL import Image, ImageDraw, ImageFont
 from googleapiclient.discovery import build
@@ -24,6 +25,22 @@ def debug(msg: str):
     if DEBUG_MODE:
         print(f"[DEBUG] {msg}")
 
+# ================================
+# 색인 알림 큐
+# ================================
+# 발행 직후 URL 을 로컬 큐(JSONL)에 넣어 두면 Index_Notify.py 가 Google/Bing 에 묶어서 알림
+INDEX_QUEUE_PATH = os.getenv("INDEX_QUEUE_PATH", "index_queue.jsonl")
+
+def enqueue_index_notification(url):
+    if not url:
+        return
+    rec = {"url": url, "ts": int(time.time()), "source": os.path.basename(__file__)}
+    try:
+        with open(INDEX_QUEUE_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+    except Exception as e:
+        debug(f"색인 큐 기록 실패: {e}")
+
 # ================================
 # 단계별 로그 기록 함수 (P열, 한 줄 유지)
 # ================================
@@ -297,52 +314,194 @@ blog_handler = get_blogger_service()
 log_step("5단계: Blogger 인증 성공")
 
 # ================================
-# 복지 데이터 가져오기 (세션 및 재시도 로직 대폭 강화)
+# 복지로 상세 데이터 캐시 + 호스트별 적응형 속도 제한
 # ================================
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+# wlfareInfoId 별로 파싱된 dmWlfareInfo JSON 을 저장 → 같은 ID 는 복지로에 다시 요청하지 않음
+# 평소엔 짧은 간격으로 바로 요청하고, 4xx/5xx·차단 신호가 오면 그 호스트만 간격을 늘림
+WELFARE_CACHE_PATH = "welfare_cache.json"
+WELFARE_CACHE_TTL = 14 * 24 * 3600
+HOST_BASE_GAP = 1.0     # 같은 호스트 요청 사이 기본 간격(초)
+HOST_MAX_GAP = 120.0    # 오류가 이어질 때 최대 간격(초)
 
-def fetch_welfare_info(wlfareInfoId):
-    url = f"https://www.bokjiro.go.kr/ssis-tbu/twataa/wlfareInfo/moveTWAT52011M.do?wlfareInfoId={wlfareInfoId}&wlfareInfoReldBztpCd=01"
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/136.0.0.0 Safari/537.36",
-        "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
-        "Referer": "https://www.bokjiro.go.kr/",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-        "Connection": "keep-alive",
-        "Upgrade-Insecure-Requests": "1"
-    }
-    
-    session = requests.Session()
-    retries = Retry(total=5, backoff_factor=2, status_forcelist=[500, 502, 503, 504])
-    session.mount("https://", HTTPAdapter(max_retries=retries))
-    
-    for attempt in range(5):
+WELFARE_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/136.0.0.0 Safari/537.36",
+    "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
+    "Referer": "https://www.bokjiro.go.kr/",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Connection": "keep-alive",
+    "Upgrade-Insecure-Requests": "1"
+}
+
+_welfare_cache = None   # {"items": {id: {"data": ..., "fetched_at": ts}}, "hosts": {host: {"gap": s, "next_at": ts}}}
+_welfare_lock = threading.Lock()
+_welfare_session = requests.Session()
+
+def _load_welfare_cache():
+    global _welfare_cache
+    if _welfare_cache is None:
+        _welfare_cache = {"items": {}, "hosts": {}}
+        if os.path.exists(WELFARE_CACHE_PATH):
+            try:
+                with open(WELFARE_CACHE_PATH, "r", encoding="utf-8") as f:
+                    loaded = json.load(f)
+                _welfare_cache["items"] = loaded.get("items", {})
+                _welfare_cache["hosts"] = loaded.get("hosts", {})
+            except Exception as e:
+                debug(f"복지 캐시 읽기 실패: {e}")
+    return _welfare_cache
+
+def _save_welfare_cache():
+    tmp = WELFARE_CACHE_PATH + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(_welfare_cache, f, ensure_ascii=False)
+    os.replace(tmp, WELFARE_CACHE_PATH)
+
+def welfare_cache_get(wlfareInfoId):
+    with _welfare_lock:
+        item = _load_welfare_cache()["items"].get(wlfareInfoId)
+    if item and time.time() - item.get("fetched_at", 0) < WELFARE_CACHE_TTL:
+        return item["data"]
+    return None
+
+def welfare_cache_put(wlfareInfoId, data):
+    with _welfare_lock:
+        _load_welfare_cache()["items"][wlfareInfoId] = {"data": data, "fetched_at": int(time.time())}
+        _save_welfare_cache()
+
+def host_wait(host):
+    # 이 호스트의 다음 요청 가능 시각까지 대기하고 슬롯을 예약
+    with _welfare_lock:
+        state = _load_welfare_cache()["hosts"].setdefault(host, {"gap": HOST_BASE_GAP, "next_at": 0})
+        now = time.time()
+        start = max(now, state["next_at"])
+        state["next_at"] = start + state["gap"]
+    if start > now:
+        time.sleep(start - now)
+
+def host_feedback(host, ok, reason=""):
+    # 성공하면 간격을 기본값 쪽으로 줄이고, 오류/차단이면 두 배로 늘림
+    with _welfare_lock:
+        state = _load_welfare_cache()["hosts"].setdefault(host, {"gap": HOST_BASE_GAP, "next_at": 0})
+        if ok:
+            state["gap"] = max(HOST_BASE_GAP, state["gap"] / 2)
+            state["next_at"] = min(state["next_at"], time.time() + state["gap"])
+        else:
+            state["gap"] = min(HOST_MAX_GAP, max(state["gap"] * 2, 5.0))
+            state["next_at"] = max(state["next_at"], time.time() + state["gap"])
+            debug(f"⚠️ {host} 속도 낮춤 → 간격 {state['gap']:.0f}s ({reason})")
+        _save_welfare_cache()
+
+def parse_welfare_html(html):
+    outer_match = re.search(r'initParameter\((\{.*?\})\);', html, re.S)
+    if not outer_match:
+        raise ValueError("initParameter JSON 을 찾지 못했습니다.")
+    return json.loads(json.loads(outer_match.group(1))["initValue"]["dmWlfareInfo"])
+
+def welfare_url(wlfareInfoId):
+    return f"https://www.bokjiro.go.kr/ssis-tbu/twataa/wlfareInfo/moveTWAT52011M.do?wlfareInfoId={wlfareInfoId}&wlfareInfoReldBztpCd=01"
+
+def fetch_welfare_info(wlfareInfoId, attempts=5):
+    cached = welfare_cache_get(wlfareInfoId)
+    if cached is not None:
+        debug(f"복지 캐시 사용: {wlfareInfoId}")
+        return cached
+
+    url = welfare_url(wlfareInfoId)
+    host = urlparse(url).hostname
+    last_err = None
+    for attempt in range(attempts):
+        host_wait(host)
+        debug(f"복지로 데이터 호출 시도 URL: {url}, 회차: {attempt+1}/{attempts}")
         try:
-            time.sleep(random.uniform(10, 15))  # 서버 IP 차단 방어 위해 대기 시간 대폭 증가
-            debug(f"복지로 데이터 호출 시도 URL: {url}, 회차: {attempt+1}/5")
-            
-            resp = session.get(url, headers=headers, timeout=40)
+            resp = _welfare_session.get(url, headers=WELFARE_HEADERS, timeout=40)
             resp.encoding = "utf-8"
-            
-            if resp.status_code == 200:
-                html = resp.text
-                outer_match = re.search(r'initParameter\((\{.*?\})\);', html, re.S)
-                if not outer_match:
-                    raise ValueError("initParameter JSON 을 찾지 못했습니다.")
-                return json.loads(json.loads(outer_match.group(1))["initValue"]["dmWlfareInfo"])
-            else:
-                debug(f"⚠️ 상태 코드 {resp.status_code} - 재시도 ({attempt + 1}/5)")
-                time.sleep(5)
-                
+        except requests.RequestException as e:
+            last_err = e
+            host_feedback(host, False, f"연결 실패: {e}")
+            continue
+        if resp.status_code != 200:
+            last_err = ValueError(f"상태 코드 {resp.status_code}")
+            host_feedback(host, False, f"상태 코드 {resp.status_code}")
+            continue
+        try:
+            data = parse_welfare_html(resp.text)
+        except (ValueError, KeyError) as e:
+            # 200 이지만 데이터가 없는 페이지 = 차단/점검 신호로 봄
+            last_err = e
+            host_feedback(host, False, f"데이터 없음: {e}")
+            continue
+        host_feedback(host, True)
+        welfare_cache_put(wlfareInfoId, data)
+        return data
+
+    raise ValueError(f"최대 재시도 횟수 초과: {last_err}")
+
+# ================================
+# 다음 행 복지 데이터 미리 받기 (백그라운드)
+# ================================
+# 이번 글을 쓰는 동안 아래쪽 미완료 행(E열 URL)의 상세 데이터를 받아 welfare_cache.json 에 저장
+# 토큰 버킷으로 초당 요청 수를 제한하고, 호스트 제한(host_wait/host_feedback)도 그대로 적용
+PREFETCH_ROWS = 20      # 미리 받을 행 수
+PREFETCH_RATE = 0.2     # 초당 토큰 (5초에 1건)
+PREFETCH_BURST = 2      # 한 번에 쌓일 수 있는 토큰 수
+
+_prefetch_stop = threading.Event()
+_prefetch_thread = None
+
+def upcoming_welfare_ids(rows, after_row, limit=PREFETCH_ROWS):
+    ids = []
+    for i, row in enumerate(rows[1:], start=2):
+        if i <= after_row:
+            continue
+        url_cell = row[4].strip() if len(row) > 4 and row[4] else ""
+        status_cell = row[6].strip() if len(row) > 6 and row[6] else ""
+        if not url_cell or status_cell == "완":
+            continue
+        wid = parse_qs(urlparse(url_cell).query).get("wlfareInfoId", [""])[0]
+        if wid and wid not in ids:
+            ids.append(wid)
+        if len(ids) >= limit:
+            break
+    return ids
+
+def _prefetch_worker(ids):
+    tokens, last = float(PREFETCH_BURST), time.time()
+    done = 0
+    for wid in ids:
+        if _prefetch_stop.is_set():
+            break
+        if welfare_cache_get(wid) is not None:
+            continue
+        while True:
+            now = time.time()
+            tokens = min(PREFETCH_BURST, tokens + (now - last) * PREFETCH_RATE)
+            last = now
+            if tokens >= 1:
+                tokens -= 1
+                break
+            if _prefetch_stop.wait((1 - tokens) / PREFETCH_RATE):
+                return
+        try:
+            fetch_welfare_info(wid, attempts=1)
+            done += 1
         except Exception as e:
-            debug(f"⚠️ 연결 실패 ({attempt + 1}/5): {e}")
-            if attempt < 4:
-                time.sleep(10)
-            else:
-                raise
-                
-    raise ValueError("최대 재시도 횟수 초과")
+            debug(f"미리 받기 실패 {wid}: {e}")
+    debug(f"미리 받기 완료: {done}/{len(ids)}")
+
+def start_welfare_prefetch(rows, after_row):
+    global _prefetch_thread
+    ids = upcoming_welfare_ids(rows, after_row)
+    if not ids:
+        return
+    _prefetch_thread = threading.Thread(target=_prefetch_worker, args=(ids,), daemon=True)
+    _prefetch_thread.start()
+
+@atexit.register
+def stop_welfare_prefetch():
+    # 종료 시 진행 중인 요청 하나만 마무리하고 멈춤
+    _prefetch_stop.set()
+    if _prefetch_thread is not None:
+        _prefetch_thread.join(timeout=45)
 
 def clean_html(raw_html):
     return BeautifulSoup(raw_html, "html.parser").get_text(separator="\n", strip=True)
@@ -350,6 +509,9 @@ def clean_html(raw_html):
 # ================================
 # AI REVIEW (5차 시도 폴백)
 # ================================
+AI_FAIL_TEXT = "설명 정보입니다. 실패"
+SECTION_AI_WORKERS = 2   # 본문 섹션 동시 가공 수 (무료 등급 분당 호출 한도 때문에 2개까지만)
+
 def generate_ai_review(prompt):
     if genai_client:
         try:
@@ -431,7 +593,7 @@ def generate_ai_review(prompt):
         except Exception as e:
             print("❌ 모든 AI 실패:", e)
 
-    return "설명 정보입니다. 실패"
+    return AI_FAIL_TEXT
 
 def process_with_gpt(section_title: str, raw_text: str, keyword: str) -> str:
     if not (genai_client or GROQ_API_KEY or OPENROUTER_API_KEY or client):
@@ -537,6 +699,7 @@ try:
     debug(f"wlfareInfoId: {wlfareInfoId}")
 
     data = fetch_welfare_info(wlfareInfoId)
+    start_welfare_prefetch(rows, target_row)
     keyword = clean_html(data.get("wlfareInfoNm", "복지 서비스")).strip()
     title = f"2026 {keyword} 지원 자격 신청방법"
     safe_keyword = re.sub(r'[\\/:*?"<>|.]', "_", keyword)
@@ -590,17 +753,30 @@ try:
 <br />
 """
 
-    # 2. 본문 상세 섹션 추가
+    # 2. 본문 상세 섹션 추가 (섹션별 AI 가공을 동시에 보내고 원래 순서대로 붙임)
+    sections = []
     for title_k, key in fields.items():
         value = data.get(key, "")
         if value and value.strip() not in ["", "정보 없음"]:
-            try:
-                processed = process_with_gpt(title_k, clean_html(value), keyword)
-                html += f"<br /><h2 data-ke-size='size26'>{keyword} {title_k}</h2><br />{processed}<br /><br />"
-                debug(f"{title_k} 변환 성공")
-            except Exception as e:
-                log_step(f"본문 변환 실패({title_k}): {e}")
-                html += f"<br /><h2 data-ke-size='size26'>{keyword} {title_k}</h2><br /><p data-ke-size='size18'>{clean_html(value)}</p><br /><br />"
+            sections.append((title_k, clean_html(value)))
+
+    def rewrite_section(title_k, raw_text):
+        processed = process_with_gpt(title_k, raw_text, keyword)
+        if AI_FAIL_TEXT in processed:
+            raise RuntimeError("모든 AI 실패")
+        return processed
+
+    with ThreadPoolExecutor(max_workers=SECTION_AI_WORKERS) as ex:
+        futures = [ex.submit(rewrite_section, title_k, raw_text) for title_k, raw_text in sections]
+
+    for (title_k, raw_text), fut in zip(sections, futures):
+        try:
+            processed = fut.result()
+            html += f"<br /><h2 data-ke-size='size26'>{keyword} {title_k}</h2><br />{processed}<br /><br />"
+            debug(f"{title_k} 변환 성공")
+        except Exception as e:
+            log_step(f"본문 변환 실패({title_k}): {e}")
+            html += f"<br /><h2 data-ke-size='size26'>{keyword} {title_k}</h2><br /><p data-ke-size='size18'>{raw_text}</p><br /><br />"
 
     related_box = get_related_posts(BLOG_ID)
     html += f"""
@@ -635,6 +811,7 @@ try:
 
     ws.update_cell(target_row, 7, "완")
     ws.update_cell(target_row, 15, res["url"])
+    enqueue_index_notification(res["url"])
 
     final_html = res.get("content", "")
     soup = BeautifulSoup(final_html, "html.parser")
@@ -1,11 +1,11 @@
 import os
 import re
 import json
+import time
 import sys
 import random
 import traceback
 import requests
-import urllib.request
 from urllib.parse import urlparse, parse_qs
 
 import gspread
@@ -25,6 +25,19 @@ def debug(msg: str):
     if DEBUG_MODE:
         print(f"[DEBUG] {msg}")
 
+# 발행 직후 URL 을 로컬 큐(JSONL)에 넣어 두면 Index_Notify.py 가 Google/Bing 에 묶어서 알림
+INDEX_QUEUE_PATH = os.getenv("INDEX_QUEUE_PATH", "index_queue.jsonl")
+
+def enqueue_index_notification(url):
+    if not url:
+        return
+    rec = {"url": url, "ts": int(time.time()), "source": os.path.basename(__file__)}
+    try:
+        with open(INDEX_QUEUE_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+    except Exception as e:
+        debug(f"색인 큐 기록 실패: {e}")
+
 def log_step(msg: str):
     try:
         tr = globals().get("target_row", None)
@@ -235,17 +248,137 @@ def generate_ai_review(prompt, car_name):
 
     return f"{car_name}은 분석 생성에 실패했지만 기본 정보 기반으로 안정적인 성능을 가진 차량입니다."
 
+# ================================
+# Playwright 크롤 프로필 (불필요한 리소스 차단 + XHR JSON 수집)
+# ================================
+# 네이버 본문/데이터에 필요 없는 리소스 타입과 외부(광고/추적) 호스트는 라우트에서 바로 끊음
+CRAWL_BLOCKED_TYPES = {"font", "media", "websocket", "manifest", "other"}
+CRAWL_ALLOWED_HOSTS = ("naver.com", "naver.net", "pstatic.net")
+CRAWL_BLOCKED_HOSTS = ("lcs.naver.com", "veta.naver.com", "tivan.naver.com", "nelo2-col.navercorp.com", "tveta.naver.net")
+READY_TIMEOUT_MS = 5000
+
+def apply_crawl_profile(page, allow_images=False):
+    # allow_images=False 면 이미지도 차단 (갤러리 페이지는 큰 이미지 응답을 잡아야 하므로 허용)
+    async def handle(route):
+        req = route.request
+        host = (urlparse(req.url).hostname or "").lower()
+        blocked = req.resource_type in CRAWL_BLOCKED_TYPES
+        blocked = blocked or (req.resource_type == "image" and not allow_images)
+        blocked = blocked or not host.endswith(CRAWL_ALLOWED_HOSTS)
+        blocked = blocked or host.endswith(CRAWL_BLOCKED_HOSTS)
+        if blocked:
+            await route.abort()
+        else:
+            await route.continue_()
+    return page.route("**/*", handle)
+
+def collect_xhr_json(page):
+    # 페이지가 받는 XHR/fetch JSON 응답을 모아 두는 리스트를 돌려줌
+    payloads = []
+
+    async def on_response(resp):
+        try:
+            if resp.request.resource_type not in ("xhr", "fetch") or not resp.ok:
+                return
+            if "json" not in (resp.headers.get("content-type") or ""):
+                return
+            payloads.append(await resp.json())
+        except Exception:
+            pass
+
+    page.on("response", on_response)
+    return payloads
+
+def iter_json_values(data):
+    if isinstance(data, dict):
+        yield data
+        for v in data.values():
+            yield from iter_json_values(v)
+    elif isinstance(data, list):
+        for v in data:
+            yield from iter_json_values(v)
+    else:
+        yield data
+
+# 갤러리 XHR 에서 섹션을 가리키는 키/이름
+SECTION_JSON_KEYWORDS = {
+    "익스테리어": ("exterior", "외관", "익스테리어"),
+    "인테리어": ("interior", "실내", "내장", "인테리어"),
+}
+SECTION_LABEL_KEYS = ("type", "category", "name", "title", "tab")
+
+def section_subtrees(data, keywords):
+    # 키 이름이나 type/name 같은 라벨 값에 섹션 키워드가 들어간 하위 객체만 돌려줌
+    if isinstance(data, dict):
+        label = " ".join(v for k, v in data.items() if k in SECTION_LABEL_KEYS and isinstance(v, str)).lower()
+        if any(kw in label for kw in keywords):
+            yield data
+            return
+        for k, v in data.items():
+            if any(kw in str(k).lower() for kw in keywords):
+                yield v
+            else:
+                yield from section_subtrees(v, keywords)
+    elif isinstance(data, list):
+        for v in data:
+            yield from section_subtrees(v, keywords)
+
+def image_urls_from_json(payloads, keywords):
+    # 현재 섹션 키워드에 걸린 부분에서만 큰 이미지 URL 을 뽑음 (다른 섹션 사진이 섞이지 않도록)
+    urls = []
+    for payload in payloads:
+        for sub in section_subtrees(payload, keywords):
+            for v in iter_json_values(sub):
+                if isinstance(v, str):
+                    u = normalize_url(v)
+                    if u and u.startswith("http") and is_valid_car_image_url(u) and not is_probably_thumbnail(u) and u not in urls:
+                        urls.append(u)
+    return urls
+
+def spec_pairs_from_json(payloads, limit=14):
+    # {"name"/"title": "...", "value": "..."} 모양의 항목만 제원으로 사용
+    # 여러 응답을 섞지 않고 그런 항목이 가장 많은 응답(제원 응답) 하나만 씀
+    best = []
+    for payload in payloads:
+        pairs = []
+        for v in iter_json_values(payload):
+            if not isinstance(v, dict):
+                continue
+            k = v.get("name") or v.get("title")
+            val = v.get("value")
+            if isinstance(k, str) and isinstance(val, str) and k.strip() and val.strip() and len(val) < 100:
+                pair = (k.strip(), " ".join(val.split()))
+                if pair not in pairs:
+                    pairs.append(pair)
+        if len(pairs) > len(best):
+            best = pairs
+    return best[:limit]
+
+async def wait_ready(page, selector, timeout=READY_TIMEOUT_MS):
+    # 고정 대기 대신: 원하는 요소가 뜰 때까지, 안 뜨면 네트워크가 잠잠해질 때까지
+    try:
+        await page.wait_for_selector(selector, state="attached", timeout=timeout)
+        return True
+    except TimeoutError:
+        try:
+            await page.wait_for_load_state("networkidle", timeout=timeout)
+        except TimeoutError:
+            pass
+        return False
+
 async def close_popup(page):
+    viewer = page.locator("div.civ__full_screen").first
     try:
         await page.keyboard.press("Escape")
-        await page.wait_for_timeout(200)
+        await viewer.wait_for(state="hidden", timeout=500)
+        return
     except Exception:
         pass
     try:
         close_btn = page.locator("button.civ__close, .civ__close_btn, button[class*='close']").first
         if await close_btn.count() > 0:
             await close_btn.click(timeout=500)
-            await page.wait_for_timeout(200)
+            await viewer.wait_for(state="hidden", timeout=500)
     except Exception:
         pass
 
@@ -294,11 +427,29 @@ async def get_preview_big_image_url(page):
             continue
     return None
 
+# 갤러리 썸네일 클릭 시 뜨는 큰 이미지는 네트워크 응답에서 바로 잡음
+BIG_IMAGE_TIMEOUT_MS = 3000
+DOWNLOAD_CONCURRENCY = 4
+
+def is_big_image_response(resp, exclude):
+    try:
+        if resp.request.resource_type != "image" or not resp.ok:
+            return False
+    except Exception:
+        return False
+    u = resp.url
+    return u not in exclude and is_valid_car_image_url(u) and not is_probably_thumbnail(u)
+
 async def extract_images_from_section(page, section_name, section_index, max_count, photo_url):
+    # → (클릭으로 잡은 큰 이미지, 이 섹션 XHR JSON 의 보충 후보)
     extracted_urls = []
+    json_urls = []
     try:
+        await apply_crawl_profile(page, allow_images=True)
+        xhr_json = collect_xhr_json(page)
+        base_selector = f"#root > section > div.content_wrap > div > div > div:nth-child({section_index}) > div.photo_list_wrap > div > li"
         await page.goto(photo_url, wait_until="domcontentloaded")
-        await page.wait_for_timeout(800)
+        await wait_ready(page, "#root > section > div.content_wrap")
         if section_index == 2:
             try:
                 tab_buttons = page.locator("div.tab_menu > ul > li, .tab_menu li, button.tab")
@@ -306,51 +457,109 @@ async def extract_images_from_section(page, section_name, section_index, max_cou
                 if tab_count >= 2:
                     interior_tab = tab_buttons.nth(1)
                     await interior_tab.click(timeout=800)
-                    await page.wait_for_timeout(800)
+                    await wait_ready(page, base_selector, timeout=3000)
             except Exception:
                 pass
         section_div = page.locator(f"#root > section > div.content_wrap > div > div > div:nth-child({section_index})")
-        await section_div.wait_for(state="visible", timeout=1500)
-        await page.wait_for_timeout(300)
-        base_selector = f"#root > section > div.content_wrap > div > div > div:nth-child({section_index}) > div.photo_list_wrap > div > li"
+        await section_div.wait_for(state="visible", timeout=3000)
         li_elements = await page.locator(base_selector).all()
         li_count = len(li_elements)
         if li_count == 0:
-            return extracted_urls
+            return extracted_urls, json_urls
+        # 썸네일 주소는 큰 이미지 후보에서 제외
+        thumb_urls = set(await page.locator(f"{base_selector} > a > img").evaluate_all(
+            "els => els.map(el => el.currentSrc || el.src || '')"
+        ))
         actual_max = min(li_count, max_count)
-        extracted_count = 0
         for i in range(actual_max):
             try:
                 img_locator = page.locator(f"{base_selector}:nth-child({i+1}) > a > img")
                 await img_locator.wait_for(state="visible", timeout=1500)
-                await img_locator.click(timeout=800)
-                await page.wait_for_timeout(300)
-                for attempt in range(30):
-                    try:
-                        big_url = await get_preview_big_image_url(page)
-                        if big_url and is_valid_car_image_url(big_url) and not is_probably_thumbnail(big_url):
-                            if big_url not in extracted_urls:
-                                ext = get_ext_from_url(big_url)
-                                file_name = f"{section_name}_photo_{extracted_count + 1}{ext}"
-                                file_path = os.path.join(IMAGE_SAVE_DIR, file_name)
-                                urllib.request.urlretrieve(big_url, file_path)
-                                extracted_urls.append(big_url)
-                                extracted_count += 1
-                                break
-                    except Exception:
-                        pass
-                    break
+                exclude = thumb_urls | set(extracted_urls)
+                big_url = None
+                try:
+                    async with page.expect_response(lambda r: is_big_image_response(r, exclude), timeout=BIG_IMAGE_TIMEOUT_MS) as resp_info:
+                        await img_locator.click(timeout=800)
+                    big_url = (await resp_info.value).url
+                except TimeoutError:
+                    # 이미 캐시된 이미지라 응답이 안 보이면 미리보기 DOM 에서 읽음
+                    big_url = await get_preview_big_image_url(page)
+                if big_url and is_valid_car_image_url(big_url) and not is_probably_thumbnail(big_url):
+                    if big_url not in extracted_urls:
+                        extracted_urls.append(big_url)
                 await close_popup(page)
-                await page.wait_for_timeout(300)
             except TimeoutError:
                 await close_popup(page)
                 break
             except Exception:
                 await close_popup(page)
                 break
+        # 클릭으로 다 못 채웠을 때 쓸 후보 (섹션 간 중복은 collect_gallery_images 에서 거름)
+        json_urls = [u for u in image_urls_from_json(xhr_json, SECTION_JSON_KEYWORDS.get(section_name, ())) if u not in thumb_urls]
     except Exception:
         pass
-    return extracted_urls
+    debug(f"{section_name}: 큰 이미지 {len(extracted_urls)}개 (XHR 후보 {len(json_urls)}개)")
+    return extracted_urls, json_urls
+
+async def download_images(context, jobs):
+    # jobs: [(url, file_path)] → 저장에 성공한 url 집합 (동시 DOWNLOAD_CONCURRENCY 개)
+    sem = asyncio.Semaphore(DOWNLOAD_CONCURRENCY)
+
+    def write_file(path, data):
+        with open(path, "wb") as f:
+            f.write(data)
+
+    async def fetch(url, file_path):
+        async with sem:
+            try:
+                resp = await context.request.get(url, timeout=15000)
+                if not resp.ok:
+                    debug(f"이미지 다운로드 실패 {resp.status}: {url}")
+                    return None
+                await asyncio.to_thread(write_file, file_path, await resp.body())
+                return url
+            except Exception as e:
+                debug(f"이미지 다운로드 실패: {url} / {e}")
+                return None
+
+    results = await asyncio.gather(*(fetch(u, p) for u, p in jobs))
+    return {u for u in results if u}
+
+async def collect_gallery_images(context, photo_url, max_count):
+    # 익스테리어/인테리어 갤러리를 같은 컨텍스트의 페이지 두 개에서 동시에 추출한 뒤 한꺼번에 다운로드
+    sections = [("익스테리어", 1), ("인테리어", 2)]
+    pages = [await context.new_page() for _ in sections]
+    try:
+        found = await asyncio.gather(
+            *(extract_images_from_section(pg, name, idx, max_count, photo_url) for pg, (name, idx) in zip(pages, sections)),
+            return_exceptions=True,
+        )
+    finally:
+        for pg in pages:
+            await pg.close()
+    found = [res if isinstance(res, tuple) else ([], []) for res in found]
+
+    # 클릭으로 잡은 이미지를 먼저 확정하고, 모자란 섹션만 XHR 후보로 보충
+    # 앞 섹션이 이미 쓴 URL 은 뒤 섹션에서 다시 쓰지 않음
+    used = {u for urls, _ in found for u in urls}
+    filled = []
+    for urls, json_urls in found:
+        urls = list(urls)
+        for u in json_urls:
+            if len(urls) >= max_count:
+                break
+            if u not in used:
+                urls.append(u)
+                used.add(u)
+        filled.append(urls)
+    found = filled
+
+    jobs = []
+    for (name, _), urls in zip(sections, found):
+        for n, u in enumerate(urls, start=1):
+            jobs.append((u, os.path.join(IMAGE_SAVE_DIR, f"{name}_photo_{n}{get_ext_from_url(u)}")))
+    saved = await download_images(context, jobs)
+    return [[u for u in urls if u in saved] for urls in found]
 
 async def main():
     global target_row
@@ -385,10 +594,13 @@ async def main():
 
     async with async_playwright() as p:
         browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
+        context = await browser.new_context()
+        page = await context.new_page()
+        await apply_crawl_profile(page)
+        xhr_json = collect_xhr_json(page)
 
         await page.goto(info_url, wait_until="domcontentloaded")
-        await page.wait_for_timeout(2000)
+        await wait_ready(page, ".grid_item")
 
         grid_items = page.locator(".grid_item")
         grid_data = {}
@@ -447,8 +659,9 @@ async def main():
         spec_url = f"https://search.naver.com/search.naver?where=nexearch&query={car_name.replace(' ', '%20')}+제원"
         photo_url = f"https://search.naver.com/search.naver?where=nexearch&query={car_name.replace(' ', '%20')}+포토"
 
+        xhr_json.clear()
         await page.goto(spec_url, wait_until="domcontentloaded")
-        await page.wait_for_timeout(3000)
+        await wait_ready(page, "table tbody tr, .table_group")
 
         page_car_name = await generate_title_from_spec_page(page)
         if page_car_name:
@@ -490,15 +703,14 @@ async def main():
             except Exception:
                 pass
 
+        if len(extracted_specs) == 0:
+            extracted_specs = spec_pairs_from_json(xhr_json)
+
         MAX_IMAGES_PER_SECTION = 10
         try:
-            exterior_urls = await extract_images_from_section(page, "익스테리어", 1, MAX_IMAGES_PER_SECTION, photo_url)
-        except Exception:
-            pass
-        try:
-            interior_urls = await extract_images_from_section(page, "인테리어", 2, MAX_IMAGES_PER_SECTION, photo_url)
-        except Exception:
-            pass
+            exterior_urls, interior_urls = await collect_gallery_images(context, photo_url, MAX_IMAGES_PER_SECTION)
+        except Exception as e:
+            debug(f"갤러리 이미지 수집 실패: {e}")
 
         web_image_urls = exterior_urls + interior_urls
         await browser.close()
@@ -646,6 +858,7 @@ async def main():
 
     ws.update_cell(target_row, 3, "완")
     ws.update_cell(target_row, 15, res["url"])
+    enqueue_index_notification(res["url"])
     log_step(f"포스팅 성공: {res['url']}")
     print(f"[완료] 블로그 포스팅: {res['url']}")
     print(f"📸 이미지: 익스테리어 {len(exterior_urls)}개 + 인테리어 {len(interior_urls)}개 = 총 {len(web_image_urls)}개")